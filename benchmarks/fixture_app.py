@@ -0,0 +1,56 @@
+# fixture_app.py
+# Serves benchmarks/fixture_site (form, paginated table, scroll container, delayed element) on a
+# local port so benchmark runs never depend on an external site.
+
+import os
+import threading
+from functools import partial
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+
+FIXTURE_SITE = os.path.join(os.path.dirname(__file__), 'fixture_site')
+
+
+class _QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+
+class FixtureServer:
+    """Static fixture web app on 127.0.0.1; port 0 picks a free port. Use as a context manager."""
+    def __init__(self, port=0):
+        handler = partial(_QuietHandler, directory=FIXTURE_SITE)
+        self.httpd = ThreadingHTTPServer(('127.0.0.1', port), handler)
+        self.thread = None
+
+    @property
+    def base_url(self):
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Serve the benchmark fixture web app.")
+    parser.add_argument('--port', type=int, default=8765)
+    args = parser.parse_args()
+    server = FixtureServer(args.port)
+    print(f"Serving {FIXTURE_SITE} at {server.base_url} (Ctrl+C to stop)")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
@@ -0,0 +1,344 @@
+# run_benchmarks.py
+# End-to-end benchmark: generates a synthetic workbook, serves the fixture app and runs the full
+# main.py pipeline once per backend in a fresh process, writing the measurements as JSON.
+#
+#   python -m benchmarks.run_benchmarks --backends simulated,playwright,selenium --testcases 20 --datasets 5
+#   python -m benchmarks.run_benchmarks --baseline benchmarks/results/<previous>.json   (exit 1 on regression)
+
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_FOLDER = os.path.join(ROOT, 'benchmarks', 'results')
+if ROOT not in sys.path:
+    sys.path.insert(0, ROOT)
+
+# Metrics compared against a baseline and whether a higher value is better
+REGRESSION_METRICS = {
+    'steps_per_second': True,
+    'time_to_first_step': False,
+    'peak_rss_mb': False,
+}
+
+
+class RssSampler:
+    """Samples the resident memory of this process and all its children (browsers, drivers, workers)."""
+    def __init__(self, interval=0.1):
+        self.interval = interval
+        self.peak = 0
+        self.source = None
+        self._stop = threading.Event()
+        try:
+            import psutil
+            self._process = psutil.Process()
+            self.source = 'psutil'
+        except ImportError:
+            self._process = None
+
+    def _sample(self):
+        total = 0
+        try:
+            processes = [self._process] + self._process.children(recursive=True)
+        except Exception:
+            return
+        for process in processes:
+            try:
+                total += process.memory_info().rss
+            except Exception:
+                pass
+        self.peak = max(self.peak, total)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def start(self):
+        if self._process is not None:
+            self._sample()
+            threading.Thread(target=self._run, daemon=True).start()
+        return self
+
+    def stop(self):
+        """Stop sampling and return the peak in MB (this process only when psutil is unavailable)."""
+        self._stop.set()
+        if self._process is not None:
+            self._sample()
+            return round(self.peak / 2**20, 1)
+        try:
+            import resource
+        except ImportError:
+            return None
+        self.source = 'resource'
+        # ru_maxrss is in KB on Linux
+        return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+class _FirstStepList(list):
+    """step_results replacement that remembers when the first step result arrived."""
+    def __init__(self, clock_start):
+        super().__init__()
+        self.clock_start = clock_start
+        self.first_step = None
+
+    def _mark(self):
+        if self.first_step is None:
+            self.first_step = time.perf_counter() - self.clock_start
+
+    def append(self, item):
+        self._mark()
+        super().append(item)
+
+    def extend(self, items):
+        items = list(items)
+        if items:
+            self._mark()
+        super().extend(items)
+
+
+def _timed(phases, name, func, on_call=None):
+    def wrapper(*args, **kwargs):
+        if on_call is not None:
+            on_call(args)
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            phases[name] += time.perf_counter() - start
+    return wrapper
+
+
+def run_child(result_path, keep_reports=False):
+    """
+    Run main.main() in this process with timing hooks around its phases and write the metrics to
+    result_path. The config comes from AUTOMATION_CONFIG, set by the parent.
+    """
+    clock_start = time.perf_counter()
+    sampler = RssSampler().start()
+    phases = defaultdict(float)
+    report_paths = []
+
+    import pandas as pd
+    import modules.excel_data_reader as excel_data_reader
+    import modules.middleware as middleware
+    import modules.plan_stream as plan_stream
+    from modules.reporting_v2 import RobustReporting
+    step_results = excel_data_reader.step_results = _FirstStepList(clock_start)
+    middleware.get_framework_class = _timed(phases, 'browser_launch', middleware.get_framework_class)
+    pd.DataFrame.to_excel = _timed(phases, 'report_excel', pd.DataFrame.to_excel,
+                                   on_call=lambda args: report_paths.append(args[1]))
+    RobustReporting.generate_html_report = _timed(phases, 'report_html', RobustReporting.generate_html_report)
+    import main
+    phases['startup'] = time.perf_counter() - clock_start
+    main.get_framework_class = middleware.get_framework_class
+    # A streamed plan is read while it executes; only a compiled plan is timed as plan_load
+    plan_stream.load_plan_from_source = _timed(phases, 'plan_load', plan_stream.load_plan_from_source)
+    main.run_preflight = _timed(phases, 'validate', main.run_preflight)
+
+    report_folders = set()
+    with open(os.devnull, 'w') as devnull:
+        stdout, sys.stdout = sys.stdout, devnull
+        try:
+            main.main()
+        finally:
+            sys.stdout = stdout
+            # main only clears CURRENT_REPORT_FOLDER when it finishes, so a failed run still names it
+            report_folders.update(os.path.dirname(path) for path in report_paths)
+            if os.environ.get('CURRENT_REPORT_FOLDER'):
+                report_folders.add(os.environ['CURRENT_REPORT_FOLDER'])
+            if not keep_reports:
+                for folder in report_folders:
+                    shutil.rmtree(folder, ignore_errors=True)
+    total = time.perf_counter() - clock_start
+
+    non_execution = sum(phases[name] for name in ('startup', 'plan_load', 'validate', 'report_excel', 'report_html'))
+    phases['execute'] = total - non_execution
+    phases['settle'] = sum(step.get('settle_ms') or 0 for step in step_results) / 1000
+    passed = sum(1 for step in step_results if step['execution_status'] == 'pass')
+    result = {
+        'steps': len(step_results),
+        'passed': passed,
+        'failed': len(step_results) - passed,
+        'total_seconds': round(total, 3),
+        'steps_per_second': round(len(step_results) / phases['execute'], 1) if phases['execute'] > 0 else None,
+        'time_to_first_step': round(step_results.first_step, 3) if step_results.first_step is not None else None,
+        'phases': {name: round(value, 3) for name, value in sorted(phases.items())},
+        'peak_rss_mb': sampler.stop(),
+        'rss_source': sampler.source,
+    }
+    with open(result_path, 'w', encoding='utf-8') as f:
+        json.dump(result, f)
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+
+def build_config(backend, workbook_path, args):
+    """Repo config with the benchmark's overrides for one backend."""
+    from modules.middleware import CONFIG_PATH
+    with open(CONFIG_PATH, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    config.update({
+        'framework': backend,
+        'test_plan_source': workbook_path,
+        'use_plan_cache': False,
+        'stream_plan': False,
+        'validate_plan': 'warn',
+        'workers': args.workers,
+        'headless': not args.headed,
+        'browser': args.browser,
+    })
+    return config
+
+
+def run_backend(backend, workbook_path, args, workdir, run_number):
+    """Run one backend in a child process and return its result dict."""
+    config_path = os.path.join(workdir, f"config_{backend}_{run_number}.json")
+    result_path = os.path.join(workdir, f"result_{backend}_{run_number}.json")
+    with open(config_path, 'w', encoding='utf-8') as f:
+        json.dump(build_config(backend, workbook_path, args), f, indent=2)
+    env = dict(os.environ, AUTOMATION_CONFIG=config_path)
+    command = [sys.executable, '-m', 'benchmarks.run_benchmarks', '--child', result_path]
+    if args.keep_reports:
+        command.append('--keep-reports')
+    completed = subprocess.run(command, cwd=ROOT, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    result = {'backend': backend, 'run': run_number}
+    if completed.returncode != 0 or not os.path.exists(result_path):
+        result['error'] = (completed.stderr or '').strip().splitlines()[-5:]
+        return result
+    with open(result_path, encoding='utf-8') as f:
+        result.update(json.load(f))
+    return result
+
+
+def summarize(results):
+    """Median of each regression metric per backend over its successful runs."""
+    by_backend = defaultdict(list)
+    for result in results:
+        if 'error' not in result:
+            by_backend[result['backend']].append(result)
+    summary = {}
+    for backend, runs in by_backend.items():
+        summary[backend] = {}
+        for metric in REGRESSION_METRICS:
+            values = sorted(run[metric] for run in runs if run.get(metric) is not None)
+            summary[backend][metric] = values[len(values) // 2] if values else None
+    return summary
+
+
+def compare_to_baseline(summary, baseline_path, threshold_percent):
+    """Return human readable regressions of summary against a previous results file."""
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = json.load(f).get('summary', {})
+    regressions = []
+    for backend, metrics in summary.items():
+        for metric, higher_is_better in REGRESSION_METRICS.items():
+            old, new = baseline.get(backend, {}).get(metric), metrics.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old * 100
+            worse = -change if higher_is_better else change
+            if worse > threshold_percent:
+                regressions.append(f"{backend} {metric}: {old} -> {new} ({change:+.1f}%)")
+    return regressions
+
+
+def main(argv=None):
+    import argparse
+    from benchmarks.fixture_app import FixtureServer
+    from benchmarks.workbook_generator import generate_workbook
+    parser = argparse.ArgumentParser(description="Benchmark the automation engine end to end.")
+    parser.add_argument('--child', metavar='RESULT_JSON', help=argparse.SUPPRESS)
+    parser.add_argument('--backends', default='simulated,playwright,selenium',
+                        help="Comma separated framework values to run (default: %(default)s)")
+    parser.add_argument('--testcases', type=int, default=10)
+    parser.add_argument('--steps', type=int, default=20, help="Steps per testcase")
+    parser.add_argument('--datasets', type=int, default=5, help="Data rows per testcase")
+    parser.add_argument('--components', type=int, default=2, help="Components called by every testcase")
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--repeat', type=int, default=1, help="Runs per backend; the summary uses medians")
+    parser.add_argument('--browser', default='chrome', help="Selenium browser (chrome or edge)")
+    parser.add_argument('--headed', action='store_true', help="Show the browsers")
+    parser.add_argument('--base-url', help="Use an already running fixture app instead of starting one")
+    parser.add_argument('--output', help="Results JSON path (default: benchmarks/results/<timestamp>_<commit>.json)")
+    parser.add_argument('--baseline', help="Previous results JSON to compare against")
+    parser.add_argument('--threshold', type=float, default=10.0, help="Regression threshold in percent")
+    parser.add_argument('--keep-reports', action='store_true', help="Keep the Excel/HTML reports of each run")
+    args = parser.parse_args(argv)
+
+    if args.child:
+        run_child(args.child, keep_reports=args.keep_reports)
+        return 0
+
+    commit = _git_commit()
+    workdir = tempfile.mkdtemp(prefix='automation_bench_')
+    server = None
+    try:
+        base_url = args.base_url
+        if not base_url:
+            server = FixtureServer().start()
+            base_url = server.base_url
+        workbook_path = os.path.join(workdir, 'benchmark_plan.xlsx')
+        steps_per_dataset = generate_workbook(workbook_path, base_url, args.testcases, args.steps,
+                                              args.datasets, args.components)
+        print(f"Workbook: {args.testcases} testcases x {args.datasets} datasets x {steps_per_dataset} steps, fixture at {base_url}")
+        results = []
+        for backend in [name.strip() for name in args.backends.split(',') if name.strip()]:
+            for run_number in range(1, args.repeat + 1):
+                result = run_backend(backend, workbook_path, args, workdir, run_number)
+                results.append(result)
+                if 'error' in result:
+                    print(f"  {backend} run {run_number}: FAILED {' | '.join(result['error'])}")
+                else:
+                    print(f"  {backend} run {run_number}: {result['steps']} steps, {result['steps_per_second']} steps/s, "
+                          f"first step {result['time_to_first_step']} s, peak RSS {result['peak_rss_mb']} MB")
+    finally:
+        if server is not None:
+            server.stop()
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    summary = summarize(results)
+    output = {
+        'meta': {
+            'commit': commit,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'params': {key: value for key, value in vars(args).items() if key not in ('child', 'output', 'baseline')},
+            'steps_per_dataset': steps_per_dataset,
+        },
+        'summary': summary,
+        'results': results,
+    }
+    output_path = args.output
+    if not output_path:
+        os.makedirs(RESULTS_FOLDER, exist_ok=True)
+        output_path = os.path.join(RESULTS_FOLDER, f"{time.strftime('%Y%m%d_%H%M%S')}_{commit or 'nogit'}.json")
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(output, f, indent=2)
+    print(f"Results written to {output_path}")
+
+    if args.baseline:
+        regressions = compare_to_baseline(summary, args.baseline, args.threshold)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            return 1
+        print(f"No regressions beyond {args.threshold}% against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+# workbook_generator.py
+# Builds synthetic driver workbooks of any size against the fixture app (benchmarks/fixture_app.py),
+# in the same layout as config/testcase_driver_data_sheet.xlsx.
+
+import openpyxl
+
+DRIVER_HEADERS = ['Execute', 'GetPassScreenshot', 'TestCaseName', 'ComponentName', 'Screen', 'Field', 'FieldCode',
+                  'Action', 'TestCaseDescription', 'Validation', 'ExpectedValidation', 'TestDataSheetReference', 'Comment']
+COMPONENT_HEADERS = ['CompomentName', 'Screen', 'Field', 'Action', 'TestCaseDescription', 'Validation', 'ExpectedValidation']
+COMMON_HEADERS = ['Screen', 'Fields', 'Xpath', 'WaitTimeBeforeExecInSec']
+DATA_SHEET = 'Data'
+
+# (Screen, Field, locator, WaitTimeInSec) for every element the generated steps touch
+LOCATORS = [
+    ('Form', 'firstname', '//*[@id="firstname"]', None),
+    ('Form', 'surname', '//*[@id="surname"]', None),
+    ('Form', 'email', '//*[@id="email"]', None),
+    ('Form', 'submit', '//*[@id="submit"]', 'clickable'),
+    ('Form', 'result', '//*[@id="result"]', 'text=Submitted'),
+    ('Table', 'next', '//*[@id="next"]', None),
+    ('Table', 'row', '//tr[@id="row-<<row_id>>"]', 'visible'),
+    ('Scroll', 'last_item', '//*[@id="item-500"]', None),
+    ('Delayed', 'late', '//*[@id="late"]', 'visible'),
+]
+
+# Component bodies as (Screen, Field, Action); components alternate between the two
+FILL_FORM_STEPS = [
+    ('Form', 'form_url', 'OpenUrl'),
+    ('Form', 'firstname', 'InputText'),
+    ('Form', 'surname', 'InputText'),
+    ('Form', 'email', 'InputText'),
+    ('Form', 'submit', 'ClickElement'),
+    ('Form', 'result', 'GetElementText'),
+]
+TOUR_STEPS = [
+    ('Table', 'table_url', 'OpenUrl'),
+    ('Table', 'next', 'ClickElement'),
+    ('Table', 'row', 'IsElementVisible'),
+    ('Scroll', 'scroll_url', 'OpenUrl'),
+    ('Scroll', 'last_item', 'IsElementVisible'),
+    ('Delayed', 'delayed_url', 'OpenUrl'),
+    ('Delayed', 'late', 'GetElementText'),
+]
+# Direct DriverSheet steps used to pad a testcase to the requested step count (after an OpenUrl)
+FILLER_STEPS = [
+    ('Form', 'firstname', 'InputText'),
+    ('Form', 'firstname', 'AssertValue'),
+    ('Form', 'surname', 'InputText'),
+    ('Form', 'surname', 'ClearText'),
+    ('Form', 'email', 'InputText'),
+    ('Form', 'email', 'AssertValue'),
+]
+
+
+def generate_workbook(path, base_url, testcases=10, steps=20, datasets=5, components=2):
+    """
+    Write a workbook with `testcases` testcases of about `steps` executable steps each, every
+    testcase bound to `datasets` data rows and calling `components` components (alternating a
+    form fill and a tour of the table, scroll and delayed pages). Returns the step count per dataset.
+    """
+    base_url = base_url.rstrip('/') + '/'
+    component_bodies = {}
+    for index in range(components):
+        body = FILL_FORM_STEPS if index % 2 == 0 else TOUR_STEPS
+        component_bodies[f"{'FillForm' if index % 2 == 0 else 'Tour'}_{index + 1}"] = body
+
+    workbook = openpyxl.Workbook(write_only=True)
+
+    driver = workbook.create_sheet('DriverSheet')
+    driver.append(DRIVER_HEADERS)
+    data_ref = f"{DATA_SHEET}!A2:{DATA_SHEET}!A{datasets + 1}"
+    component_steps = sum(len(body) for body in component_bodies.values())
+    filler = max(0, steps - component_steps)
+    for number in range(1, testcases + 1):
+        name = f"TC{number:04d}"
+        first = True
+        for component_name in component_bodies:
+            driver.append(['Y', 'N', name, component_name] + [None] * 7 + [data_ref if first else None, None])
+            first = False
+        if filler:
+            direct = [('Form', 'form_url', 'OpenUrl')] + [FILLER_STEPS[i % len(FILLER_STEPS)] for i in range(filler - 1)]
+            for screen, field, action in direct:
+                driver.append(['Y', 'N', name, None, screen, field, None, action, f"{action} {field}", None, None,
+                               data_ref if first else None, None])
+                first = False
+
+    common = workbook.create_sheet('CommonSheet')
+    common.append(COMMON_HEADERS)
+    for row in LOCATORS:
+        common.append(list(row))
+
+    component_sheet = workbook.create_sheet('Components')
+    component_sheet.append(COMPONENT_HEADERS)
+    for component_name, body in component_bodies.items():
+        for position, (screen, field, action) in enumerate(body):
+            component_sheet.append([component_name if position == 0 else None, screen, field, action, None, None, None])
+
+    data = workbook.create_sheet(DATA_SHEET)
+    data.append(['execute', 'HeadLess', 'form_url', 'table_url', 'scroll_url', 'delayed_url',
+                 'firstname', 'surname', 'email', 'row_id'])
+    for number in range(1, datasets + 1):
+        data.append(['Y', 'T', base_url + 'form.html', base_url + 'table.html', base_url + 'scroll.html',
+                     base_url + 'delayed.html?delay=300', f"first{number}", f"last{number}",
+                     f"user{number}@example.com", 21 + (number % 20)])
+
+    workbook.save(path)
+    return component_steps + filler
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Generate a synthetic benchmark workbook.")
+    parser.add_argument('path')
+    parser.add_argument('--base-url', default='http://127.0.0.1:8765/')
+    parser.add_argument('--testcases', type=int, default=10)
+    parser.add_argument('--steps', type=int, default=20)
+    parser.add_argument('--datasets', type=int, default=5)
+    parser.add_argument('--components', type=int, default=2)
+    args = parser.parse_args()
+    per_dataset = generate_workbook(args.path, args.base_url, args.testcases, args.steps, args.datasets, args.components)
+    print(f"Wrote {args.path}: {args.testcases * args.datasets} datasets x {per_dataset} steps")
@@ -1,4 +1,3 @@
-from modules.globals import global_dict
 # main.py
 """
 Entry point for the automation framework. This script starts the execution by calling the main function from excel_data_reader.
@@ -7,11 +6,18 @@ Entry point for the automation framework. This script starts the execution by ca
 import os
 import datetime
 import pandas as pd
-from modules.excel_data_reader import get_testcase_to_datarefs_dict, process_testcase_rows, EXCEL_FILE, CONFIG_FOLDER, step_results
+from modules.excel_data_reader import process_testcase_rows, EXCEL_FILE, CONFIG_FOLDER, step_results
+from modules.plan_stream import get_execution_units
+from modules.plan_validator import run_preflight
+from modules.parallel_runner import run_units_parallel
+from modules.session_pool import SessionPool, format_session_stats
+from modules.step_timing import summarize_step_timings, format_timing_summary
+from modules.element_cache import summarize_element_cache, format_cache_summary
+from modules.locator_history import record_locator_history, load_locator_history, find_drifting_locators, format_drift_report
 from modules.reporting_v2 import RobustReporting
-from modules.middleware import get_framework_class
+from modules.middleware import get_framework_class, get_config
 
-def main():
+def main(workers=None):
     # Create timestamped report folder
     timestamp = datetime.datetime.now().strftime('%Y%m%d_%H%M%S')
     report_folder = os.path.join(os.path.dirname(__file__), 'Reports', f'execution_report_{timestamp}')
@@ -20,39 +26,82 @@ def main():
     os.environ['CURRENT_REPORT_FOLDER'] = report_folder
 
     print("\nTestCase to DataSheet row mapping:")
-    testcase_datarefs = get_testcase_to_datarefs_dict()
+    # Units are produced lazily: with stream_plan the first browser starts after one testcase is read,
+    # otherwise the plan is read once (or reused from the cache) and served from memory
+    config = get_config()
+    plan_source = config.get('test_plan_source') or EXCEL_FILE
+    use_cache = config.get('use_plan_cache', True)
     reporting = RobustReporting()
-    for testcase, refs in testcase_datarefs.items():
-        dataset_counter = 1
-        for sheet, row_nums in refs:
-            print(f"  TestCase: {testcase}, DataSheet: {sheet}, Rows: {row_nums}")
-            for row_num in row_nums:
-                print(f"    Row {row_num}")
-                # Determine headless mode from DataSheet's 'HeadLess' column for this row
-                headless = True  # Default to headless
-                try:
-                    import openpyxl
-                    datasheet_path = os.path.join(CONFIG_FOLDER, 'testcase_driver_data_sheet.xlsx')
-                    wb = openpyxl.load_workbook(datasheet_path, data_only=True)
-                    if sheet in wb.sheetnames:
-                        data_sheet = wb[sheet]
-                        header_row = [cell.value for cell in data_sheet[1]]
-                        if 'HeadLess' in header_row:
-                            col_idx = header_row.index('HeadLess') + 1  # 1-based
-                            headless_cell = data_sheet.cell(row=row_num, column=col_idx).value
-                            if str(headless_cell).strip().upper() != 'T':
-                                headless = False
-                    wb.close()
-                except Exception as e:
-                    print(f"[WARN] Could not determine headless mode for {sheet} row {row_num}: {e}")
-                browser = 'edge'  # Use Edge as the default browser
-                actions = get_framework_class()                
-                #driver = actions_class.initiatedriver(browser, headless=headless)
-                #actions = actions_class(reporting, actions_class.driver)
-                print(f"TestCase: {testcase}")
-                process_testcase_rows(testcase, sheet, row_num, actions.driver, reporting, actions, dataset_counter)
+    validate_mode = str(config.get('validate_plan', 'warn')).strip().lower()
+    validate = None
+    if validate_mode != 'off':
+        # Preflight checks the whole plan before any browser starts; a streamed plan is checked one
+        # testcase block at a time and, with 'abort', a failing block is reported instead of run
+        validate = lambda plan: run_preflight(plan, reporting, abort_on_error=(validate_mode == 'abort'))
+    try:
+        units = get_execution_units(plan_source, use_cache=use_cache, stream=config.get('stream_plan', False), validate=validate)
+    except ValueError as e:
+        print(f"[ERROR] {e}")
+        del os.environ['CURRENT_REPORT_FOLDER']
+        return
+    workers = workers or int(config.get('workers', 1))
+    if str(config.get('framework', '')).lower() == 'playwright_async':
+        # One process, one browser, one context per dataset, datasets interleaved on an event loop
+        from modules.async_executor import run_units_async
+        concurrency = config.get('async_concurrency', 8)
+        print(f"Running datasets on the async Playwright engine, {concurrency} at a time")
+        step_results.extend(run_units_async(units, concurrency, reporting, headless=config.get('headless', False)))
+    elif workers > 1:
+        # Each worker process owns its browser; results come back merged in plan order
+        print(f"Running datasets on {workers} parallel workers")
+        step_results.extend(run_units_parallel(
+            units, workers, reporting, report_folder,
+            reuse_sessions=config.get('reuse_browser_sessions', True),
+            session_max_uses=config.get('session_max_uses', 20),
+        ))
+    else:
+        # Browsers are kept alive across datasets and reset in between unless reuse is disabled
+        session_pool = None
+        if config.get('reuse_browser_sessions', True):
+            session_pool = SessionPool(max_uses=config.get('session_max_uses', 20), reporting=reporting)
+        for unit in units:
+            testcase, sheet, row_num, plan = unit['testcase'], unit['sheet'], unit['row_num'], unit['plan']
+            print(f"  TestCase: {testcase}, DataSheet: {sheet}, Row {row_num}")
+            # Determine headless mode from DataSheet's 'HeadLess' column for this row
+            headless = True  # Default to headless
+            try:
+                headless = plan.is_headless(sheet, row_num)
+            except Exception as e:
+                print(f"[WARN] Could not determine headless mode for {sheet} row {row_num}: {e}")
+            browser = 'edge'  # Use Edge as the default browser
+            actions = session_pool.acquire() if session_pool else get_framework_class()
+            #driver = actions_class.initiatedriver(browser, headless=headless)
+            #actions = actions_class(reporting, actions_class.driver)
+            print(f"TestCase: {testcase}")
+            completed = process_testcase_rows(testcase, sheet, row_num, actions.driver, reporting, actions, unit['dataset_number'], plan=plan, steps=unit['steps'])
+            if session_pool:
+                session_pool.release(actions, failed=not completed)
+            else:
                 actions.quit()
-                dataset_counter += 1
+        if session_pool:
+            session_pool.close()
+            session_summary = format_session_stats(**session_pool.stats)
+            print(session_summary)
+            reporting.log_info(session_summary)
+    # Where the time went: phase totals, slowest steps and slowest locators
+    timing_summary = format_timing_summary(summarize_step_timings(step_results, top=config.get('timing_summary_top', 10)))
+    print(timing_summary)
+    reporting.log_info(timing_summary)
+    cache_summary = format_cache_summary(**summarize_element_cache(step_results))
+    print(cache_summary)
+    reporting.log_info(cache_summary)
+    # Readiness history for adaptive element timeouts; simulated runs would only add noise
+    if config.get('framework', 'selenium').lower() != 'simulated':
+        record_locator_history(step_results)
+        drift_report = format_drift_report(find_drifting_locators(load_locator_history()),
+                                           top=config.get('timing_summary_top', 10))
+        print(drift_report)
+        reporting.log_info(drift_report)
     # Write report to Excel
     report_df = pd.DataFrame(step_results)
     report_path = os.path.join(report_folder, f'execution_report_{timestamp}.xlsx')
@@ -70,4 +119,9 @@ def main():
         del os.environ['CURRENT_REPORT_FOLDER']
 
 if __name__ == "__main__":
-    main() 
+    import argparse
+    parser = argparse.ArgumentParser(description="Run the keyword driven test plan.")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Number of parallel worker processes (one browser each). Defaults to config 'workers' or 1.")
+    args = parser.parse_args()
+    main(workers=args.workers)
@@ -0,0 +1,225 @@
+# action_registry.py
+# Table of every action keyword a step can use: built-ins (modules/builtin_actions.py), functions in
+# customization/custom_actions.py ('custom-<name>') and customization/custom_component.py
+# ('component-<name>'), plus keyword packs installed under the ENTRY_POINT_GROUP entry point group.
+# The plan resolves each step to its ActionSpec once, so execution is a direct call.
+
+import inspect
+
+ENTRY_POINT_GROUP = 'automate_automation.actions'
+
+BUILTIN = 'builtin'
+CUSTOM = 'custom'
+COMPONENT = 'component'
+_PREFIXES = {CUSTOM: 'custom-', COMPONENT: 'component-'}
+
+_registry = {}
+_loaded = False
+# {source: error} for customization modules and action packs that failed to import
+_load_failures = {}
+
+
+def extract_status_and_message(result, default_fail_msg):
+    """
+    Helper to extract status and error message from a SeleniumActions result.
+    Returns (status, error_message).
+    """
+    if isinstance(result, tuple):
+        # Expecting (success, message)
+        success, message = result
+        if not success:
+            return 'fail', message or default_fail_msg
+        else:
+            return 'pass', ''
+    elif isinstance(result, dict):
+        if not result.get('success', True):
+            return 'fail', result.get('message', default_fail_msg)
+        else:
+            return 'pass', ''
+    elif result is False:
+        return 'fail', default_fail_msg
+    else:
+        return 'pass', ''
+
+
+class ActionSpec:
+    """
+    One registered action. Calling conventions by kind:
+      builtin:   func(actions, xpath, data) -> actions result
+      custom:    func(driver, actions, xpath, data, field, None, testcasename) -> (success, message)
+      component: func(testcasename, actions, driver, reporting, screen, field, xpath, data)
+    needs_locator / uses_data tell the plan validator what the step must provide.
+    """
+    __slots__ = ('keyword', 'func', 'kind', 'fail_message', 'needs_locator', 'uses_data')
+
+    def __init__(self, keyword, func, kind=BUILTIN, fail_message=None, needs_locator=False, uses_data=False):
+        self.keyword = keyword
+        self.func = func
+        self.kind = kind
+        self.fail_message = fail_message or f"Action '{keyword}' failed"
+        self.needs_locator = needs_locator
+        self.uses_data = uses_data
+
+    @property
+    def name(self):
+        """Keyword without its custom-/component- prefix."""
+        prefix = _PREFIXES.get(self.kind, '')
+        return self.keyword[len(prefix):] if prefix else self.keyword
+
+    def call(self, actions, driver, reporting, testcasename, screen, field, xpath, data):
+        """Call the function with its kind's argument order and return its raw result (may be awaitable)."""
+        if self.kind == CUSTOM:
+            return self.func(driver, actions, xpath, data, field, None, testcasename)
+        if self.kind == COMPONENT:
+            return self.func(testcasename, actions, driver, reporting, screen, field, xpath, data)
+        return self.func(actions, xpath, data)
+
+    def outcome(self, result):
+        """Turn a raw result into (status, error_message)."""
+        if self.kind == CUSTOM:
+            success, message = result
+            return ('pass', '') if success else ('fail', message)
+        if self.kind == COMPONENT:
+            return 'pass', ''
+        return extract_status_and_message(result, self.fail_message)
+
+    def error_message(self, error):
+        if self.kind == CUSTOM:
+            return f"Error calling custom function '{self.name}': {str(error)}"
+        return f"Error calling component function '{self.name}': {str(error)}"
+
+    def invoke(self, actions, driver, reporting, testcasename, screen, field, xpath, data):
+        """
+        Run the action and return (status, error_message, result). Exceptions from custom and
+        component functions become failures; built-in exceptions propagate like before.
+        """
+        if self.kind == BUILTIN:
+            result = self.call(actions, driver, reporting, testcasename, screen, field, xpath, data)
+            return (*self.outcome(result), result)
+        try:
+            result = self.call(actions, driver, reporting, testcasename, screen, field, xpath, data)
+            return (*self.outcome(result), result)
+        except Exception as e:
+            return 'fail', self.error_message(e), None
+
+    def __reduce__(self):
+        # Pickled by keyword so plans and jobs stay small; looked up again on load
+        return (resolve_action, (self.keyword,))
+
+
+def _key(keyword):
+    keyword = str(keyword).strip()
+    if keyword.startswith(_PREFIXES[CUSTOM]) or keyword.startswith(_PREFIXES[COMPONENT]):
+        return keyword
+    return keyword.lower()
+
+
+def register_action(keyword, func=None, kind=BUILTIN, fail_message=None, needs_locator=False, uses_data=False):
+    """
+    Register func under keyword; usable as a decorator:
+
+        @register_action('presskey', fail_message='Failed to press key', needs_locator=True, uses_data=True)
+        def press_key(actions, xpath, data): ...
+
+    Custom and component keywords get their 'custom-' / 'component-' prefix added when missing.
+    A later registration of the same keyword replaces the earlier one.
+    """
+    def decorator(function):
+        name = keyword
+        prefix = _PREFIXES.get(kind)
+        if prefix and not name.startswith(prefix):
+            name = prefix + name
+        _registry[_key(name)] = ActionSpec(name, function, kind, fail_message, needs_locator, uses_data)
+        return function
+    if func is not None:
+        return decorator(func)
+    return decorator
+
+
+def custom_action(func=None, *, name=None):
+    """Decorator registering a custom action ('custom-<name>', defaults to the function name)."""
+    def decorator(function):
+        return register_action(name or function.__name__, function, kind=CUSTOM)
+    return decorator(func) if func is not None else decorator
+
+
+def component_action(func=None, *, name=None):
+    """Decorator registering a component function ('component-<name>', defaults to the function name)."""
+    def decorator(function):
+        return register_action(name or function.__name__, function, kind=COMPONENT)
+    return decorator(func) if func is not None else decorator
+
+
+def register_module(module, kind):
+    """Register every public function defined in module (not ones it imports) as kind."""
+    for name, function in inspect.getmembers(module, inspect.isfunction):
+        if not name.startswith('_') and function.__module__ == module.__name__:
+            if _key(_PREFIXES[kind] + name) not in _registry:
+                register_action(name, function, kind=kind)
+
+
+def _load_entry_points():
+    from importlib.metadata import entry_points
+    for entry_point in entry_points(group=ENTRY_POINT_GROUP):
+        try:
+            # Importing the pack runs its @register_action / @custom_action decorators
+            entry_point.load()
+        except Exception as e:
+            _load_failures[f"action pack '{entry_point.name}' ({entry_point.value})"] = str(e)
+            print(f"[WARN] Could not load action pack '{entry_point.name}': {e}")
+
+
+def load_actions():
+    """Populate the registry once: built-ins, customization modules, then installed keyword packs."""
+    global _loaded
+    if _loaded:
+        return
+    _loaded = True
+    import modules.builtin_actions  # noqa: F401  (registers the built-ins)
+    import importlib
+    for module_name, kind in (('customization.custom_actions', CUSTOM), ('customization.custom_component', COMPONENT)):
+        try:
+            register_module(importlib.import_module(module_name), kind)
+        except Exception as e:
+            # e.g. a backend library the customizations import is not installed; built-ins still work
+            _load_failures[module_name] = str(e)
+            print(f"[WARN] Could not load {module_name}: {e}")
+    _load_entry_points()
+
+
+def load_failures():
+    """{source: error} for the customization modules and action packs that could not be loaded."""
+    load_actions()
+    return dict(_load_failures)
+
+
+def unknown_action_message(keyword):
+    """
+    Failure message for a step whose action keyword is not registered, naming the customization
+    module or action packs that failed to load and may have provided it.
+    """
+    if keyword and keyword.startswith(_PREFIXES[CUSTOM]):
+        message, module_name = f"Custom function '{keyword[len(_PREFIXES[CUSTOM]):]}' not found in custom_actions.py", 'customization.custom_actions'
+    elif keyword and keyword.startswith(_PREFIXES[COMPONENT]):
+        message, module_name = f"Component function '{keyword[len(_PREFIXES[COMPONENT]):]}' not found in custom_component.py", 'customization.custom_component'
+    else:
+        message, module_name = f"No matching action for: {keyword}", None
+    failed = [f"{source}: {error}" for source, error in _load_failures.items()
+              if source == module_name or source.startswith('action pack ')]
+    if failed:
+        message += " (failed to load " + "; ".join(failed) + ")"
+    return message
+
+
+def resolve_action(keyword):
+    """Return the ActionSpec for a step's action keyword, or None when it is unknown."""
+    if not keyword:
+        return None
+    load_actions()
+    return _registry.get(_key(keyword))
+
+
+def registered_actions():
+    """{keyword: ActionSpec} of everything registered."""
+    load_actions()
+    return dict(_registry)
@@ -0,0 +1,189 @@
+# async_executor.py
+# Runs execution units concurrently in one asyncio event loop: one shared Playwright browser,
+# one BrowserContext per dataset, at most `concurrency` datasets in flight.
+
+import asyncio
+import inspect
+from modules.automation_process import write_step_log, get_screenshot_path, build_step_result
+from modules.action_registry import BUILTIN, resolve_action, unknown_action_message
+from modules.async_playwright_actions import AsyncPlaywrightActions
+from modules.excel_data_reader import resolve_runtime_value
+from modules.globals import use_dataset_variables
+from modules.parallel_runner import prepare_unit
+from modules.page_settle import get_post_action_wait
+from modules.wait_conditions import WaitCondition, async_wait_for_condition, get_default_condition_timeout
+from modules.step_timing import StepTimer
+
+
+async def process_step_async(testcasename, screen, field, action, xpath, data, actions, reporting, dataset_number=None, get_pass_screenshot=False, testcase_description='', validation='', expected_validation='', wait_time_before_exec=0, handler=None, timer=None):
+    """
+    Async counterpart of automation_process.process_step for AsyncPlaywrightActions.
+    custom-/component- actions must be 'async def' functions with the usual signatures;
+    synchronous ones would block every other dataset in the loop and are reported as failures.
+    """
+    import traceback
+    status = 'pass'
+    error_message = ''
+    result = None
+    timer = timer or StepTimer()
+    if handler is None:
+        with timer.phase('lookup'):
+            handler = resolve_action(action)
+    try:
+        with timer.phase('pre_wait'):
+            wait_error = await wait_before_step_async(actions, wait_time_before_exec, xpath)
+        if wait_error:
+            status = 'fail'
+            error_message = wait_error
+        elif handler is None:
+            error_message = unknown_action_message(action)
+            reporting.log_info(error_message)
+            print(f"[SKIP] {error_message}")
+            status = 'fail'
+        elif handler.kind != BUILTIN and not inspect.iscoroutinefunction(handler.func):
+            status = 'fail'
+            error_message = f"{handler.kind.capitalize()} function '{handler.name}' is not async and cannot run on the async engine"
+        else:
+            located_before = actions.locate_seconds
+            try:
+                with timer.phase('action'):
+                    # Built-ins return the async actions' coroutine; custom/component functions are async def
+                    result = await handler.call(actions, actions.driver, reporting, testcasename, screen, field, xpath, data)
+                status, error_message = handler.outcome(result)
+            except Exception as e:
+                if handler.kind == BUILTIN:
+                    raise
+                status, error_message = 'fail', handler.error_message(e)
+            located = actions.locate_seconds - located_before
+            timer.add('locate', located)
+            timer.add('action', -located)
+
+        # Same post-action wait as process_step, without blocking other datasets
+        with timer.phase('settle'):
+            await settle_after_action_async(actions)
+        with timer.phase('log'):
+            write_step_log(testcasename, dataset_number, screen, field, wait_time_before_exec, action, xpath, data,
+                           testcase_description, validation, expected_validation, status,
+                           error_message if error_message else result)
+    except Exception as e:
+        status = 'fail'
+        error_message = f"Exception in process_step_async: {e}\n{traceback.format_exc()}"
+        reporting.log_error(error_message)
+        print(f"[ERROR] Exception in process_step_async: {e}")
+
+    screenshot_path = ''
+    if actions.page is not None and (status == 'fail' or (get_pass_screenshot and status == 'pass')):
+        try:
+            with timer.phase('screenshot'):
+                screenshot_path = get_screenshot_path(testcasename, dataset_number, screen, field, action)
+                if screenshot_path:
+                    await actions.save_screenshot(screenshot_path)
+        except Exception as e:
+            screenshot_path = ''
+            error_message += f" | Screenshot error: {e}"
+    return build_step_result(testcasename, dataset_number, screen, field, action, xpath, data, status,
+                             error_message, screenshot_path, testcase_description, validation, expected_validation,
+                             timer.columns())
+
+
+async def wait_before_step_async(actions, wait, selector):
+    """Async counterpart of automation_process.wait_before_step."""
+    if isinstance(wait, WaitCondition):
+        met, detail = await async_wait_for_condition(actions, wait, selector, get_default_condition_timeout())
+        return '' if met else detail
+    if wait and wait > 0:
+        try:
+            await asyncio.sleep(float(wait))
+        except Exception:
+            pass
+    return ''
+
+
+async def settle_after_action_async(actions):
+    """Async counterpart of automation_process.settle_after_action."""
+    settings = get_post_action_wait()
+    if settings['strategy'] == 'none':
+        return 0.0
+    if settings['strategy'] == 'settle':
+        settled, elapsed = await actions.wait_for_page_settle(settings['quiet_ms'], settings['timeout'], settings['poll_interval'])
+        return round(elapsed, 3)
+    await asyncio.sleep(float(settings['fixed_seconds']))
+    return float(settings['fixed_seconds'])
+
+
+async def run_job_async(job, browser, reporting):
+    """
+    Run one prepared dataset (see parallel_runner.prepare_unit) in its own context and return its step results.
+    $$ values go to the dataset's actions.variables, also when custom actions write global_dict.
+    Like a sequential run, a dataset that breaks off with an error is logged and keeps the
+    step results it produced before the error.
+    """
+    results = []
+    print(f"[Async] TestCase: {job['testcase']}, DataSheet: {job['sheet']}, Row {job['row_num']}")
+    try:
+        actions = await AsyncPlaywrightActions.create(reporting, browser)
+        # This task's context only: other datasets in the loop keep their own variables
+        use_dataset_variables(actions.variables)
+        try:
+            for step in job['steps']:
+                timer = StepTimer()
+                with timer.phase('lookup'):
+                    data = resolve_runtime_value(step['data'], actions.variables)
+                results.append(await process_step_async(
+                    job['testcase'], step['screen'], step['field'], step['action'], step['xpath'],
+                    data, actions, reporting, job['dataset_number'],
+                    get_pass_screenshot=step['get_pass_screenshot'],
+                    testcase_description=step['testcase_description'],
+                    validation=step['validation'],
+                    expected_validation=step['expected_validation'],
+                    wait_time_before_exec=step['wait_time'],
+                    handler=step.get('handler'),
+                    timer=timer,
+                ))
+        finally:
+            await actions.quit()
+    except Exception as e:
+        reporting.log_error(f"Error in process_testcase_rows for testcase '{job['testcase']}': {e}")
+    return results
+
+
+async def _run_all(units, concurrency, reporting, headless):
+    from playwright.async_api import async_playwright
+    results = {}
+    slots = asyncio.Semaphore(concurrency)
+
+    async def run(job):
+        try:
+            results[job['index']] = await run_job_async(job, browser, reporting)
+        except Exception as e:
+            reporting.log_error(f"Async engine failed to run dataset {job['testcase']} / {job['sheet']} row {job['row_num']}: {e}")
+        finally:
+            slots.release()
+
+    async with async_playwright() as playwright:
+        browser = await playwright.chromium.launch(headless=headless)
+        tasks = []
+        try:
+            for index, unit in enumerate(units):
+                job = prepare_unit(index, unit, reporting)
+                if job is None:
+                    continue
+                # Waiting for a free slot before pulling the next unit keeps a streamed plan streaming
+                await slots.acquire()
+                tasks.append(asyncio.create_task(run(job)))
+            await asyncio.gather(*tasks)
+        finally:
+            await browser.close()
+    return results
+
+
+def run_units_async(units, concurrency, reporting, headless=False):
+    """
+    Run units on the async Playwright engine with up to `concurrency` datasets at once and return
+    their step results merged in unit order, exactly as a sequential run would report them.
+    """
+    results = asyncio.run(_run_all(units, max(1, int(concurrency)), reporting, headless))
+    merged = []
+    for index in sorted(results):
+        merged.extend(results[index])
+    return merged
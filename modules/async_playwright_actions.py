@@ -0,0 +1,256 @@
+# async_playwright_actions.py
+# Asyncio version of PlaywrightActions: every method is a coroutine, so one event loop can drive
+# many pages (one BrowserContext per dataset) concurrently. Used by modules/async_executor.py.
+
+from modules.reporting_v2 import RobustReporting
+from modules.automation_interface import AutomationActionsInterface
+from modules.page_settle import SETTLE_INSTALL_JS
+import asyncio
+
+
+class AsyncPlaywrightActions(AutomationActionsInterface):
+    """
+    Same actions and (success, message) results as PlaywrightActions, built on playwright.async_api.
+    Instances are created with `await AsyncPlaywrightActions.create(reporting, browser)` and own
+    one BrowserContext on a browser shared with the other datasets in the event loop.
+    `variables` holds this dataset's $$ values; run_job_async routes global_dict to it for the dataset's task.
+    """
+    def __init__(self, reporting: RobustReporting, browser):
+        self.reporting = reporting
+        self.browser = browser
+        self.context = None
+        self.page = None
+        self.driver = None
+        self.variables = {}
+
+    @classmethod
+    async def create(cls, reporting: RobustReporting, browser):
+        actions = cls(reporting, browser)
+        await actions._open_context()
+        return actions
+
+    async def _open_context(self):
+        self.context = await self.browser.new_context()
+        # Settle instrumentation runs before each document's own scripts, so its requests are counted
+        await self.context.add_init_script(SETTLE_INSTALL_JS)
+        self.page = await self.context.new_page()
+        self.driver = self.page
+
+    async def _find_element(self, selector):
+        """
+        Find an element using Playwright. Returns the element handle or None if not found.
+        """
+        try:
+            element = await self.page.query_selector(selector)
+            if element:
+                self.reporting.log_info(f"Element found: {selector}")
+                return element
+            else:
+                self.reporting.log_info(f"Element not found: {selector}")
+                return None
+        except Exception as e:
+            self.reporting.log_error(f"Error finding element {selector}: {str(e)}")
+            return None
+
+    async def open_url(self, url):
+        try:
+            await self.page.goto(url)
+            self.reporting.log_info(f"Opened URL: {url}")
+            return True, None
+        except Exception as e:
+            error_message = f"Failed to open URL {url}: {str(e)}"
+            self.reporting.log_error(error_message)
+            return False, error_message
+
+    async def set_value(self, selector, value):
+        try:
+            await self.page.fill(selector, str(value))
+            self.reporting.log_info(f"Set value '{value}' to element: {selector}")
+            return True, None
+        except Exception as e:
+            error_message = f"Failed to set value: {str(e)}"
+            self.reporting.log_error(error_message)
+            return False, error_message
+
+    async def get_value(self, selector):
+        try:
+            value = await self.page.input_value(selector)
+            self.reporting.log_info(f"Got value '{value}' from element: {selector}")
+            return True, value
+        except Exception as e:
+            error_message = f"Failed to get value: {str(e)}"
+            self.reporting.log_error(error_message)
+            return False, error_message
+
+    async def assert_value(self, selector, expected_value):
+        try:
+            actual_value = await self.page.input_value(selector)
+            if str(actual_value) != str(expected_value):
+                error_message = f"Assertion failed: Expected '{expected_value}', got '{actual_value}'"
+                self.reporting.log_error(error_message)
+                return False, error_message
+            self.reporting.log_info(f"Assertion passed: {expected_value} == {actual_value}")
+            return True, None
+        except Exception as e:
+            error_message = f"Assertion failed: {str(e)}"
+            self.reporting.log_error(error_message)
+            return False, error_message
+
+    async def element_click(self, selector):
+        try:
+            await self.page.click(selector)
+            self.reporting.log_info(f"Clicked element: {selector}")
+            return True, None
+        except Exception as e:
+            error_message = f"Failed to click element {selector}: {str(e)}"
+            self.reporting.log_error(error_message)
+            return False, error_message
+
+    async def scroll_page(self, scroll_count=1):
+        try:
+            for _ in range(scroll_count):
+                await self.page.evaluate("window.scrollBy(0, window.innerHeight)")
+            self.reporting.log_info(f"Scrolled {scroll_count} time(s) in window")
+            return True, None
+        except Exception as e:
+            error_message = f"Scroll failed: {str(e)}"
+            self.reporting.log_error(error_message)
+            return False, error_message
+
+    async def clear_text(self, selector):
+        try:
+            await self.page.fill(selector, "")
+            self.reporting.log_info(f"Cleared text for element: {selector}")
+            return True, None
+        except Exception as e:
+            error_message = f"Failed to clear text: {str(e)}"
+            self.reporting.log_error(error_message)
+            return False, error_message
+
+    async def is_element_visible(self, selector):
+        try:
+            visible = await self.page.is_visible(selector)
+            self.reporting.log_info(f"Element visibility for {selector}: {visible}")
+            return True, str(visible)
+        except Exception as e:
+            error_message = f"Failed to check element visibility: {str(e)}"
+            self.reporting.log_error(error_message)
+            return False, error_message
+
+    async def element_exists(self, selector):
+        try:
+            elements = await self.page.query_selector_all(selector)
+            exists = len(elements) > 0
+            self.reporting.log_info(f"Element exists: {selector}: {exists}")
+            return True, exists
+        except Exception as e:
+            error_message = f"Error in element_exists: {str(e)}"
+            self.reporting.log_error(error_message)
+            return False, error_message
+
+    async def switch_to_tab(self, tab_index):
+        try:
+            pages = self.context.pages
+            if tab_index < 0 or tab_index >= len(pages):
+                error_message = f"Tab index {tab_index} out of range. Available tabs: {len(pages)}"
+                self.reporting.log_error(error_message)
+                return False, error_message
+            self.page = pages[tab_index]
+            self.driver = self.page
+            log_message = f"Switched to browser tab: {tab_index}"
+            self.reporting.log_info(log_message)
+            return True, log_message
+        except Exception as e:
+            error_message = f"Failed to switch to browser tab: {str(e)}"
+            self.reporting.log_error(error_message)
+            return False, error_message
+
+    async def reload_window(self):
+        try:
+            await self.page.reload()
+            log_message = "Reloaded the current browser window successfully."
+            self.reporting.log_info(log_message)
+            return True, log_message
+        except Exception as e:
+            error_message = f"Failed to reload the current browser window: {str(e)}"
+            self.reporting.log_error(error_message)
+            return False, error_message
+
+    async def send_downarrow_then_tab(self, selector):
+        try:
+            await self.page.focus(selector)
+            await self.page.keyboard.press('ArrowDown')
+            await self.page.keyboard.press('Tab')
+            await asyncio.sleep(1)
+            log_message = "Pressed down arrow and tab key."
+            self.reporting.log_info(log_message)
+            return True, log_message
+        except Exception as e:
+            error_message = f"Failed to press down arrow and tab key: {str(e)}"
+            self.reporting.log_error(error_message)
+            return False, error_message
+
+    async def read_table(self, selector, wait=0, budget=20):
+        from modules.table_extraction import READ_TABLE_JS
+        try:
+            return await self.page.evaluate(READ_TABLE_JS, [selector, int(wait * 1000), int(budget * 1000)])
+        except Exception as e:
+            return {'error': str(e)}
+
+    async def next_table_page(self, selector, next_selector, timeout=10):
+        from modules.table_extraction import TURN_PAGE_JS
+        try:
+            return await self.page.evaluate(TURN_PAGE_JS, [selector, next_selector, int(timeout * 1000)])
+        except Exception as e:
+            self.reporting.log_error(f"Failed to turn table page: {str(e)}")
+            return 'unchanged'
+
+    async def save_screenshot(self, path):
+        await self.page.screenshot(path=path)
+
+    async def wait_for_page_settle(self, quiet_ms=300, timeout=3, poll_interval=0.05):
+        from modules.page_settle import async_wait_for_settle, SETTLE_PROBE_JS
+        return await async_wait_for_settle(lambda: self.page.evaluate(SETTLE_PROBE_JS), quiet_ms, timeout, poll_interval)
+
+    async def check_wait_condition(self, condition, selector):
+        from modules.page_settle import SETTLE_PROBE_JS, is_network_idle
+        kind = condition.kind
+        if kind == 'url':
+            return condition.argument in self.page.url
+        if kind == 'network_idle':
+            return is_network_idle(await self.page.evaluate(SETTLE_PROBE_JS))
+        element = await self.page.query_selector(selector)
+        if kind == 'gone':
+            return element is None or not await element.is_visible()
+        if element is None:
+            return False
+        if kind == 'visible':
+            return await element.is_visible()
+        if kind == 'clickable':
+            return await element.is_visible() and await element.is_enabled()
+        if kind == 'text':
+            return condition.argument in (await element.evaluate("e => e.innerText || e.value || ''") or '')
+        return False
+
+    async def reset_session(self):
+        """Replace the context with a fresh one and forget this dataset's $$ values."""
+        try:
+            await self.context.close()
+            await self._open_context()
+            self.variables.clear()
+            log_message = "Browser context replaced for reuse."
+            self.reporting.log_info(log_message)
+            return True, log_message
+        except Exception as e:
+            error_message = f"Failed to replace browser context: {str(e)}"
+            self.reporting.log_error(error_message)
+            return False, error_message
+
+    async def quit(self):
+        # Only this dataset's context is closed; the shared browser belongs to the executor
+        if self.context:
+            await self.context.close()
+        self.context = None
+        self.page = None
+        self.driver = None
+        self.reporting.log_info("Browser context closed and cleanup completed")
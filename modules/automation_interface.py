@@ -2,11 +2,40 @@
 # Defines a common interface for automation actions (Selenium/Playwright)
 
 from abc import ABC, abstractmethod
+from modules.step_timing import timed_locate
 
 class AutomationActionsInterface(ABC):
+    # Seconds spent in _find_element so far; process_step reports its growth as the step's locate time
+    locate_seconds = 0.0
+    # Scroll searches made so far (elements not in the DOM yet); process_step marks such steps located_by 'scroll'
+    scroll_searches = 0
+    # {(screen, field): seconds} learned from run history (see modules/locator_history.py), set by middleware
+    locator_timeouts = {}
+    # (screen, field, xpath) of the step being executed, set by process_step through set_step_locator
+    step_locator = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if '_find_element' in cls.__dict__:
+            cls._find_element = timed_locate(cls.__dict__['_find_element'])
+
     @abstractmethod
     def _find_element(self, selector):
         pass
+
+    def set_step_locator(self, screen, field, xpath):
+        """Tell the backend which step's locator it is about to look up (see element_timeout_for)."""
+        self.step_locator = (screen, field, xpath)
+
+    def element_timeout_for(self, selector, default):
+        """
+        Seconds to wait for selector's element: the learned timeout of the current step's
+        (screen, field) when selector is that step's locator, else default.
+        """
+        if self.step_locator is None or self.step_locator[2] != selector:
+            return default
+        return self.locator_timeouts.get(self.step_locator[:2], default)
+
     @abstractmethod
     def open_url(self, url):
         pass
@@ -46,3 +75,57 @@ class AutomationActionsInterface(ABC):
     @abstractmethod
     def quit(self):
         pass
+
+    def wait_for_page_settle(self, quiet_ms=300, timeout=3, poll_interval=0.05):
+        """
+        Wait until the document is ready, network requests have drained and the DOM has been quiet
+        for quiet_ms (see modules/page_settle.py). Returns (settled, elapsed_seconds); elapsed is
+        None when the backend cannot detect settling, and callers fall back to a fixed wait.
+        """
+        return False, None
+
+    def check_wait_condition(self, condition, selector):
+        """
+        One non-blocking check of a wait_conditions.WaitCondition (visible, clickable, text, url,
+        network_idle, gone) against the current page; selector is the step's locator.
+        Polled by wait_conditions.wait_for_condition.
+        """
+        raise NotImplementedError
+
+    def fill_fields(self, fields):
+        """
+        Fill [(selector, value), ...] in one browser call (see modules/form_fill.py). Returns a
+        set_value style (success, message) per field handled, in order, stopping after the first
+        failure; fields it did not reach run as normal steps. [] means batching is not supported.
+        """
+        return []
+
+    def read_values(self, selectors):
+        """
+        Read the values of several elements in one browser call (see modules/snapshot_assertions.py).
+        Returns {selector: value} with what get_value would return, for the selectors it could read;
+        the others are read one by one. {} means bulk reads are not supported.
+        """
+        return {}
+
+    def read_table(self, selector, wait=0, budget=20):
+        """
+        Read the table or grid at selector in one browser call (see modules/table_extraction.py),
+        waiting up to wait seconds for it to appear and spending at most budget seconds in the page:
+        {'headers': [...], 'rows': [[...], ...]}, None when there is no table, or {'error': message}.
+        """
+        return {'error': f"{type(self).__name__} does not support table reads"}
+
+    def next_table_page(self, selector, next_selector, timeout=10):
+        """
+        Click the next_selector pagination control and wait up to timeout seconds for the table at
+        selector to change. Returns 'advanced', 'last' (no enabled next control), 'unchanged' or 'missing'.
+        """
+        return 'last'
+
+    def reset_session(self):
+        """
+        Return the browser to a clean state for the next dataset (cookies, storage, extra tabs,
+        about:blank) so it can be reused instead of relaunched. Returns (success, message).
+        """
+        return False, f"{type(self).__name__} does not support session reset"
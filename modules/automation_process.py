@@ -3,136 +3,81 @@
 import time
 from modules.middleware import get_framework_class
 from modules.reporting_v2 import RobustReporting
+from modules.page_settle import get_post_action_wait
+from modules.wait_conditions import WaitCondition, wait_for_condition, get_default_condition_timeout
+from modules.step_timing import StepTimer
 import datetime
 import os
 import sys
 sys.path.append(os.path.join(os.path.dirname(os.path.dirname(__file__))))
 
-from customization import custom_actions as ca  # Now import directly as ca
-
+from modules.action_registry import resolve_action, unknown_action_message, extract_status_and_message
     
-def process_step(testcasename, screen, field, action, xpath, data, driver, reporting: RobustReporting, actions=None, dataset_number=None, get_pass_screenshot=False, testcase_description='', validation='', expected_validation='', wait_time_before_exec=0):
+def process_step(testcasename, screen, field, action, xpath, data, driver, reporting: RobustReporting, actions=None, dataset_number=None, get_pass_screenshot=False, testcase_description='', validation='', expected_validation='', wait_time_before_exec=0, handler=None, timer=None):
     """
     Process a single automation step.
-    Calls the appropriate SeleniumActions method based on the action.
+    Calls the action's registered function (see action_registry); handler is the step's ActionSpec
+    as resolved by the plan, and is looked up from the action keyword when not given.
     Records step result, error message, and screenshot (if failed) in step_results.
     Accepts testcase_description, validation, expected_validation for enhanced logging/reporting.
-    Accepts wait_time_before_exec to wait before element access.
+    Accepts wait_time_before_exec to wait before element access: seconds to sleep, or a
+    wait_conditions.WaitCondition polled until it holds (the step fails if it times out).
+    Each phase is timed (see step_timing) into the result's '<phase>_ms' columns; pass a StepTimer
+    to include work done before the call, such as binding the step's data.
     """
-    import base64
     import traceback
     status = 'pass'
     error_message = ''
-    action_lower = str(action).strip().lower() if action else ''
     result = None
+    element_cache = ''
+    located_by = ''
+    timer = timer or StepTimer()
     try:
-        # Dynamically get the correct actions class if not provided
-        if actions is None:
-            actions = get_framework_class()
+        with timer.phase('lookup'):
+            # Dynamically get the correct actions class if not provided
+            if actions is None:
+                actions = get_framework_class()
+            if handler is None:
+                handler = resolve_action(action)
         # Wait before execution if specified
-        if wait_time_before_exec and wait_time_before_exec > 0:
-            try:
-                time.sleep(float(wait_time_before_exec))
-            except Exception:
-                pass    
-
-        # Dynamically call custom action if action starts with 'custom-'
-        if action and action.startswith("custom-"):
-            action_name = action.replace("custom-", "")
-            try:
-                custom_function = getattr(ca, action_name, None)
-                if custom_function:
-                    success, message = custom_function(
-                        driver, actions, xpath, data, field, None, testcasename
-                    )
-                    if not success:
-                        status = 'fail'
-                        error_message = message
-                else:
-                    status = 'fail'
-                    error_message = f"Custom function '{action_name}' not found in custom_actions.py"
-            except Exception as e:
-                status = 'fail'
-                error_message = f"Error calling custom function '{action_name}': {str(e)}"
-        # Dynamically call custom component if action starts with 'component-'
-        elif action and action.startswith("component-"):
-            from customization import custom_component as cc
-            component_name = action.replace("component-", "")
-            try:
-                component_function = getattr(cc, component_name, None)
-                if component_function:
-                    # You may need to adjust arguments based on your custom component function signature
-                    result = component_function(testcasename, actions, driver, reporting, screen, field, xpath, data)
-                    status = 'pass'
-                    error_message = ''
-                else:
-                    status = 'fail'
-                    error_message = f"Component function '{component_name}' not found in custom_component.py"
-            except Exception as e:
-                status = 'fail'
-                error_message = f"Error calling component function '{component_name}': {str(e)}"
+        with timer.phase('pre_wait'):
+            wait_error = wait_before_step(actions, wait_time_before_exec, xpath)
+        if wait_error:
+            status = 'fail'
+            error_message = wait_error
+        elif handler is None:
+            error_message = unknown_action_message(action)
+            reporting.log_info(error_message)
+            print(f"[SKIP] {error_message}")
+            status = 'fail'
         else:
-            # Map new action names to logic
-            if action_lower == 'openurl':
-                result = actions.open_url(data)
-                status, error_message = extract_status_and_message(result, 'Failed to open URL')
-            elif action_lower == 'inputtext':
-                result = actions.set_value(xpath, data)
-                status, error_message = extract_status_and_message(result, 'Failed to set value')
-            elif action_lower == 'getelementtext':
-                result = actions.get_value(xpath)
-                status, error_message = extract_status_and_message(result, 'Failed to get value')
-            elif action_lower == 'assertvalue':
-                result = actions.assert_value(xpath, data)
-                status, error_message = extract_status_and_message(result, 'Failed to assert value')
-            elif action_lower == 'clickelement':
-                result = actions.element_click(xpath)
-                status, error_message = extract_status_and_message(result, 'Failed to click element')
-            elif action_lower == 'scrollpage':
-                result = actions.scroll_page()
-                status, error_message = extract_status_and_message(result, 'Failed to scroll page')
-            elif action_lower == 'cleartext':
-                result = actions.clear_text(xpath)
-                status, error_message = extract_status_and_message(result, 'Failed to clear text')
-            elif action_lower == 'iselementvisible': 
-                result = actions.is_element_visible(xpath)
-                status, error_message = extract_status_and_message(result, 'Failed to check element visibility')
-            elif action_lower == 'element_exists':
-                result = actions.element_exists(xpath)
-                status, error_message = extract_status_and_message(result, 'Failed to check element existence')
-            else:
-                reporting.log_info(f"No matching Selenium action for: {action}")
-                print(f"[SKIP] No matching Selenium action for: {action}")
-                status = 'fail'
-                error_message = f"No matching Selenium action for: {action}"
+            # Built-in, custom- and component- actions are all plain calls through their ActionSpec
+            located_before = getattr(actions, 'locate_seconds', 0.0)
+            cache = getattr(actions, 'element_cache', None)
+            cache_before = cache.snapshot() if cache is not None else None
+            scrolls_before = getattr(actions, 'scroll_searches', 0)
+            if hasattr(actions, 'set_step_locator'):
+                # Learned timeouts are per (Screen, Field), whatever xpath the step's template bound to
+                actions.set_step_locator(screen, field, xpath)
+            with timer.phase('action'):
+                status, error_message, result = handler.invoke(actions, driver, reporting, testcasename, screen, field, xpath, data)
+            if cache is not None:
+                element_cache = cache.outcome_since(cache_before)
+            if getattr(actions, 'scroll_searches', 0) > scrolls_before:
+                located_by = 'scroll'
+            # Time spent in the backend's _find_element is reported as locate rather than action
+            located = getattr(actions, 'locate_seconds', 0.0) - located_before
+            timer.add('locate', located)
+            timer.add('action', -located)
         
-        time.sleep(3)  # Wait for 3 seconds after each action
+        # Wait for the page to settle (or the configured fixed time) before the next step
+        with timer.phase('settle'):
+            settle_after_action(actions)
         # Optionally print or log the result
-        # Prepare a more readable, multiline log line
-        log_line = (
-            f"[Step Execution @ {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}]\n"
-            f"  TestCase   : {testcasename}\n"
-            f"  Dataset    : {dataset_number}\n"
-            f"  Screen     : {screen}\n"
-            f"  Field      : {field}\n"
-            f"  ExplicitWaitTime : {wait_time_before_exec}\n"
-            f"  Action     : {action}\n"
-            f"  Xpath      : {xpath}\n"
-            f"  Data       : {data}\n"
-            f"  TestCaseDescription : {testcase_description}\n"
-            f"  Validation         : {validation}\n"
-            f"  ExpectedValidation : {expected_validation}\n"
-            f"  Status     : {status}\n"
-            f"  Message    : {error_message if error_message else result}\n"
-            f"{'-'*60}"
-        )
-        # Write to execution_log.txt in the report folder
-        report_folder = os.environ.get('CURRENT_REPORT_FOLDER')
-        if report_folder:
-            log_path = os.path.join(report_folder, 'execution_log.txt')
-            with open(log_path, 'a', encoding='utf-8') as logf:
-                logf.write(log_line + '\n')
-        print(log_line)
+        with timer.phase('log'):
+            write_step_log(testcasename, dataset_number, screen, field, wait_time_before_exec, action, xpath, data,
+                           testcase_description, validation, expected_validation, status,
+                           error_message if error_message else result)
     except Exception as e:
         status = 'fail'
         error_message = f"Exception in process_step: {e}\n{traceback.format_exc()}"
@@ -143,21 +88,156 @@ def process_step(testcasename, screen, field, action, xpath, data, driver, repor
     screenshot_path = ''
     if (status == 'fail' and driver is not None) or (get_pass_screenshot and status == 'pass' and driver is not None):
         try:
-            # Save screenshot to file in Screenshots folder inside the report folder
-            report_folder = os.environ.get('CURRENT_REPORT_FOLDER')
-            if report_folder:
-                screenshots_dir = os.path.join(report_folder, 'Screenshots')
-                os.makedirs(screenshots_dir, exist_ok=True)
-                screenshot_filename = f"{testcasename}_{screen}_{field}_{action}_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.png"
-                screenshot_path = os.path.join(screenshots_dir, screenshot_filename)
-                driver.save_screenshot(screenshot_path)
-            else:
-                screenshot_path = ''
+            with timer.phase('screenshot'):
+                screenshot_path = get_screenshot_path(testcasename, dataset_number, screen, field, action)
+                if screenshot_path:
+                    driver.save_screenshot(screenshot_path)
         except Exception as e:
             screenshot_path = ''
             error_message += f" | Screenshot error: {e}"
     # Prepare and return step result
-    return {
+    return build_step_result(testcasename, dataset_number, screen, field, action, xpath, data, status,
+                             error_message, screenshot_path, testcase_description, validation, expected_validation,
+                             timer.columns(), element_cache, located_by)
+
+def process_fill_batch(testcasename, steps, values, driver, reporting: RobustReporting, actions, dataset_number=None, timers=None):
+    """
+    Fill a run of InputText steps (see form_fill.group_step_runs) with one actions.fill_fields call.
+    Returns the step results of the fields the backend handled, in step order. The batch stops at
+    the first failing field and the steps after it fail as not filled; when it stops at a field it
+    cannot fill in-page, that field and the rest are left to process_step.
+    The batch's action time is shared equally by its fields; its settle time goes to the last one.
+    """
+    timers = timers or [StepTimer() for _ in steps]
+    start = time.perf_counter()
+    try:
+        outcomes = actions.fill_fields([(step['xpath'], value) for step, value in zip(steps, values)])
+    except Exception as e:
+        reporting.log_error(f"Batched form fill failed, filling the fields one by one: {e}")
+        outcomes = []
+    if not outcomes:
+        return []
+    share = (time.perf_counter() - start) / len(outcomes)
+    with timers[len(outcomes) - 1].phase('settle'):
+        settle_after_action(actions)
+
+    results = []
+    for step, value, timer, (success, message) in zip(steps, values, timers, outcomes):
+        timer.add('action', share)
+        status, error_message = extract_status_and_message((success, message), step['handler'].fail_message)
+        with timer.phase('log'):
+            write_step_log(testcasename, dataset_number, step['screen'], step['field'], step['wait_time'], step['action'],
+                           step['xpath'], value, step['testcase_description'], step['validation'],
+                           step['expected_validation'], status, error_message if error_message else message)
+        screenshot_path = ''
+        if status == 'fail' and driver is not None:
+            try:
+                with timer.phase('screenshot'):
+                    screenshot_path = get_screenshot_path(testcasename, dataset_number, step['screen'], step['field'], step['action'])
+                    if screenshot_path:
+                        driver.save_screenshot(screenshot_path)
+            except Exception as e:
+                screenshot_path = ''
+                error_message += f" | Screenshot error: {e}"
+        results.append(build_step_result(testcasename, dataset_number, step['screen'], step['field'], step['action'],
+                                         step['xpath'], value, status, error_message, screenshot_path,
+                                         step['testcase_description'], step['validation'], step['expected_validation'],
+                                         timer.columns(total=sum(timer.seconds.values()))))
+    if outcomes[-1][0]:
+        return results
+    failed = steps[len(outcomes) - 1]
+    error_message = f"Not filled: the batched fill stopped at the failed field {failed['screen']}/{failed['field']}"
+    for step, value, timer in zip(steps[len(outcomes):], values[len(outcomes):], timers[len(outcomes):]):
+        with timer.phase('log'):
+            write_step_log(testcasename, dataset_number, step['screen'], step['field'], step['wait_time'], step['action'],
+                           step['xpath'], value, step['testcase_description'], step['validation'],
+                           step['expected_validation'], 'fail', error_message)
+        results.append(build_step_result(testcasename, dataset_number, step['screen'], step['field'], step['action'],
+                                         step['xpath'], value, 'fail', error_message, '',
+                                         step['testcase_description'], step['validation'], step['expected_validation'],
+                                         timer.columns(total=sum(timer.seconds.values()))))
+    return results
+
+def wait_before_step(actions, wait, selector):
+    """
+    Apply a step's WaitTimeInSec value: sleep for a number of seconds, or poll a WaitCondition
+    until it holds. Returns '' when the step may run, otherwise the timeout message.
+    """
+    if isinstance(wait, WaitCondition):
+        met, detail = wait_for_condition(actions, wait, selector, get_default_condition_timeout())
+        return '' if met else detail
+    if wait and wait > 0:
+        try:
+            time.sleep(float(wait))
+        except Exception:
+            pass
+    return ''
+
+def settle_after_action(actions):
+    """
+    Apply the configured post-action wait (config 'post_action_wait') and return the seconds spent.
+    'settle' waits for the page to settle, capped by its timeout; 'fixed' sleeps fixed_seconds;
+    'none' returns at once. Backends that cannot detect settling get the fixed sleep.
+    """
+    settings = get_post_action_wait()
+    if settings['strategy'] == 'none':
+        return 0.0
+    if settings['strategy'] == 'settle':
+        settled, elapsed = actions.wait_for_page_settle(settings['quiet_ms'], settings['timeout'], settings['poll_interval'])
+        if elapsed is not None:
+            return round(elapsed, 3)
+    time.sleep(float(settings['fixed_seconds']))
+    return float(settings['fixed_seconds'])
+
+def write_step_log(testcasename, dataset_number, screen, field, wait_time_before_exec, action, xpath, data,
+                   testcase_description, validation, expected_validation, status, message):
+    """Print the multiline step log and append it to execution_log.txt in the report folder."""
+    log_line = (
+        f"[Step Execution @ {datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}]\n"
+        f"  TestCase   : {testcasename}\n"
+        f"  Dataset    : {dataset_number}\n"
+        f"  Screen     : {screen}\n"
+        f"  Field      : {field}\n"
+        f"  ExplicitWaitTime : {wait_time_before_exec}\n"
+        f"  Action     : {action}\n"
+        f"  Xpath      : {xpath}\n"
+        f"  Data       : {data}\n"
+        f"  TestCaseDescription : {testcase_description}\n"
+        f"  Validation         : {validation}\n"
+        f"  ExpectedValidation : {expected_validation}\n"
+        f"  Status     : {status}\n"
+        f"  Message    : {message}\n"
+        f"{'-'*60}"
+    )
+    # Write to execution_log.txt in the report folder
+    report_folder = os.environ.get('CURRENT_REPORT_FOLDER')
+    if report_folder:
+        log_path = os.path.join(report_folder, 'execution_log.txt')
+        with open(log_path, 'a', encoding='utf-8') as logf:
+            logf.write(log_line + '\n')
+    print(log_line)
+
+def get_screenshot_path(testcasename, dataset_number, screen, field, action):
+    """Path for a step screenshot in the report folder's Screenshots folder ('' without a report folder)."""
+    report_folder = os.environ.get('CURRENT_REPORT_FOLDER')
+    if not report_folder:
+        return ''
+    screenshots_dir = os.path.join(report_folder, 'Screenshots')
+    os.makedirs(screenshots_dir, exist_ok=True)
+    # Dataset number and process id keep names unique when workers run in parallel
+    screenshot_filename = f"{testcasename}_{dataset_number}_{screen}_{field}_{action}_{os.getpid()}_{datetime.datetime.now().strftime('%Y%m%d_%H%M%S_%f')}.png"
+    return os.path.join(screenshots_dir, screenshot_filename)
+
+def build_step_result(testcasename, dataset_number, screen, field, action, xpath, data, status, error_message,
+                      screenshot_path, testcase_description='', validation='', expected_validation='',
+                      timings=None, element_cache='', located_by=''):
+    """
+    Step result row as collected in step_results and written to the reports; timings is a
+    StepTimer.columns() dict of phase durations in milliseconds, element_cache the step's
+    element_cache outcome ('hit', 'miss', 'stale' or '' when no element was looked up) and
+    located_by how the element was found when not by a plain lookup ('scroll' search or 'snapshot' read).
+    """
+    row = {
         'testcasename': testcasename,
         'dataset number': dataset_number,
         'screen': screen,
@@ -170,27 +250,9 @@ def process_step(testcasename, screen, field, action, xpath, data, driver, repor
         'screenshot': screenshot_path,
         'testcase_description': testcase_description,
         'validation': validation,
-        'expected_validation': expected_validation
+        'expected_validation': expected_validation,
+        'element_cache': element_cache,
+        'located_by': located_by,
     }
-
-def extract_status_and_message(result, default_fail_msg):
-    """
-    Helper to extract status and error message from a SeleniumActions result.
-    Returns (status, error_message).
-    """
-    if isinstance(result, tuple):
-        # Expecting (success, message)
-        success, message = result
-        if not success:
-            return 'fail', message or default_fail_msg
-        else:
-            return 'pass', ''
-    elif isinstance(result, dict):
-        if not result.get('success', True):
-            return 'fail', result.get('message', default_fail_msg)
-        else:
-            return 'pass', ''
-    elif result is False:
-        return 'fail', default_fail_msg
-    else:
-        return 'pass', ''
+    row.update(timings or {})
+    return row
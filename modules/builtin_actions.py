@@ -0,0 +1,61 @@
+# builtin_actions.py
+# The built-in action keywords, registered in modules/action_registry.py. Each calls one method of
+# the actions object (SeleniumActions, PlaywrightActions, ...); for the async engine the method
+# returns a coroutine, which the caller awaits.
+
+import inspect
+
+from modules.action_registry import register_action
+
+
+@register_action('openurl', fail_message='Failed to open URL', uses_data=True)
+def open_url(actions, xpath, data):
+    return actions.open_url(data)
+
+
+@register_action('inputtext', fail_message='Failed to set value', needs_locator=True, uses_data=True)
+def input_text(actions, xpath, data):
+    return actions.set_value(xpath, data)
+
+
+@register_action('getelementtext', fail_message='Failed to get value', needs_locator=True)
+def get_element_text(actions, xpath, data):
+    return actions.get_value(xpath)
+
+
+@register_action('assertvalue', fail_message='Failed to assert value', needs_locator=True, uses_data=True)
+def assert_value(actions, xpath, data):
+    return actions.assert_value(xpath, data)
+
+
+@register_action('clickelement', fail_message='Failed to click element', needs_locator=True)
+def click_element(actions, xpath, data):
+    return actions.element_click(xpath)
+
+
+@register_action('scrollpage', fail_message='Failed to scroll page')
+def scroll_page(actions, xpath, data):
+    return actions.scroll_page()
+
+
+@register_action('cleartext', fail_message='Failed to clear text', needs_locator=True)
+def clear_text(actions, xpath, data):
+    return actions.clear_text(xpath)
+
+
+@register_action('iselementvisible', fail_message='Failed to check element visibility', needs_locator=True)
+def is_element_visible(actions, xpath, data):
+    return actions.is_element_visible(xpath)
+
+
+@register_action('element_exists', fail_message='Failed to check element existence', needs_locator=True)
+def element_exists(actions, xpath, data):
+    return actions.element_exists(xpath)
+
+
+@register_action('findtablerow', fail_message='Failed to find table row', needs_locator=True, uses_data=True)
+def find_table_row(actions, xpath, data):
+    # data: "$$var = <column> where <match column> = <value>" (see modules/table_extraction.py)
+    from modules.table_extraction import search_table, search_table_async
+    search = search_table_async if inspect.iscoroutinefunction(actions.read_table) else search_table
+    return search(actions, xpath, data, actions.reporting)
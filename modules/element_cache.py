@@ -0,0 +1,84 @@
+# element_cache.py
+# Page-scoped cache of resolved element handles, keyed by locator, so consecutive steps on the
+# same field (GetElementText then AssertValue, ClearText then InputText) skip the lookup.
+
+HIT = 'hit'
+MISS = 'miss'
+STALE = 'stale'
+
+
+class ElementCache:
+    """
+    Locator -> element handle (WebElement / ElementHandle) for the page in use. The backend
+    invalidates it on navigation, reload, tab switch and session reset, and discards single
+    entries it finds stale. A stale hit is counted as a miss (and as stale) since the element
+    had to be located again.
+    """
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._entries = {}
+        self._scope = None
+        self.stats = {'hits': 0, 'misses': 0, 'stale': 0, 'invalidations': 0}
+
+    def get(self, selector, scope=None):
+        """Cached handle for selector or None. A scope other than the last one (e.g. another page) empties the cache first."""
+        if scope is not self._scope:
+            self.invalidate()
+            self._scope = scope
+        handle = self._entries.get(selector)
+        if handle is None:
+            self.stats['misses'] += 1
+        else:
+            self.stats['hits'] += 1
+        return handle
+
+    def put(self, selector, handle):
+        if len(self._entries) >= self.max_entries:
+            # Drop the oldest entry; dicts keep insertion order
+            self._entries.pop(next(iter(self._entries)))
+        self._entries[selector] = handle
+
+    def discard(self, selector):
+        """Forget a handle that turned out stale right after get() returned it."""
+        if self._entries.pop(selector, None) is not None:
+            self.stats['hits'] -= 1
+            self.stats['misses'] += 1
+            self.stats['stale'] += 1
+
+    def invalidate(self):
+        """Forget every handle (the page navigated, reloaded or changed)."""
+        if self._entries:
+            self._entries.clear()
+            self.stats['invalidations'] += 1
+
+    def snapshot(self):
+        return dict(self.stats)
+
+    def outcome_since(self, before):
+        """'hit', 'miss', 'stale' or '' (no lookup) for the lookups made since snapshot() returned before."""
+        if self.stats['stale'] > before['stale']:
+            return STALE
+        if self.stats['misses'] > before['misses']:
+            return MISS
+        if self.stats['hits'] > before['hits']:
+            return HIT
+        return ''
+
+
+def summarize_element_cache(step_results):
+    """{'hit': n, 'miss': n, 'stale': n} over the step results' element_cache column."""
+    counts = {HIT: 0, MISS: 0, STALE: 0}
+    for step in step_results:
+        outcome = step.get('element_cache')
+        if outcome in counts:
+            counts[outcome] += 1
+    return counts
+
+
+def format_cache_summary(hit, miss, stale):
+    """One-line summary of element cache use, in the style of format_session_stats."""
+    lookups = hit + miss + stale
+    if not lookups:
+        return "Element cache: no element lookups"
+    return (f"Element cache: {hit} hit(s), {miss + stale} miss(es) ({stale} stale), "
+            f"hit rate {hit / lookups:.0%} over {lookups} step(s)")
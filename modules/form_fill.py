@@ -0,0 +1,155 @@
+# form_fill.py
+# Batched form fill: runs of consecutive InputText steps on one screen are filled with a single
+# in-page script (FILL_FIELDS_JS) instead of one lookup, type check, clear, send_keys and TAB per
+# field. Each field still gets its own step result (see automation_process.process_fill_batch).
+
+from modules.builtin_actions import input_text
+from modules.wait_conditions import WaitCondition
+
+# Runs shorter than this are not worth a batch
+MIN_BATCH_SIZE = 2
+
+# find(selector) for the in-page batch scripts: XPath (as detected by SeleniumActions, or with
+# Playwright's xpath= prefix) or CSS (optionally css=). Shared with modules/snapshot_assertions.py.
+FIND_ELEMENT_JS = """
+    function find(selector) {
+        var s = selector.trim();
+        if (s.indexOf('xpath=') === 0) s = s.slice(6);
+        else if (s.indexOf('css=') === 0) return document.querySelector(s.slice(4));
+        if (s[0] === '/' || s[0] === '(' || s.indexOf('..') === 0 || s.indexOf('[@') !== -1) {
+            return document.evaluate(s, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+        }
+        return document.querySelector(s);
+    }
+"""
+
+# Fills [[selector, value], ...] in order: resolves each field (XPath or CSS), sets text values
+# through the native value setter with input/change events (so framework bindings see them),
+# toggles checkboxes/radios by clicking, picks <select> options by visible text and blurs the
+# field like the TAB that set_value sends. Keyboard events are not simulated.
+# Returns one {handled, ok, message} per field it reached. It stops at the first failure and at
+# the first field it cannot fill in-page (missing, hidden, disabled or an unsupported type:
+# handled false), which the caller then runs as a normal step.
+FILL_FIELDS_JS = """
+(fields) => {
+    var TEXT_TYPES = ['text', 'email', 'number', 'password', 'search', 'tel', 'url'];
+""" + FIND_ELEMENT_JS + """    function usable(el) {
+        if (!el || !el.isConnected || el.disabled || el.readOnly) return false;
+        var style = window.getComputedStyle(el);
+        return style.display !== 'none' && style.visibility !== 'hidden' && el.getClientRects().length > 0;
+    }
+    function fire(el, type) {
+        el.dispatchEvent(new Event(type, {bubbles: true}));
+    }
+    var results = [];
+    for (var i = 0; i < fields.length; i++) {
+        var value = fields[i][1], el;
+        try { el = find(fields[i][0]); } catch (e) { el = null; }
+        if (!usable(el)) {
+            results.push({handled: false});
+            break;
+        }
+        var tag = el.tagName.toLowerCase(), type = String(el.type || '').toLowerCase();
+        try {
+            el.focus();
+            if (tag === 'textarea' || (tag === 'input' && TEXT_TYPES.indexOf(type) !== -1)) {
+                var proto = tag === 'textarea' ? HTMLTextAreaElement.prototype : HTMLInputElement.prototype;
+                Object.getOwnPropertyDescriptor(proto, 'value').set.call(el, value);
+                fire(el, 'input');
+                fire(el, 'change');
+            } else if (tag === 'input' && (type === 'checkbox' || type === 'radio')) {
+                var wanted = ['true', 'yes', '1'].indexOf(value.toLowerCase()) !== -1;
+                if (el.checked !== wanted) el.click();
+            } else if (tag === 'select') {
+                var option = null;
+                for (var j = 0; j < el.options.length; j++) {
+                    if (el.options[j].text.trim() === value.trim()) { option = el.options[j]; break; }
+                }
+                if (!option) {
+                    results.push({handled: true, ok: false, message: 'Cannot locate option with visible text: ' + value});
+                    break;
+                }
+                option.selected = true;
+                fire(el, 'input');
+                fire(el, 'change');
+            } else {
+                results.push({handled: false});
+                break;
+            }
+            el.blur();
+            results.push({handled: true, ok: true});
+        } catch (e) {
+            results.push({handled: true, ok: false, message: String(e)});
+            break;
+        }
+    }
+    return results;
+}
+"""
+
+_batch_form_fill = None
+
+
+def is_batch_fill_enabled():
+    """
+    Config 'batch_form_fill' (default false), read once. The batch sets values and fires input/change
+    events but no key events, so it is opt-in for forms that do not listen for keydown/keyup/keypress.
+    """
+    global _batch_form_fill
+    if _batch_form_fill is None:
+        from modules.middleware import get_config
+        _batch_form_fill = bool(get_config().get('batch_form_fill', False))
+    return _batch_form_fill
+
+
+def is_fillable(step):
+    """A plain InputText step that can join a batch: built-in handler, no pre-wait, no pass screenshot."""
+    handler = step.get('handler')
+    return (handler is not None and handler.func is input_text and step['xpath'] and step['data'] is not None
+            and not isinstance(step['wait_time'], WaitCondition) and not step['wait_time']
+            and not step['get_pass_screenshot'])
+
+
+def group_step_runs(steps, classify):
+    """
+    Yield (kind, steps) in order: runs of at least MIN_BATCH_SIZE consecutive steps on the same
+    screen that classify(step) puts in the same kind (e.g. 'fill'), and (None, [step]) for every
+    other step.
+    """
+    kind, run = None, []
+    for step in steps:
+        step_kind = classify(step)
+        if step_kind is not None and step_kind == kind and run[0]['screen'] == step['screen']:
+            run.append(step)
+            continue
+        yield from _flush(kind, run)
+        kind, run = step_kind, [step]
+    yield from _flush(kind, run)
+
+
+def _flush(kind, run):
+    if kind is not None and len(run) >= MIN_BATCH_SIZE:
+        yield kind, run
+    else:
+        for step in run:
+            yield None, [step]
+
+
+def fill_outcomes(raw_results, fields, reporting):
+    """
+    Turn FILL_FIELDS_JS results into set_value style (success, message) tuples for the fields the
+    script handled, logging each like set_value does.
+    """
+    outcomes = []
+    for (selector, value), result in zip(fields, raw_results or []):
+        if not result.get('handled'):
+            break
+        if result.get('ok'):
+            reporting.log_info(f"Set value '{value}' to element: {selector}")
+            outcomes.append((True, None))
+        else:
+            error_message = f"Failed to set value: {result.get('message')}"
+            reporting.log_error(error_message)
+            outcomes.append((False, error_message))
+            break
+    return outcomes
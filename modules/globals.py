@@ -1 +1,45 @@
-global_dict = {}
\ No newline at end of file
+# globals.py
+# $$ variables stored by steps; carried across datasets, except on pool workers (see parallel_runner._run_job).
+# The async engine runs many datasets in one process, so there each dataset's asyncio task reads and
+# writes its own dict (AsyncPlaywrightActions.variables) through global_dict, see use_dataset_variables.
+
+import contextvars
+from collections.abc import MutableMapping
+
+_dataset_variables = contextvars.ContextVar('dataset_variables', default=None)
+
+
+class _Variables(MutableMapping):
+    """The process-wide $$ variables, or the current task's dict once use_dataset_variables was called in it."""
+    def __init__(self):
+        self._shared = {}
+
+    def _store(self):
+        variables = _dataset_variables.get()
+        return self._shared if variables is None else variables
+
+    def __getitem__(self, key):
+        return self._store()[key]
+
+    def __setitem__(self, key, value):
+        self._store()[key] = value
+
+    def __delitem__(self, key):
+        del self._store()[key]
+
+    def __iter__(self):
+        return iter(self._store())
+
+    def __len__(self):
+        return len(self._store())
+
+    def __repr__(self):
+        return repr(self._store())
+
+
+global_dict = _Variables()
+
+
+def use_dataset_variables(variables):
+    """Route global_dict to variables for the rest of the current asyncio task (each task has its own context)."""
+    _dataset_variables.set(variables)
@@ -0,0 +1,191 @@
+# locator_history.py
+# Readiness history per (Screen, Field) locator across runs, kept in a small SQLite file next to
+# config/. Each run records how long every located element took to become ready; later runs use
+# the history for per-locator element timeouts (p99 x margin, clamped) instead of one fixed wait,
+# and the end-of-run drift report lists locators whose readiness time is creeping up.
+# Samples are keyed by (Screen, Field), not by the bound xpath, so a templated locator (<<key>>)
+# that resolves to a different xpath for every dataset still builds up one history.
+
+import datetime
+import os
+import sqlite3
+import statistics
+
+HISTORY_FOLDER = os.path.join(os.path.dirname(os.path.dirname(__file__)), '.locator_history')
+HISTORY_FILE = os.path.join(HISTORY_FOLDER, 'locator_history.sqlite3')
+
+DEFAULT_ADAPTIVE_TIMEOUTS = {
+    'enabled': True,
+    'percentile': 99,       # readiness percentile the timeout is based on
+    'margin': 3.0,          # timeout = percentile x margin ...
+    'min_seconds': 2,       # ... clamped to [min_seconds, max_seconds[backend]]
+    'max_seconds': {
+        'selenium': 14,     # Selenium may wait twice the timeout (presence, then clickability) within its 30 s script timeout
+        'playwright': 30,   # Playwright's own default wait
+    },
+    'min_samples': 5,       # locators with fewer samples keep the backend's default timeout
+    'history_size': 200,    # samples kept per locator
+    'drift_window': 10,     # the newest samples compared against the ones before them
+    'drift_ratio': 1.5,     # flag when the recent median is this many times the earlier one ...
+    'drift_min_ms': 100,    # ... and at least this many ms slower
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS samples (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    recorded_at TEXT NOT NULL,
+    screen TEXT NOT NULL,
+    field TEXT NOT NULL,
+    xpath TEXT NOT NULL,
+    ready_ms REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS samples_screen_field ON samples (screen, field, id);
+"""
+
+# located_by values whose locate time is not the element's readiness (see readiness_samples)
+_NOT_READINESS = ('scroll', 'snapshot')
+
+_settings = None
+_locator_timeouts = {}
+
+
+def get_adaptive_timeouts():
+    """Settings from config 'adaptive_timeouts' merged over the defaults (read once)."""
+    global _settings
+    if _settings is None:
+        from modules.middleware import get_config
+        settings = dict(DEFAULT_ADAPTIVE_TIMEOUTS)
+        settings.update(get_config().get('adaptive_timeouts') or {})
+        _settings = settings
+    return _settings
+
+
+def _connect(path):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def readiness_samples(step_results):
+    """
+    [(screen, field, xpath, ready_ms)] from a run's step results: passed steps whose element was
+    located (not served from the element cache), using the step's locate time. Steps answered from
+    a snapshot read or found by a scroll search (located_by) are left out: their time measures the
+    bulk read or the scrolling, not how long the element took to become ready. The bound xpath is
+    stored with each sample for reference only; history and timeouts are per (screen, field).
+    """
+    samples = []
+    for step in step_results:
+        ready_ms = step.get('locate_ms')
+        if (step.get('xpath') and ready_ms and str(step.get('execution_status', '')).lower() == 'pass'
+                and step.get('element_cache') != 'hit' and step.get('located_by') not in _NOT_READINESS
+                and not step.get('snapshot_ms')):
+            samples.append((str(step.get('screen') or ''), str(step.get('field') or ''), step['xpath'], float(ready_ms)))
+    return samples
+
+
+def record_locator_history(step_results, path=HISTORY_FILE, history_size=None):
+    """Append this run's readiness samples and keep the newest history_size per locator. Returns the number recorded."""
+    samples = readiness_samples(step_results)
+    if not samples:
+        return 0
+    if history_size is None:
+        history_size = get_adaptive_timeouts()['history_size']
+    recorded_at = datetime.datetime.now().isoformat(timespec='seconds')
+    with _connect(path) as conn:
+        conn.executemany("INSERT INTO samples (recorded_at, screen, field, xpath, ready_ms) VALUES (?, ?, ?, ?, ?)",
+                         [(recorded_at, *sample) for sample in samples])
+        conn.execute("""
+            DELETE FROM samples WHERE id IN (
+                SELECT id FROM (
+                    SELECT id, ROW_NUMBER() OVER (PARTITION BY screen, field ORDER BY id DESC) AS newest
+                    FROM samples)
+                WHERE newest > ?)""", (int(history_size),))
+    conn.close()
+    return len(samples)
+
+
+def load_locator_history(path=HISTORY_FILE):
+    """{(screen, field): [ready_ms, ...] oldest first}, empty when there is no history yet."""
+    if not os.path.exists(path):
+        return {}
+    history = {}
+    conn = _connect(path)
+    try:
+        for screen, field, ready_ms in conn.execute("SELECT screen, field, ready_ms FROM samples ORDER BY id"):
+            history.setdefault((screen, field), []).append(ready_ms)
+    finally:
+        conn.close()
+    return history
+
+
+def percentile(values, pct):
+    """Nearest-rank percentile of a non-empty list."""
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))  # ceil(n * pct / 100)
+    return ordered[int(rank) - 1]
+
+
+def max_seconds_for(settings, backend):
+    """The timeout cap for a backend: max_seconds is a number or {backend: seconds}; unknown backends get the lowest cap."""
+    caps = settings['max_seconds']
+    if not isinstance(caps, dict):
+        return float(caps)
+    return float(caps.get(backend, min(caps.values())))
+
+
+def derive_locator_timeouts(history, settings=None, backend='selenium'):
+    """
+    {(screen, field): timeout seconds} from load_locator_history's result, capped at the backend's
+    max_seconds. Locators with fewer than min_samples samples are left out.
+    """
+    settings = settings or get_adaptive_timeouts()
+    max_seconds = max_seconds_for(settings, backend)
+    timeouts = {}
+    for locator, samples in history.items():
+        if len(samples) < settings['min_samples']:
+            continue
+        seconds = percentile(samples, settings['percentile']) / 1000 * float(settings['margin'])
+        timeouts[locator] = round(min(max(seconds, float(settings['min_seconds'])), max_seconds), 3)
+    return timeouts
+
+
+def get_locator_timeouts(backend='selenium'):
+    """Learned per-locator timeouts for a backend in this process ({} when disabled or without history), read once."""
+    if backend not in _locator_timeouts:
+        settings = get_adaptive_timeouts()
+        _locator_timeouts[backend] = (derive_locator_timeouts(load_locator_history(), settings, backend)
+                                      if settings['enabled'] else {})
+    return _locator_timeouts[backend]
+
+
+def find_drifting_locators(history, settings=None):
+    """
+    Locators whose median readiness over the newest drift_window samples is drift_ratio times
+    (and drift_min_ms more than) the median of the samples before them, slowest growth first.
+    """
+    settings = settings or get_adaptive_timeouts()
+    window = int(settings['drift_window'])
+    drifting = []
+    for (screen, field), samples in history.items():
+        if len(samples) < 2 * window:
+            continue
+        recent = statistics.median(samples[-window:])
+        baseline = statistics.median(samples[:-window])
+        if recent >= baseline * float(settings['drift_ratio']) and recent - baseline >= float(settings['drift_min_ms']):
+            drifting.append({'screen': screen, 'field': field, 'baseline_ms': baseline,
+                             'recent_ms': recent, 'ratio': recent / baseline if baseline else float('inf'),
+                             'samples': len(samples)})
+    return sorted(drifting, key=lambda entry: entry['ratio'], reverse=True)
+
+
+def format_drift_report(drifting, top=10):
+    """Multiline text of find_drifting_locators' result for the console and the execution log."""
+    if not drifting:
+        return "Locator drift: no locator readiness times drifting upward"
+    lines = [f"Locator drift: {len(drifting)} locator(s) getting slower to become ready:"]
+    for entry in drifting[:top]:
+        lines.append(f"    {entry['baseline_ms']:9.1f} -> {entry['recent_ms']:.1f} ms (x{entry['ratio']:.1f}, "
+                     f"{entry['samples']} samples)  {entry['screen']}/{entry['field']}")
+    return "\n".join(lines)
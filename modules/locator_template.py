@@ -0,0 +1,57 @@
+# locator_template.py
+# Precompiled CommonSheet locators with <<column>> placeholders bound from data sheet rows.
+
+import re
+
+_PLACEHOLDER = re.compile(r"<<([^<>]+)>>")
+
+
+class LocatorTemplate:
+    """
+    A CommonSheet xpath/selector parsed once into literal text and <<column>> slots.
+    Rendering joins the parts in a single pass instead of re-scanning the string per dataset.
+    """
+    __slots__ = ('source', '_parts', 'placeholders')
+
+    def __init__(self, source):
+        self.source = source or ''
+        # Even positions are literal text, odd positions are data sheet column names
+        self._parts = _PLACEHOLDER.split(self.source)
+        self.placeholders = tuple(dict.fromkeys(self._parts[1::2]))
+
+    def __repr__(self):
+        return f"LocatorTemplate({self.source!r})"
+
+    def __str__(self):
+        return self.source
+
+    def __eq__(self, other):
+        return isinstance(other, LocatorTemplate) and other.source == self.source
+
+    def __hash__(self):
+        return hash(self.source)
+
+    @property
+    def is_static(self):
+        return not self.placeholders
+
+    def missing_columns(self, columns):
+        """Placeholders that do not name one of the given data sheet columns."""
+        return [key for key in self.placeholders if key not in columns]
+
+    def render(self, values):
+        """Render for one dataset row; values maps column name -> cell text."""
+        if self.is_static:
+            return self.source
+        parts = self._parts
+        return ''.join(part if i % 2 == 0 else str(values[part]) for i, part in enumerate(parts))
+
+    def render_columns(self, column_text, row_count):
+        """
+        Render for many dataset rows at once.
+        column_text(column) must return the list of cell texts for that column (one per row).
+        """
+        if self.is_static:
+            return [self.source] * row_count
+        pieces = [[part] * row_count if i % 2 == 0 else column_text(part) for i, part in enumerate(self._parts)]
+        return [''.join(values) for values in zip(*pieces)]
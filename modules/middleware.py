@@ -8,16 +8,37 @@ from modules.reporting_v2 import RobustReporting
 #CONFIG_PATH = os.path.join(os.path.dirname(__file__), 'config', 'automation_config.json')
 CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'config', 'automation_config.json')
 
+def get_config():
+    """Return the parsed config/automation_config.json (or the file named by AUTOMATION_CONFIG)."""
+    with open(os.environ.get('AUTOMATION_CONFIG') or CONFIG_PATH, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
 def get_framework_class(driver=None, browser_type='edge', headless=False):
-    with open(CONFIG_PATH, 'r', encoding='utf-8') as f:
-        config = json.load(f)
+    config = get_config()
     framework = config.get('framework', 'selenium').lower()
+    headless = config.get('headless', headless)
     reporting = RobustReporting()
     if framework == 'selenium':
         from modules.selenium_actions import SeleniumActions
-        return SeleniumActions(reporting)
+        actions = SeleniumActions(reporting, browser=config.get('browser', 'edge'), headless=headless,
+                                  script_resolver=config.get('selenium_script_resolver', True))
     elif framework == 'playwright':
-        from modules.playwright_actions import PlaywrightActions
-        return PlaywrightActions(reporting, browser_type=browser_type, headless=headless)
+        from modules.playwright_actions import PlaywrightActions, get_shared_browser_host
+        if config.get('playwright_mode', 'browser_per_dataset') == 'context_per_dataset':
+            # One browser per process; every instance gets its own lightweight BrowserContext
+            actions = PlaywrightActions(reporting, browser_type=browser_type, headless=headless,
+                                        host=get_shared_browser_host(headless=headless))
+        else:
+            actions = PlaywrightActions(reporting, browser_type=browser_type, headless=headless)
+    elif framework == 'simulated':
+        # In-memory DOM, no browser: measures engine overhead (see modules/simulated_actions.py)
+        from modules.simulated_actions import SimulatedActions
+        return SimulatedActions(reporting, settings=config.get('simulated'))
+    elif framework == 'playwright_async':
+        raise ValueError("The 'playwright_async' framework is driven by modules.async_executor, not by get_framework_class")
     else:
         raise ValueError(f"Unsupported framework: {framework}")
+    # Per-locator element timeouts learned from earlier runs (see modules/locator_history.py)
+    from modules.locator_history import get_locator_timeouts
+    actions.locator_timeouts = get_locator_timeouts(framework)
+    return actions
@@ -0,0 +1,137 @@
+# page_settle.py
+# Decides when a page has settled after an action: document ready, no in-flight fetch/XHR requests
+# and no DOM mutations for a quiet period. Shared by the Selenium and Playwright backends, which
+# only differ in how they run the probe script in the page.
+
+import asyncio
+import time
+
+# Instrumentation installed once per document: stamps the start of every fetch/XHR request until
+# it ends and the last structural or text DOM mutation. Attribute changes are not watched, since
+# CSS/JS animations change attributes continuously and would never look quiet. Backends register
+# SETTLE_INSTALL_JS to run at document start (before the page's own scripts), so requests a
+# navigation starts are counted; SETTLE_PROBE_JS installs it on first use where that is not possible.
+_SETTLE_INSTALL_BODY = """
+    var w = window;
+    if (!w.__kdfSettle) {
+        var s = w.__kdfSettle = {nextId: 0, requests: {}, lastMutation: Date.now()};
+        var track = function () {
+            var id = ++s.nextId;
+            s.requests[id] = Date.now();
+            return function () { delete s.requests[id]; };
+        };
+        try {
+            new MutationObserver(function () { s.lastMutation = Date.now(); })
+                .observe(document, {subtree: true, childList: true, characterData: true});
+        } catch (e) {}
+        if (w.fetch) {
+            var origFetch = w.fetch;
+            w.fetch = function () {
+                var done = track();
+                var p = origFetch.apply(this, arguments);
+                p.then(done, done);
+                return p;
+            };
+        }
+        if (w.XMLHttpRequest) {
+            var origSend = w.XMLHttpRequest.prototype.send;
+            w.XMLHttpRequest.prototype.send = function () {
+                this.addEventListener('loadend', track());
+                return origSend.apply(this, arguments);
+            };
+        }
+    }
+"""
+
+SETTLE_INSTALL_JS = "(function () {" + _SETTLE_INSTALL_BODY + "})();"
+
+# Returns [readyState, [ms each in-flight request has been open], msSinceLastMutation].
+SETTLE_PROBE_JS = """
+(function () {""" + _SETTLE_INSTALL_BODY + """    var now = Date.now(), ages = [];
+    for (var id in w.__kdfSettle.requests) ages.push(now - w.__kdfSettle.requests[id]);
+    return [document.readyState, ages, now - w.__kdfSettle.lastMutation];
+})()
+"""
+
+DEFAULT_POST_ACTION_WAIT = {
+    'strategy': 'settle',   # 'settle', 'fixed' (legacy sleep) or 'none'
+    'quiet_ms': 300,        # DOM and network must be quiet this long
+    'timeout': None,        # settle never waits longer than this many seconds (default: fixed_seconds)
+    'long_request_ms': 1000,  # requests open longer than this (long-polls, streaming) are not waited for
+    'poll_interval': 0.05,
+    'fixed_seconds': 3,     # used by the 'fixed' strategy
+}
+
+_post_action_wait = None
+
+
+def get_post_action_wait():
+    """Post-action wait settings from config 'post_action_wait' merged over the defaults (read once)."""
+    global _post_action_wait
+    if _post_action_wait is None:
+        from modules.middleware import get_config
+        settings = dict(DEFAULT_POST_ACTION_WAIT)
+        settings.update(get_config().get('post_action_wait') or {})
+        settings['strategy'] = str(settings['strategy']).strip().lower()
+        if settings['timeout'] is None:
+            # Settling must never cost more than the fixed sleep it replaces
+            settings['timeout'] = settings['fixed_seconds']
+        _post_action_wait = settings
+    return _post_action_wait
+
+
+def _pending_requests(probe, long_request_ms):
+    """In-flight requests of a probe that still count: those open for less than long_request_ms."""
+    return [age for age in probe[1] if age < long_request_ms]
+
+
+def is_network_idle(probe, long_request_ms=None):
+    """True when a SETTLE_PROBE_JS result shows a loaded document with no (short-lived) requests in flight."""
+    if long_request_ms is None:
+        long_request_ms = get_post_action_wait()['long_request_ms']
+    return bool(probe) and probe[0] == 'complete' and not _pending_requests(probe, long_request_ms)
+
+
+def _is_settled(probe, quiet_ms, long_request_ms):
+    ready_state, _, quiet_for = probe
+    return ready_state == 'complete' and not _pending_requests(probe, long_request_ms) and quiet_for >= quiet_ms
+
+
+def wait_for_settle(run_probe, quiet_ms=300, timeout=3, poll_interval=0.05, long_request_ms=None):
+    """
+    Poll run_probe() (which evaluates SETTLE_PROBE_JS in the page) until the page is settled or
+    timeout seconds have passed. Returns (settled, elapsed_seconds).
+    """
+    if long_request_ms is None:
+        long_request_ms = get_post_action_wait()['long_request_ms']
+    start = time.perf_counter()
+    while True:
+        try:
+            probe = run_probe()
+        except Exception:
+            # Navigation in progress tears down the execution context; try again
+            probe = None
+        elapsed = time.perf_counter() - start
+        if probe and _is_settled(probe, quiet_ms, long_request_ms):
+            return True, elapsed
+        if elapsed >= timeout:
+            return False, elapsed
+        time.sleep(poll_interval)
+
+
+async def async_wait_for_settle(run_probe, quiet_ms=300, timeout=3, poll_interval=0.05, long_request_ms=None):
+    """wait_for_settle for a coroutine run_probe(), yielding to the event loop between polls."""
+    if long_request_ms is None:
+        long_request_ms = get_post_action_wait()['long_request_ms']
+    start = time.perf_counter()
+    while True:
+        try:
+            probe = await run_probe()
+        except Exception:
+            probe = None
+        elapsed = time.perf_counter() - start
+        if probe and _is_settled(probe, quiet_ms, long_request_ms):
+            return True, elapsed
+        if elapsed >= timeout:
+            return False, elapsed
+        await asyncio.sleep(poll_interval)
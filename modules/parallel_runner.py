@@ -0,0 +1,135 @@
+# parallel_runner.py
+# Runs execution units across a process pool, one browser per worker process.
+
+import os
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from modules.session_pool import format_session_stats
+
+# Per-worker state, set by _init_worker in each pool process
+_worker_reporting = None
+_worker_sessions = None
+
+
+def prepare_unit(index, unit, reporting):
+    """
+    Resolve everything that needs the plan in the parent so only plain data is sent to a worker.
+    Returns a picklable job dict, or None when the dataset row is skipped or cannot be bound.
+    """
+    testcase, sheet, row_num, plan = unit['testcase'], unit['sheet'], unit['row_num'], unit['plan']
+    try:
+        if not plan.is_row_enabled(sheet, row_num):
+            reporting.log_info(f"Skipping TestCase '{testcase}' DataSheet '{sheet}' Row {row_num}: Execute column is not 'Y'")
+            return None
+        steps = unit['steps'] if unit['steps'] is not None else plan.resolve_steps(testcase, sheet, row_num)
+    except Exception as e:
+        reporting.log_error(f"Error in process_testcase_rows for testcase '{testcase}': {e}")
+        return None
+    return {
+        'index': index,
+        'testcase': testcase,
+        'sheet': sheet,
+        'row_num': row_num,
+        'dataset_number': unit['dataset_number'],
+        'steps': steps,
+    }
+
+
+def _init_worker(report_folder, reuse_sessions, session_max_uses):
+    global _worker_reporting, _worker_sessions
+    from multiprocessing.util import Finalize
+    from modules.reporting_v2 import RobustReporting
+    from modules.session_pool import SessionPool
+    os.environ['CURRENT_REPORT_FOLDER'] = report_folder
+    _worker_reporting = RobustReporting()
+    if reuse_sessions:
+        _worker_sessions = SessionPool(max_uses=session_max_uses, reporting=_worker_reporting)
+        # Quit the worker's idle browser when the pool shuts the process down
+        Finalize(None, _worker_sessions.close, exitpriority=10)
+
+
+def _run_job(job):
+    """
+    Worker entry point: run one dataset with a browser owned by this worker.
+    Like a sequential run, a dataset that breaks off with an error is logged and keeps the
+    step results it produced before the error.
+    """
+    from modules.excel_data_reader import run_resolved_steps, step_results
+    from modules.globals import global_dict
+    from modules.middleware import get_framework_class
+    # Module-level run state is per worker; start every dataset from a clean slate
+    step_results.clear()
+    global_dict.clear()
+    print(f"[Worker {os.getpid()}] TestCase: {job['testcase']}, DataSheet: {job['sheet']}, Row {job['row_num']}")
+    session_events = None
+    if _worker_sessions is not None:
+        before = dict(_worker_sessions.stats, reset_times=len(_worker_sessions.stats['reset_times']))
+    try:
+        if _worker_sessions is None:
+            actions = get_framework_class()
+            try:
+                run_resolved_steps(job['testcase'], job['steps'], actions.driver, _worker_reporting, actions, job['dataset_number'])
+            finally:
+                actions.quit()
+        else:
+            actions = _worker_sessions.acquire()
+            failed = True
+            try:
+                run_resolved_steps(job['testcase'], job['steps'], actions.driver, _worker_reporting, actions, job['dataset_number'])
+                failed = False
+            finally:
+                _worker_sessions.release(actions, failed=failed)
+    except Exception as e:
+        _worker_reporting.log_error(f"Error in process_testcase_rows for testcase '{job['testcase']}': {e}")
+    if _worker_sessions is not None:
+        stats = _worker_sessions.stats
+        session_events = {key: stats[key] - before[key] for key in ('launched', 'reused', 'recycled')}
+        session_events['reset_times'] = stats['reset_times'][before['reset_times']:]
+    results = list(step_results)
+    step_results.clear()
+    return job['index'], results, session_events
+
+
+def run_units_parallel(units, workers, reporting, report_folder, reuse_sessions=True, session_max_uses=20):
+    """
+    Distribute units over `workers` processes and return their step results merged in unit order,
+    so reports are identical to a sequential run. At most 2 x workers units are in flight, which
+    keeps a streamed plan streaming. With reuse_sessions each worker keeps its browser across
+    datasets (see session_pool.SessionPool) and the combined reuse/reset figures are reported.
+    """
+    results = {}
+    pending = set()
+    session_totals = {'launched': 0, 'reused': 0, 'recycled': 0, 'reset_times': []}
+
+    def collect(done):
+        for future in done:
+            try:
+                index, step_list, session_events = future.result()
+                results[index] = step_list
+                if session_events:
+                    for key, value in session_events.items():
+                        session_totals[key] += value
+            except Exception as e:
+                reporting.log_error(f"Worker failed to run dataset: {e}")
+
+    initargs = (report_folder, reuse_sessions, session_max_uses)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=initargs) as pool:
+        for index, unit in enumerate(units):
+            job = prepare_unit(index, unit, reporting)
+            if job is None:
+                continue
+            pending.add(pool.submit(_run_job, job))
+            if len(pending) >= workers * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+        done, _ = wait(pending)
+        collect(done)
+
+    if reuse_sessions:
+        session_summary = format_session_stats(**session_totals)
+        print(session_summary)
+        reporting.log_info(session_summary)
+
+    merged = []
+    for index in sorted(results):
+        merged.extend(results[index])
+    return merged
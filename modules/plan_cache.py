@@ -0,0 +1,184 @@
+# plan_cache.py
+# Persists the compiled TestPlan next to config/ so warm starts skip parsing the workbook.
+
+import hashlib
+import json
+import os
+import pickle
+import posixpath
+import zipfile
+import xml.etree.ElementTree as ET
+from modules.test_plan import EXCEL_FILE, DRIVER_SHEET, TestPlan, read_workbook
+
+CACHE_FOLDER = os.path.join(os.path.dirname(os.path.dirname(__file__)), '.plan_cache')
+CACHE_VERSION = 6
+
+_MAIN_NS = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+_REL_NS = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}'
+_PKG_REL_NS = '{http://schemas.openxmlformats.org/package/2006/relationships}'
+
+
+def get_cache_path(excel_file=EXCEL_FILE):
+    """
+    Cache file used for a given workbook. The key includes a hash of the workbook's absolute path,
+    so workbooks with the same file name in different folders get their own cache.
+    """
+    path_hash = hashlib.sha256(os.path.abspath(excel_file).encode('utf-8')).hexdigest()[:12]
+    return os.path.join(CACHE_FOLDER, f"{os.path.basename(excel_file)}.{path_hash}.plan.pkl")
+
+
+def get_meta_path(cache_path):
+    """Sidecar next to a cache file holding the source mtime/size and hashes (see _read_meta)."""
+    return os.path.splitext(cache_path)[0] + '.json'
+
+
+def _hash_bytes(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+def get_workbook_fingerprint(excel_file=EXCEL_FILE):
+    """
+    Hash the workbook parts without parsing cell data.
+    Returns (shared_hash, {sheet_name: sheet_hash}). shared_hash covers every part that is
+    not a worksheet (shared strings, styles, sheet list), so a change there affects all sheets.
+    """
+    with zipfile.ZipFile(excel_file) as zf:
+        workbook_xml = ET.fromstring(zf.read('xl/workbook.xml'))
+        rels_xml = ET.fromstring(zf.read('xl/_rels/workbook.xml.rels'))
+        targets = {}
+        for rel in rels_xml.iter(f'{_PKG_REL_NS}Relationship'):
+            target = rel.get('Target', '')
+            target = target.lstrip('/') if target.startswith('/') else posixpath.normpath(posixpath.join('xl', target))
+            targets[rel.get('Id')] = target
+        sheet_parts = {}
+        for sheet in workbook_xml.iter(f'{_MAIN_NS}sheet'):
+            part = targets.get(sheet.get(f'{_REL_NS}id'))
+            if part:
+                sheet_parts[sheet.get('name')] = part
+        sheet_hashes = {name: _hash_bytes(zf.read(part)) for name, part in sheet_parts.items()}
+        shared = hashlib.sha256()
+        worksheet_parts = set(sheet_parts.values())
+        for name in sorted(zf.namelist()):
+            # docProps only carries author/save timestamps, which do not affect the plan
+            if name in worksheet_parts or name.startswith('docProps/'):
+                continue
+            shared.update(name.encode('utf-8'))
+            shared.update(zf.read(name))
+    return shared.hexdigest(), sheet_hashes
+
+
+def _read_meta(cache_path):
+    """The small sidecar describing a cache file, so freshness checks do not unpickle the plan."""
+    try:
+        with open(get_meta_path(cache_path), 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta.get('version') == CACHE_VERSION:
+            return meta
+    except Exception:
+        pass
+    return None
+
+
+def _read_cache(cache_path):
+    try:
+        with open(cache_path, 'rb') as f:
+            cache = pickle.load(f)
+        if cache.get('version') == CACHE_VERSION:
+            return cache
+    except Exception:
+        pass
+    return None
+
+
+def _write_cache(cache_path, meta, cache=None):
+    """Write the sidecar, and the pickled plan/sheets first when cache is given."""
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    meta_path = get_meta_path(cache_path)
+    if cache is not None:
+        # The sidecar goes first and comes back last, so it never describes a cache file being replaced
+        if os.path.exists(meta_path):
+            os.unlink(meta_path)
+        tmp_path = cache_path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(cache, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, cache_path)
+    with open(meta_path + '.tmp', 'w', encoding='utf-8') as f:
+        json.dump(meta, f)
+    os.replace(meta_path + '.tmp', meta_path)
+
+
+def _matches_stat(meta, driver_sheet, stat):
+    return (meta is not None and meta['driver_sheet'] == driver_sheet
+            and meta['mtime'] == stat.st_mtime_ns and meta['size'] == stat.st_size)
+
+
+def is_cache_fresh(excel_file=EXCEL_FILE, driver_sheet=DRIVER_SHEET):
+    """True when the cached plan matches the workbook's current mtime and size (reads only the sidecar)."""
+    cache_path = get_cache_path(excel_file)
+    return _matches_stat(_read_meta(cache_path), driver_sheet, os.stat(excel_file)) and os.path.exists(cache_path)
+
+
+def load_test_plan(excel_file=EXCEL_FILE, driver_sheet=DRIVER_SHEET, use_cache=True):
+    """
+    Return the compiled TestPlan for the workbook, reusing the on-disk cache when possible.
+    The sidecar (get_meta_path) is checked first; the pickled plan is loaded at most once.
+    - Unchanged mtime/size: the cached plan is returned without opening the workbook.
+    - Only some worksheets changed: just those sheets are re-read and the plan is rebuilt.
+    - Shared parts changed (shared strings, styles, sheet list): full recompile.
+    """
+    if not use_cache:
+        return TestPlan(read_workbook(excel_file), driver_sheet=driver_sheet)
+
+    cache_path = get_cache_path(excel_file)
+    stat = os.stat(excel_file)
+    meta = _read_meta(cache_path)
+    if _matches_stat(meta, driver_sheet, stat):
+        cache = _read_cache(cache_path)
+        if cache:
+            print(f"[CACHE] Using compiled test plan from {cache_path}")
+            return cache['plan']
+        meta = None
+
+    shared_hash, sheet_hashes = get_workbook_fingerprint(excel_file)
+    cache = payload = None
+    if meta and meta['driver_sheet'] == driver_sheet and meta['shared_hash'] == shared_hash \
+            and set(meta['sheet_hashes']) == set(sheet_hashes):
+        # Only now is the pickled plan needed, for the sheets that did not change
+        cache = _read_cache(cache_path)
+    if cache:
+        changed = [name for name, digest in sheet_hashes.items() if meta['sheet_hashes'][name] != digest]
+        sheets = dict(cache['sheets'])
+        if changed:
+            print(f"[CACHE] Recompiling changed sheet(s): {', '.join(changed)}")
+            sheets.update(read_workbook(excel_file, sheet_names=changed))
+            plan = TestPlan(sheets, driver_sheet=driver_sheet)
+            payload = {'version': CACHE_VERSION, 'sheets': sheets, 'plan': plan}
+        else:
+            # Re-saved without content changes; only the sidecar's mtime needs refreshing
+            plan = cache['plan']
+    else:
+        print("[CACHE] Compiling test plan from workbook")
+        sheets = read_workbook(excel_file)
+        plan = TestPlan(sheets, driver_sheet=driver_sheet)
+        payload = {'version': CACHE_VERSION, 'sheets': sheets, 'plan': plan}
+
+    try:
+        _write_cache(cache_path, {
+            'version': CACHE_VERSION,
+            'driver_sheet': driver_sheet,
+            'mtime': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'shared_hash': shared_hash,
+            'sheet_hashes': sheet_hashes,
+        }, payload)
+    except Exception as e:
+        print(f"[WARN] Could not write test plan cache {cache_path}: {e}")
+    return plan
+
+
+def clear_plan_cache(excel_file=EXCEL_FILE):
+    """Delete the cached plan of a workbook, forcing the next run to recompile."""
+    cache_path = get_cache_path(excel_file)
+    for path in (get_meta_path(cache_path), cache_path):
+        if os.path.exists(path):
+            os.unlink(path)
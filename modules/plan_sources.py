@@ -0,0 +1,193 @@
+# plan_sources.py
+# Loads the DriverSheet/CommonSheet/Components/data-sheet schema from Excel, a CSV folder,
+# a JSON file or a SQLite database, and exports between those formats.
+
+import csv
+import json
+import os
+import sqlite3
+from abc import ABC, abstractmethod
+from contextlib import closing
+from modules.test_plan import EXCEL_FILE, DRIVER_SHEET, TestPlan, read_workbook
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(__file__))
+
+
+class PlanSource(ABC):
+    """A readable store of plan sheets. Every sheet is returned as (headers, [row tuples])
+    where the first row tuple is sheet row 2, matching the Excel layout."""
+
+    def __init__(self, path):
+        self.path = path
+
+    @abstractmethod
+    def read_sheets(self, sheet_names=None):
+        """Return {sheet_name: (headers, [row tuples])} for all sheets or only sheet_names."""
+        pass
+
+
+class ExcelPlanSource(PlanSource):
+    def read_sheets(self, sheet_names=None):
+        return read_workbook(self.path, sheet_names=sheet_names)
+
+
+class CsvPlanSource(PlanSource):
+    """A folder with one '<sheet name>.csv' file per sheet; the header is line 1."""
+
+    def read_sheets(self, sheet_names=None):
+        sheets = {}
+        for file_name in sorted(os.listdir(self.path)):
+            name, ext = os.path.splitext(file_name)
+            if ext.lower() != '.csv' or (sheet_names is not None and name not in sheet_names):
+                continue
+            with open(os.path.join(self.path, file_name), newline='', encoding='utf-8-sig') as f:
+                rows = [tuple(value if value != '' else None for value in row) for row in csv.reader(f)]
+            sheets[name] = (list(rows[0]), rows[1:]) if rows else ([], [])
+        return sheets
+
+
+class JsonPlanSource(PlanSource):
+    """A JSON file: {"sheets": {name: {"headers": [...], "rows": [[...], ...]}}}."""
+
+    def read_sheets(self, sheet_names=None):
+        with open(self.path, encoding='utf-8') as f:
+            content = json.load(f)
+        return {
+            name: (list(sheet['headers']), [tuple(row) for row in sheet['rows']])
+            for name, sheet in content['sheets'].items()
+            if sheet_names is None or name in sheet_names
+        }
+
+
+class SqlitePlanSource(PlanSource):
+    """
+    A SQLite database written by export_plan_source: table plan_sheets lists each sheet's
+    headers, and each sheet lives in its own table with a _row column (the Excel row number)
+    and one c<index> column per header position.
+    The DriverSheet is filtered in SQL to rows of testcases that are marked for execution.
+    """
+
+    def read_sheets(self, sheet_names=None):
+        sheets = {}
+        # closing(): the connection's own context manager only ends the transaction
+        with closing(sqlite3.connect(self.path)) as conn:
+            for name, table, headers_json in conn.execute('SELECT name, table_name, headers FROM plan_sheets ORDER BY position'):
+                if sheet_names is not None and name not in sheet_names:
+                    continue
+                headers = json.loads(headers_json)
+                if name == DRIVER_SHEET and {'Execute', 'TestCaseName', 'TestDataSheetReference'} <= set(headers):
+                    sheets[name] = (headers, self._read_driver_rows(conn, table, headers))
+                else:
+                    sheets[name] = (headers, self._read_rows(conn, table, len(headers)))
+        return sheets
+
+    @staticmethod
+    def _read_rows(conn, table, width, where='', keep_row_numbers=True):
+        columns = ', '.join(f'c{i}' for i in range(width)) or 'NULL'
+        rows = []
+        for row in conn.execute(f'SELECT _row, {columns} FROM "{table}" {where} ORDER BY _row'):
+            # Keep Excel row numbering (data references point at it): pad gaps with empty rows
+            while keep_row_numbers and len(rows) + 2 < row[0]:
+                rows.append(())
+            rows.append(tuple(row[1:]) if width else ())
+        return rows
+
+    def _read_driver_rows(self, conn, table, headers):
+        execute = f"c{headers.index('Execute')}"
+        testcase = f"c{headers.index('TestCaseName')}"
+        dataref = f"c{headers.index('TestDataSheetReference')}"
+        # Rows marked Y, of testcases whose first row with a data reference is marked Y
+        where = f"""
+            WHERE upper(trim({execute})) = 'Y' AND trim({testcase}) IN (
+                SELECT trim(f.{testcase}) FROM "{table}" f
+                WHERE upper(trim(f.{execute})) = 'Y' AND f._row = (
+                    SELECT min(g._row) FROM "{table}" g
+                    WHERE trim(g.{testcase}) = trim(f.{testcase}) AND trim(coalesce(g.{dataref}, '')) <> ''))
+        """
+        return self._read_rows(conn, table, len(headers), where, keep_row_numbers=False)
+
+
+def get_plan_source(path=None):
+    """Pick the PlanSource for a path: .xlsx/.xlsm, a CSV folder, .json or .db/.sqlite/.sqlite3."""
+    path = path or EXCEL_FILE
+    if not os.path.isabs(path):
+        path = os.path.join(PROJECT_ROOT, path)
+    if os.path.isdir(path):
+        return CsvPlanSource(path)
+    ext = os.path.splitext(path)[1].lower()
+    if ext in ('.xlsx', '.xlsm'):
+        return ExcelPlanSource(path)
+    if ext == '.json':
+        return JsonPlanSource(path)
+    if ext in ('.db', '.sqlite', '.sqlite3'):
+        return SqlitePlanSource(path)
+    raise ValueError(f"Unsupported test plan source: {path}")
+
+
+def load_plan_from_source(path=None, use_cache=True, driver_sheet=DRIVER_SHEET):
+    """Compile the TestPlan from any source; Excel workbooks go through the plan cache."""
+    source = get_plan_source(path)
+    if isinstance(source, ExcelPlanSource):
+        from modules.plan_cache import load_test_plan
+        return load_test_plan(source.path, driver_sheet=driver_sheet, use_cache=use_cache)
+    return TestPlan(source.read_sheets(), driver_sheet=driver_sheet)
+
+
+def _json_value(value):
+    """Dates and other non-JSON cell values are exported as text."""
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
+
+def export_plan_source(sheets, destination):
+    """
+    Write sheets ({name: (headers, rows)}) to a CSV folder, .json file or SQLite database,
+    chosen by the destination path the same way get_plan_source reads it back.
+    """
+    ext = os.path.splitext(destination)[1].lower()
+    if ext == '.json':
+        content = {'sheets': {
+            name: {'headers': [_json_value(h) for h in headers],
+                   'rows': [[_json_value(v) for v in row] for row in rows]}
+            for name, (headers, rows) in sheets.items()
+        }}
+        with open(destination, 'w', encoding='utf-8') as f:
+            json.dump(content, f, indent=1)
+    elif ext in ('.db', '.sqlite', '.sqlite3'):
+        if os.path.exists(destination):
+            os.unlink(destination)
+        with closing(sqlite3.connect(destination)) as conn, conn:
+            conn.execute('CREATE TABLE plan_sheets (name TEXT, position INTEGER, table_name TEXT, headers TEXT)')
+            for position, (name, (headers, rows)) in enumerate(sheets.items()):
+                table = f'sheet_{position}'
+                width = len(headers)
+                columns = ''.join(f', c{i}' for i in range(width))
+                conn.execute(f'CREATE TABLE "{table}" (_row INTEGER PRIMARY KEY{columns})')
+                placeholders = ', '.join('?' * (width + 1))
+                conn.executemany(
+                    f'INSERT INTO "{table}" VALUES ({placeholders})',
+                    ([row_number] + [_json_value(row[i]) if i < len(row) else None for i in range(width)]
+                     for row_number, row in enumerate(rows, start=2) if any(v is not None for v in row)))
+                conn.execute('INSERT INTO plan_sheets VALUES (?, ?, ?, ?)',
+                             (name, position, table, json.dumps([_json_value(h) for h in headers])))
+    elif ext == '':
+        os.makedirs(destination, exist_ok=True)
+        for name, (headers, rows) in sheets.items():
+            with open(os.path.join(destination, f'{name}.csv'), 'w', newline='', encoding='utf-8') as f:
+                writer = csv.writer(f)
+                writer.writerow(['' if h is None else h for h in headers])
+                writer.writerows(['' if v is None else v for v in row] for row in rows)
+    else:
+        raise ValueError(f"Unsupported export destination: {destination}")
+
+
+# Convert the workbook into another format, e.g.
+#   python -m modules.plan_sources config/testcase_driver_data_sheet.xlsx config/test_plan.sqlite
+if __name__ == "__main__":
+    import sys
+    if len(sys.argv) != 3:
+        print("Usage: python -m modules.plan_sources <source> <destination (.json | .sqlite | folder)>")
+        sys.exit(1)
+    export_plan_source(get_plan_source(sys.argv[1]).read_sheets(), sys.argv[2])
+    print(f"Exported {sys.argv[1]} to {sys.argv[2]}")
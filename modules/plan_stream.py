@@ -0,0 +1,177 @@
+# plan_stream.py
+# Turns a test plan into a lazy stream of executable (testcase, dataset, steps) units.
+
+import os
+import shutil
+import tempfile
+from collections.abc import Mapping
+import openpyxl
+from modules.test_plan import (
+    EXCEL_FILE, DRIVER_SHEET, COMMON_SHEET, COMPONENTS_SHEET, TestPlan, read_sheet_rows,
+    parse_common_sheet, parse_components_sheet, expand_components, parse_data_sheet, parse_driver_sheet, _cell_text,
+)
+from modules.plan_sources import ExcelPlanSource, get_plan_source, load_plan_from_source
+from modules.plan_cache import is_cache_fresh
+
+
+def iter_execution_units(plan):
+    """
+    Yield one unit per (testcase, data sheet row) of a compiled plan, binding each data
+    reference only when the stream reaches it. A unit is a dict with testcase, sheet,
+    row_num, dataset_number, steps and the plan it came from. steps is None when the
+    reference could not be bound; process_testcase_rows then reports the error.
+    """
+    for testcase, refs in plan.testcase_datarefs.items():
+        dataset_number = 1
+        for sheet, row_nums in refs:
+            try:
+                bound = plan.bind_datasets(testcase, sheet, row_nums)
+            except ValueError:
+                bound = None
+            for row_num in row_nums:
+                yield {
+                    'testcase': testcase,
+                    'sheet': sheet,
+                    'row_num': row_num,
+                    'dataset_number': dataset_number,
+                    'steps': bound[row_num] if bound is not None else None,
+                    'plan': plan,
+                }
+                dataset_number += 1
+
+
+class LazyDataSheets(Mapping):
+    """Data sheets of an open read-only workbook, parsed the first time a testcase needs them."""
+
+    def __init__(self, workbook, exclude):
+        self._workbook = workbook
+        self._names = [name for name in workbook.sheetnames if name not in exclude]
+        self._frames = {}
+
+    def __getitem__(self, name):
+        if name not in self._names:
+            raise KeyError(name)
+        if name not in self._frames:
+            self._frames[name] = parse_data_sheet(*read_sheet_rows(self._workbook[name]))
+        return self._frames[name]
+
+    def __iter__(self):
+        return iter(self._names)
+
+    def __len__(self):
+        return len(self._names)
+
+
+class FailedBlock:
+    """
+    Stands in for the plan of a streamed testcase block that did not compile (or failed validation
+    with validate_plan 'abort'): its units come out with steps=None like any unbound reference, and
+    process_testcase_rows reports the block's error for each of them instead of ending the run.
+    """
+    def __init__(self, testcase_datarefs, error):
+        self.testcase_datarefs = testcase_datarefs
+        self.error = str(error)
+
+    def bind_datasets(self, testcase, sheet, row_nums):
+        raise ValueError(self.error)
+
+    def resolve_steps(self, testcase, sheet, row_num):
+        raise ValueError(self.error)
+
+    def is_row_enabled(self, sheet, row_num):
+        return True
+
+    def is_headless(self, sheet, row_num):
+        return True
+
+
+def _compile_block(headers, block, locators, components, data_sheets, validate=None):
+    """Plan for one DriverSheet block, or a FailedBlock when it does not compile or validate raises."""
+    try:
+        plan = TestPlan.from_parts((headers, block), locators, components, data_sheets)
+        if validate is not None:
+            validate(plan)
+        return plan
+    except ValueError as e:
+        print(f"[ERROR] {e}")
+        return FailedBlock(parse_driver_sheet(headers, block)[0], e)
+
+
+def stream_execution_units(excel_file=EXCEL_FILE, driver_sheet=DRIVER_SHEET, validate=None):
+    """
+    Stream units straight from the workbook without compiling the whole plan first.
+    CommonSheet and Components are read up front; DriverSheet rows are consumed one testcase
+    block at a time and data sheets are loaded on first use, so the first unit is ready after
+    one testcase has been read and memory does not grow with the number of testcases.
+    Testcases are expected to occupy contiguous DriverSheet rows; a name that reappears
+    later is run again as its own block.
+    validate, when given, is called with each block's plan before its units are yielded (preflight
+    per block); a block that fails to compile, or for which validate raises ValueError, is emitted
+    as failed units (see FailedBlock) and the stream goes on with the next block.
+    Missing sheets, missing DriverSheet columns and Components errors raise ValueError from this
+    call, before the returned iterator is started.
+    """
+    tmp = tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx')
+    tmp.close()
+    shutil.copy2(excel_file, tmp.name)
+    wb = openpyxl.load_workbook(tmp.name, data_only=True, read_only=True)
+    try:
+        if driver_sheet not in wb.sheetnames:
+            raise ValueError(f"Sheet '{driver_sheet}' not found in Excel file.")
+        if COMMON_SHEET not in wb.sheetnames:
+            raise ValueError(f"Sheet '{COMMON_SHEET}' not found in Excel file.")
+        locators = parse_common_sheet(*read_sheet_rows(wb[COMMON_SHEET]))
+        components = None
+        if COMPONENTS_SHEET in wb.sheetnames:
+            components = expand_components(parse_components_sheet(*read_sheet_rows(wb[COMPONENTS_SHEET])))
+        data_sheets = LazyDataSheets(wb, exclude=(driver_sheet, COMMON_SHEET, COMPONENTS_SHEET))
+
+        rows = wb[driver_sheet].iter_rows(values_only=True)
+        headers = list(next(rows, ()))
+        if 'TestCaseName' not in headers:
+            raise ValueError("Required columns not found in DriverSheet.")
+        parse_driver_sheet(headers, [])  # fail on missing columns before any unit runs
+    except Exception:
+        wb.close()
+        os.unlink(tmp.name)
+        raise
+    return _stream_blocks(wb, tmp.name, driver_sheet, headers, rows, locators, components, data_sheets, validate)
+
+
+def _stream_blocks(wb, tmp_path, driver_sheet, headers, rows, locators, components, data_sheets, validate):
+    """Yield the units of each DriverSheet testcase block; closes and removes the workbook copy when done."""
+    try:
+        name_idx = headers.index('TestCaseName')
+        seen = set()
+        block, block_name = [], None
+        for row in rows:
+            testcase = _cell_text(row[name_idx]) if name_idx < len(row) else ''
+            if testcase and testcase != block_name:
+                if block:
+                    yield from iter_execution_units(_compile_block(headers, block, locators, components, data_sheets, validate))
+                if testcase in seen:
+                    print(f"[WARN] TestCase '{testcase}' reappears in {driver_sheet}; streaming runs it as a separate block")
+                seen.add(testcase)
+                block, block_name = [], testcase
+            block.append(row)
+        if block:
+            yield from iter_execution_units(_compile_block(headers, block, locators, components, data_sheets, validate))
+    finally:
+        wb.close()
+        os.unlink(tmp_path)
+
+
+def get_execution_units(source_path=None, use_cache=True, stream=False, validate=None):
+    """
+    Units for a run. With stream=True an Excel source is streamed unless a fresh plan cache
+    exists (loading the cache is faster still); other sources are compiled and then iterated.
+    validate (e.g. a run_preflight call) checks the whole plan before the first unit when the
+    plan is compiled, and each testcase block when it is streamed.
+    """
+    source = get_plan_source(source_path)
+    if stream and isinstance(source, ExcelPlanSource) and not (use_cache and is_cache_fresh(source.path)):
+        return stream_execution_units(source.path, validate=validate)
+    plan = load_plan_from_source(source.path, use_cache=use_cache)
+    if validate is not None:
+        validate(plan)
+    return iter_execution_units(plan)
@@ -0,0 +1,93 @@
+# plan_validator.py
+# Preflight checks over a compiled TestPlan, run before any browser is launched.
+
+import time
+from modules.action_registry import CUSTOM, load_failures, unknown_action_message
+from modules.wait_conditions import WaitCondition, INVALID
+
+
+def _problem(level, testcase, step, message):
+    where = f"{step['screen']}/{step['field']}" if step else ''
+    return {'level': level, 'testcase': testcase, 'step': where, 'message': message}
+
+
+def validate_plan(plan):
+    """
+    Check every testcase that will run and return all problems found (empty list when clean).
+    Each problem is a dict with level ('error' or 'warning'), testcase, step and message.
+    Checks: every action resolved to a registered action (see action_registry); actions that need a
+    locator have a CommonSheet entry; actions that use data have a data sheet column; referenced
+    components, data sheets and data rows exist; WaitTimeInSec cells parse. Customization modules
+    and action packs that failed to load are reported as warnings.
+    """
+    problems = [_problem('warning', '', None, f"Could not load {source}: {error}")
+                for source, error in load_failures().items()]
+    for testcase, refs in plan.testcase_datarefs.items():
+        for driver_step in plan.testcase_steps.get(testcase, []):
+            component_name = driver_step['component_name']
+            if component_name and component_name not in (plan.components or {}):
+                problems.append(_problem('error', testcase, None, f"Component '{component_name}' not found in Components sheet"))
+
+        sheets = list(dict.fromkeys(sheet for sheet, _ in refs))
+        for sheet, row_nums in refs:
+            if sheet not in plan.data_sheets:
+                problems.append(_problem('error', testcase, None, f"Data sheet '{sheet}' not found"))
+                continue
+            index = plan.data_sheets[sheet].index
+            missing_rows = [row_num for row_num in row_nums if row_num not in index]
+            if missing_rows:
+                problems.append(_problem('warning', testcase, None, f"Data sheet '{sheet}' has no row(s) {missing_rows}"))
+
+        for step in plan.get_step_templates(testcase):
+            wait = step['wait_time']
+            if isinstance(wait, WaitCondition) and wait.kind == INVALID:
+                problems.append(_problem('error', testcase, step, wait.argument))
+            action = step['action']
+            if not action:
+                problems.append(_problem('error', testcase, step, "No action given"))
+                continue
+            spec = step['handler']
+            if spec is None:
+                message = unknown_action_message(action) if action.startswith(('custom-', 'component-')) else f"Unknown action '{action}'"
+                problems.append(_problem('error', testcase, step, message))
+                continue
+            if spec.kind == CUSTOM:
+                if step['field'] and not step['xpath'] and not step['field'].startswith('$$') \
+                        and not any(plan.has_column(sheet, step['field']) for sheet in sheets):
+                    problems.append(_problem('warning', testcase, step, "Field has neither a CommonSheet locator nor a data column"))
+                continue
+            if spec.needs_locator and not step['xpath']:
+                problems.append(_problem('error', testcase, step, f"No CommonSheet locator for ({step['screen']}, {step['field']})"))
+            if spec.uses_data:
+                for sheet in sheets:
+                    if sheet in plan.data_sheets and not plan.has_column(sheet, step['field']):
+                        problems.append(_problem('error', testcase, step, f"Data sheet '{sheet}' has no column '{step['field']}'"))
+    return problems
+
+
+def format_validation_report(problems, elapsed=None):
+    """Human readable multi-line summary of validate_plan results."""
+    errors = sum(1 for p in problems if p['level'] == 'error')
+    warnings = len(problems) - errors
+    timing = f" in {elapsed * 1000:.0f} ms" if elapsed is not None else ''
+    lines = [f"Plan validation{timing}: {errors} error(s), {warnings} warning(s)"]
+    for p in problems:
+        step = f" [{p['step']}]" if p['step'] else ''
+        lines.append(f"  {p['level'].upper():7} {p['testcase']}{step}: {p['message']}")
+    return '\n'.join(lines)
+
+
+def run_preflight(plan, reporting=None, abort_on_error=False):
+    """
+    Validate the plan, print/log the report and return the problems.
+    Raises ValueError when abort_on_error is set and errors were found.
+    """
+    start = time.perf_counter()
+    problems = validate_plan(plan)
+    report = format_validation_report(problems, time.perf_counter() - start)
+    print(report)
+    if reporting is not None:
+        (reporting.log_error if problems else reporting.log_info)(report)
+    if abort_on_error and any(p['level'] == 'error' for p in problems):
+        raise ValueError("Plan validation failed; aborting before launching any browser.")
+    return problems
@@ -11,11 +11,53 @@ def initiatedriver(browser='msedge', headless=True):
 # This module contains the PlaywrightActions class, which provides methods to interact with web elements using Playwright.
 
 from modules.reporting_v2 import RobustReporting
-from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
+from playwright.sync_api import sync_playwright, Error as PlaywrightError, TimeoutError as PlaywrightTimeoutError
 import time
 import os
 
 from modules.automation_interface import AutomationActionsInterface
+from modules.element_cache import ElementCache
+from modules.page_settle import SETTLE_INSTALL_JS
+
+
+class PlaywrightBrowserHost:
+    """
+    One Playwright instance and browser process shared by many PlaywrightActions.
+    Each actions instance gets its own BrowserContext (isolated cookies/storage), which is far
+    cheaper than starting Playwright and launching a browser per dataset.
+    """
+    def __init__(self, headless=False):
+        self.playwright = sync_playwright().start()
+        self.browser = self.playwright.chromium.launch(headless=headless)
+
+    def new_context(self):
+        return self.browser.new_context()
+
+    def close(self):
+        try:
+            if self.browser:
+                self.browser.close()
+        finally:
+            if self.playwright:
+                self.playwright.stop()
+            self.browser = None
+            self.playwright = None
+
+
+_shared_hosts = {}
+
+
+def get_shared_browser_host(headless=False):
+    """Return this process's shared browser host, launching it on first use."""
+    host = _shared_hosts.get(headless)
+    if host is None or host.browser is None:
+        from multiprocessing.util import Finalize
+        host = PlaywrightBrowserHost(headless=headless)
+        _shared_hosts[headless] = host
+        # Runs at interpreter exit in the main process and in pool workers alike
+        Finalize(host, host.close, exitpriority=5)
+    return host
+
 
 class PlaywrightActions(AutomationActionsInterface):
     def _find_element(self, selector):
@@ -33,14 +75,62 @@ class PlaywrightActions(AutomationActionsInterface):
         except Exception as e:
             self.reporting.log_error(f"Error finding element {selector}: {str(e)}")
             return None
-    def __init__(self, reporting: RobustReporting, driver=None, browser_type='msedge', headless=False):
+    def __init__(self, reporting: RobustReporting, driver=None, browser_type='msedge', headless=False, host=None):
+        """
+        Without a host this instance starts its own Playwright and browser (and stops them on quit).
+        With a PlaywrightBrowserHost it only opens a new context on the shared browser.
+        """
         self.reporting = reporting
-        self.playwright = sync_playwright().start()
-        self.browser = self.playwright.chromium.launch(headless=headless)
-        self.context = self.browser.new_context()
+        self.host = host
+        self.element_cache = ElementCache()
+        if host is None:
+            self.playwright = sync_playwright().start()
+            self.browser = self.playwright.chromium.launch(headless=headless)
+        else:
+            self.playwright = None
+            self.browser = None
+        self._open_context()
+        os.makedirs('Reports', exist_ok=True)
+
+    def _open_context(self):
+        self.context = self.host.new_context() if self.host else self.browser.new_context()
+        # Settle instrumentation runs before each document's own scripts, so its requests are counted
+        self.context.add_init_script(SETTLE_INSTALL_JS)
+        # Main-frame navigations (goto, reload, a click that submits a form) empty the element cache
+        self.context.on('page', lambda page: page.on('framenavigated', self._on_frame_navigated))
         self.page = self.context.new_page()
+        self.page.on('framenavigated', self._on_frame_navigated)
         self.driver = self.page
-        os.makedirs('Reports', exist_ok=True)
+
+    def _on_frame_navigated(self, frame):
+        if frame.parent_frame is None:
+            self.element_cache.invalidate()
+
+    def _on_element(self, selector, operation):
+        """
+        Run operation(handle) on the element for selector, reusing the ElementHandle cached for the
+        current page; a cached handle that is no longer attached is dropped and the selector
+        resolved again (waiting for it like page.fill / page.click do).
+        """
+        handle = self.element_cache.get(selector, scope=self.page)
+        if handle is not None:
+            try:
+                return operation(handle)
+            except PlaywrightError as e:
+                if 'not attached' not in str(e):
+                    raise
+                self.element_cache.discard(selector)
+        timeout = self.element_timeout_for(selector, None)
+        start = time.perf_counter()
+        try:
+            # A learned timeout replaces Playwright's default (30 s) for this locator
+            handle = self.page.wait_for_selector(selector, state='attached',
+                                                 timeout=None if timeout is None else timeout * 1000)
+        finally:
+            # Counted as the step's locate time, like _find_element
+            self.locate_seconds += time.perf_counter() - start
+        self.element_cache.put(selector, handle)
+        return operation(handle)
 
     def open_url(self, url):
         try:
@@ -54,7 +144,7 @@ class PlaywrightActions(AutomationActionsInterface):
 
     def set_value(self, selector, value):
         try:
-            self.page.fill(selector, str(value))
+            self._on_element(selector, lambda handle: handle.fill(str(value)))
             self.reporting.log_info(f"Set value '{value}' to element: {selector}")
             return True, None
         except Exception as e:
@@ -62,9 +152,50 @@ class PlaywrightActions(AutomationActionsInterface):
             self.reporting.log_error(error_message)
             return False, error_message
 
+    def fill_fields(self, fields):
+        """Fill several fields with one FILL_FIELDS_JS evaluation (see AutomationActionsInterface.fill_fields)."""
+        from modules.form_fill import FILL_FIELDS_JS, fill_outcomes
+        fields = [(selector, str(value)) for selector, value in fields]
+        try:
+            results = self.page.evaluate(FILL_FIELDS_JS, [list(field) for field in fields])
+        except PlaywrightError as e:
+            self.reporting.log_info(f"Batched form fill unavailable, filling fields one by one: {e}")
+            return []
+        return fill_outcomes(results, fields, self.reporting)
+
+    def read_values(self, selectors):
+        """Read several elements with one SNAPSHOT_VALUES_JS evaluation (see AutomationActionsInterface.read_values)."""
+        from modules.snapshot_assertions import SNAPSHOT_VALUES_JS
+        try:
+            entries = self.page.evaluate(SNAPSHOT_VALUES_JS, list(selectors))
+        except PlaywrightError as e:
+            self.reporting.log_info(f"Snapshot read unavailable, reading fields one by one: {e}")
+            return {}
+        # get_value reads input_value(), which only form fields have; other elements keep the live path and its error
+        return {selector: entry['value'] for selector, entry in (entries or {}).items() if entry['value'] is not None}
+
+    def read_table(self, selector, wait=0, budget=20):
+        """Read a whole table with one READ_TABLE_JS evaluation (see AutomationActionsInterface.read_table)."""
+        from modules.table_extraction import READ_TABLE_JS
+        try:
+            return self.page.evaluate(READ_TABLE_JS, [selector, int(wait * 1000), int(budget * 1000)])
+        except PlaywrightError as e:
+            return {'error': str(e)}
+
+    def next_table_page(self, selector, next_selector, timeout=10):
+        """Turn a table page with one TURN_PAGE_JS evaluation (see AutomationActionsInterface.next_table_page)."""
+        from modules.table_extraction import TURN_PAGE_JS
+        try:
+            turned = self.page.evaluate(TURN_PAGE_JS, [selector, next_selector, int(timeout * 1000)])
+        except PlaywrightError as e:
+            self.reporting.log_error(f"Failed to turn table page: {e}")
+            return 'unchanged'
+        self.element_cache.invalidate()
+        return turned
+
     def get_value(self, selector):
         try:
-            value = self.page.input_value(selector)
+            value = self._on_element(selector, lambda handle: handle.input_value())
             self.reporting.log_info(f"Got value '{value}' from element: {selector}")
             return True, value
         except Exception as e:
@@ -74,7 +205,7 @@ class PlaywrightActions(AutomationActionsInterface):
 
     def assert_value(self, selector, expected_value):
         try:
-            actual_value = self.page.input_value(selector)
+            actual_value = self._on_element(selector, lambda handle: handle.input_value())
             if str(actual_value) != str(expected_value):
                 error_message = f"Assertion failed: Expected '{expected_value}', got '{actual_value}'"
                 self.reporting.log_error(error_message)
@@ -88,7 +219,7 @@ class PlaywrightActions(AutomationActionsInterface):
 
     def element_click(self, selector):
         try:
-            self.page.click(selector)
+            self._on_element(selector, lambda handle: handle.click())
             self.reporting.log_info(f"Clicked element: {selector}")
             return True, None
         except Exception as e:
@@ -109,7 +240,7 @@ class PlaywrightActions(AutomationActionsInterface):
 
     def clear_text(self, selector):
         try:
-            self.page.fill(selector, "")
+            self._on_element(selector, lambda handle: handle.fill(""))
             self.reporting.log_info(f"Cleared text for element: {selector}")
             return True, None
         except Exception as e:
@@ -167,7 +298,7 @@ class PlaywrightActions(AutomationActionsInterface):
 
     def send_downarrow_then_tab(self, selector):
         try:
-            self.page.focus(selector)
+            self._on_element(selector, lambda handle: handle.focus())
             self.page.keyboard.press('ArrowDown')
             self.page.keyboard.press('Tab')
             time.sleep(1)
@@ -179,7 +310,49 @@ class PlaywrightActions(AutomationActionsInterface):
             self.reporting.log_error(error_message)
             return False, error_message
 
+    def wait_for_page_settle(self, quiet_ms=300, timeout=3, poll_interval=0.05):
+        from modules.page_settle import wait_for_settle, SETTLE_PROBE_JS
+        return wait_for_settle(lambda: self.page.evaluate(SETTLE_PROBE_JS), quiet_ms, timeout, poll_interval)
+
+    def check_wait_condition(self, condition, selector):
+        from modules.page_settle import SETTLE_PROBE_JS, is_network_idle
+        kind = condition.kind
+        if kind == 'url':
+            return condition.argument in self.page.url
+        if kind == 'network_idle':
+            return is_network_idle(self.page.evaluate(SETTLE_PROBE_JS))
+        element = self.page.query_selector(selector)
+        if kind == 'gone':
+            return element is None or not element.is_visible()
+        if element is None:
+            return False
+        if kind == 'visible':
+            return element.is_visible()
+        if kind == 'clickable':
+            return element.is_visible() and element.is_enabled()
+        if kind == 'text':
+            return condition.argument in (element.evaluate("e => e.innerText || e.value || ''") or '')
+        return False
+
+    def reset_session(self):
+        """
+        Replace the browser context with a fresh one: cookies, storage of every origin visited,
+        extra pages and service workers go with the old context, on a shared host or not.
+        """
+        try:
+            self.element_cache.invalidate()
+            self.context.close()
+            self._open_context()
+            log_message = "Browser context replaced for reuse."
+            self.reporting.log_info(log_message)
+            return True, log_message
+        except Exception as e:
+            error_message = f"Failed to replace browser context: {str(e)}"
+            self.reporting.log_error(error_message)
+            return False, error_message
+
     def quit(self):
+        # On a shared browser host only this instance's context is closed; the browser stays up
         if self.page:
             self.page.close()
         if self.context:
@@ -5,6 +5,7 @@ import shutil
 import openpyxl
 from tempfile import NamedTemporaryFile
 from string import Template
+from modules.step_timing import PHASE_COLUMNS, TOTAL_COLUMN
 
 class RobustReporting:
     def __init__(self):
@@ -67,6 +68,27 @@ class RobustReporting:
                 # Insert <wbr> at every maxlen interval for HTML wrapping
                 return '<wbr>'.join([path[i:i+maxlen] for i in range(0, len(path), maxlen)])
 
+            # Phase timing columns (step_timing); reports written before timings existed show blanks
+            timing_columns = PHASE_COLUMNS + (TOTAL_COLUMN,)
+            def timing_cells(row):
+                return ''.join(
+                    f"<td class='ms'>{'' if pd.isna(row.get(column)) else f'{row.get(column):.1f}'}</td>"
+                    for column in timing_columns)
+
+            def timing_total_rows(frame):
+                # One row per testcase with its summed phase times, slowest first
+                present = [column for column in timing_columns if column in frame.columns]
+                if TOTAL_COLUMN not in present:
+                    return ''
+                totals = frame.groupby('testcasename', sort=False)[present].sum().sort_values(TOTAL_COLUMN, ascending=False)
+                steps = frame.groupby('testcasename', sort=False).size()
+                rows = ''
+                for testcase, values in totals.iterrows():
+                    rows += f"<tr><td>{testcase}</td><td>{steps[testcase]}</td>" + ''.join(
+                        f"<td class='ms'>{values[column]:.1f}</td>" if column in present else "<td></td>"
+                        for column in timing_columns) + "</tr>"
+                return rows
+
             # Prepare test results rows with wrapped screenshot paths and thumbnail images
             test_results_rows = ''
             for _, row in df.iterrows():
@@ -87,6 +109,7 @@ class RobustReporting:
                     f"<td>{row['action']}</td>" \
                     f"<td>{row['execution_status']}</td>" \
                     f"<td>{error_msg}</td>" \
+                    f"{timing_cells(row)}" \
                     f"<td>{thumb_html}</td></tr>"
 
             # Wrap report_path, log_path, screenshot_path for display in header
@@ -110,6 +133,7 @@ class RobustReporting:
             template = template.replace('{pass_count}', '$pass_count')
             template = template.replace('{fail_count}', '$fail_count')
             template = template.replace('{{test_results_rows}}', '$test_results_rows')
+            template = template.replace('{{testcase_timing_rows}}', '$testcase_timing_rows')
             template = Template(template)
             html = template.safe_substitute(
                 execution_date=now.strftime('%Y-%m-%d'),
@@ -119,7 +143,8 @@ class RobustReporting:
                 screenshot_path=display_screenshot_path,
                 pass_count=pass_count,
                 fail_count=fail_count,
-                test_results_rows=test_results_rows
+                test_results_rows=test_results_rows,
+                testcase_timing_rows=timing_total_rows(df)
             )
             # Write HTML
             with open(html_output_path, 'w', encoding='utf-8') as f:
@@ -146,6 +171,7 @@ class RobustReporting:
                         f"<td>{row['action']}</td>" \
                         f"<td>{row['execution_status']}</td>" \
                         f"<td>{error_msg}</td>" \
+                        f"{timing_cells(row)}" \
                         f"<td>{thumb_html}</td></tr>"
                 testcase_html = template.safe_substitute(
                     execution_date=now.strftime('%Y-%m-%d'),
@@ -155,7 +181,8 @@ class RobustReporting:
                     screenshot_path=display_screenshot_path,
                     pass_count=(testcase_df['execution_status'].str.lower() == 'pass').sum(),
                     fail_count=(testcase_df['execution_status'].str.lower() == 'fail').sum(),
-                    test_results_rows=testcase_rows
+                    test_results_rows=testcase_rows,
+                    testcase_timing_rows=timing_total_rows(testcase_df)
                 )
                 testcase_html_path = os.path.join(testcase_reports_dir, f"{testcase}.html")
                 with open(testcase_html_path, 'w', encoding='utf-8') as f:
@@ -9,14 +9,172 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import *
 from modules.reporting_v2 import RobustReporting
 from modules.automation_interface import AutomationActionsInterface
+from modules.element_cache import ElementCache
 import time
 import os
+from urllib.parse import urlsplit
 import shutil
 
+# Element checks shared by the in-page scripts below (run in the page, not in Python)
+_ELEMENT_HELPERS_JS = """
+function isVisible(el) {
+    if (!el.isConnected || (el.tagName === 'INPUT' && el.type === 'hidden')) return false;
+    if (el.checkVisibility) return el.checkVisibility({opacityProperty: true, visibilityProperty: true});
+    var style = window.getComputedStyle(el);
+    return style.display !== 'none' && style.visibility !== 'hidden' && style.opacity !== '0' && el.getClientRects().length > 0;
+}
+function isEnabled(el) {
+    try { return !el.matches(':disabled'); } catch (e) { return !el.disabled; }
+}
+function describe(el, status, visible) {
+    var tag = el.tagName.toLowerCase(), value;
+    if (tag === 'input' || tag === 'textarea') {
+        value = el.value;
+    } else if (tag === 'select') {
+        value = el.selectedOptions.length ? el.selectedOptions[0].text.trim() : null;
+    } else {
+        // Same as WebElement.text: rendered text, nothing for hidden elements
+        value = visible ? el.innerText.replace(/\\u00a0/g, ' ').split('\\n').map(function (line) { return line.trim(); }).join('\\n').trim() : '';
+    }
+    var type = ('type' in el) ? el.type : el.getAttribute('type');
+    return {status: status, element: el, tag: tag, type: type || null, value: value, visible: visible};
+}
+"""
+
+# In-page element resolver used by SeleniumActions._find_element (run with execute_async_script).
+# Polls the DOM every pollMs until the selector matches a visible, enabled element, waiting up to
+# presenceMs for a match and clickableMs more for clickability, scrolls it into view and returns
+# it with the details the actions need, so locating is one WebDriver round trip instead of several.
+RESOLVE_ELEMENT_JS = """
+var selector = arguments[0], isXPath = arguments[1], presenceMs = arguments[2], clickableMs = arguments[3],
+    pollMs = arguments[4], done = arguments[arguments.length - 1];
+var started = Date.now(), foundAt = null;
+function find() {
+    if (isXPath) {
+        return document.evaluate(selector, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    }
+    return document.querySelector(selector);
+}
+""" + _ELEMENT_HELPERS_JS + """
+(function poll() {
+    var el;
+    try { el = find(); } catch (e) { return done({status: 'error', message: String(e)}); }
+    var now = Date.now();
+    if (el) {
+        if (foundAt === null) foundAt = now;
+        var visible = isVisible(el);
+        if (visible && isEnabled(el)) {
+            el.scrollIntoView({block: 'center'});
+            return done(describe(el, 'ready', true));
+        }
+        if (now - foundAt >= clickableMs) {
+            if (visible) el.scrollIntoView({block: 'center'});
+            return done(describe(el, visible ? 'not_clickable' : 'hidden', visible));
+        }
+    } else if (now - started >= presenceMs) {
+        return done({status: 'missing'});
+    }
+    setTimeout(poll, pollMs);
+})();
+"""
+
+# Re-check of a cached element (see ElementCache): one synchronous call that detects a detached
+# element and returns the same details as RESOLVE_ELEMENT_JS when it is still ready to use.
+CHECK_CACHED_ELEMENT_JS = _ELEMENT_HELPERS_JS + """
+var el = arguments[0];
+if (!el.isConnected) return {status: 'stale'};
+var visible = isVisible(el);
+if (!visible || !isEnabled(el)) return {status: 'not_ready'};
+el.scrollIntoView({block: 'center'});
+return describe(el, 'ready', true);
+"""
+
+# Scroll search used by SeleniumActions._scroll_to_find when an element is not in the DOM yet
+# (lazily rendered or virtualized lists). Tries every scrollable container, inner ones first and
+# the page last: jumps by 90% of the container's visible height, checks for the element in-page
+# after each jump, keeps going while the scrollHeight grows at the end (virtualized / infinite
+# lists), covers the part above the starting position last, and gives up after budgetMs.
+SCROLL_SEARCH_JS = """
+var selector = arguments[0], isXPath = arguments[1], budgetMs = arguments[2], stepMs = arguments[3],
+    growthMs = arguments[4], done = arguments[arguments.length - 1];
+var deadline = Date.now() + budgetMs, jumps = 0;
+function find() {
+    if (isXPath) {
+        return document.evaluate(selector, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+    }
+    return document.querySelector(selector);
+}
+function containers() {
+    var found = [], all = document.body ? document.body.querySelectorAll('*') : [];
+    for (var i = 0; i < all.length; i++) {
+        var el = all[i];
+        if (el.scrollHeight > el.clientHeight + 1) {
+            var overflowY = window.getComputedStyle(el).overflowY;
+            if (overflowY === 'auto' || overflowY === 'scroll') found.push(el);
+        }
+    }
+    found.sort(function (a, b) { return b.scrollHeight - a.scrollHeight; });
+    found.push(document.scrollingElement || document.documentElement);
+    return found;
+}
+function search(list, index) {
+    if (index >= list.length) return done({status: 'missing', jumps: jumps});
+    var container = list[index], start = container.scrollTop, lastHeight = container.scrollHeight;
+    var wrapped = false, blocked = false, endSince = null;
+    (function step() {
+        var el;
+        try { el = find(); } catch (e) { return done({status: 'error', message: String(e)}); }
+        if (el) {
+            el.scrollIntoView({block: 'center'});
+            return done({status: 'found', element: el, jumps: jumps});
+        }
+        if (Date.now() >= deadline) return done({status: 'timeout', jumps: jumps});
+        var atEnd = blocked || (wrapped ? container.scrollTop >= start
+                                        : container.scrollTop >= container.scrollHeight - container.clientHeight - 1);
+        if (atEnd) {
+            if (wrapped) return search(list, index + 1);
+            if (container.scrollHeight > lastHeight) {
+                // The list grew when we reached its end: keep jumping
+                lastHeight = container.scrollHeight;
+                endSince = null;
+            } else {
+                if (endSince === null) endSince = Date.now();
+                if (Date.now() - endSince < growthMs) return setTimeout(step, stepMs);
+                if (start <= 0) return search(list, index + 1);
+                wrapped = true;
+                blocked = false;
+                container.scrollTop = 0;
+                jumps++;
+                return setTimeout(step, stepMs);
+            }
+        }
+        var before = container.scrollTop;
+        container.scrollTop = before + Math.max(50, Math.floor(container.clientHeight * 0.9));
+        jumps++;
+        // Scrolling is blocked (e.g. overflow hidden by script): treat it as the end of this container
+        blocked = container.scrollTop === before;
+        setTimeout(step, stepMs);
+    })();
+}
+search(containers(), 0);
+"""
+
+
+def _origin(url):
+    """scheme://host[:port] of an http(s) URL, or None for about:blank, data: and the like."""
+    parts = urlsplit(url or '')
+    if parts.scheme not in ('http', 'https') or not parts.netloc:
+        return None
+    return f"{parts.scheme}://{parts.netloc}"
+
 
-    
 class SeleniumActions(AutomationActionsInterface):
     driver = None
+    element_timeout = 10            # seconds to wait for presence, then again for clickability
+    resolver_poll_interval = 0.05   # seconds between in-page checks of the resolver
+    scroll_search_budget = 5        # seconds the scroll search may take before giving up (below the 30 s script timeout)
+    scroll_search_step_delay = 0.05 # seconds to let a virtualized list render after each jump
+    scroll_search_growth_wait = 0.5 # seconds to wait at the end of a container for more rows to load
 
     def initiatedriver(self, browser='edge', headless=True):
         try:
@@ -83,6 +241,7 @@ class SeleniumActions(AutomationActionsInterface):
                 self.reporting.log_error(error_message)
                 return False, error_message
             self.driver.switch_to.window(handles[tab_index])
+            self.element_cache.invalidate()
             log_message = f"Switched to browser tab: {tab_index}"
             self.reporting.log_info(log_message)
             return True, log_message
@@ -93,6 +252,7 @@ class SeleniumActions(AutomationActionsInterface):
 
     def reload_window(self):
         """Reload the current browser window."""
+        self.element_cache.invalidate()
         try:
             self.driver.refresh()
             log_message = "Reloaded the current browser window successfully."
@@ -103,9 +263,17 @@ class SeleniumActions(AutomationActionsInterface):
             self.reporting.log_error(error_message)
             return False, error_message
     
-    def __init__(self, reporting: RobustReporting):
-        """Initialize the SeleniumActions class."""
+    def __init__(self, reporting: RobustReporting, browser='edge', headless=False, script_resolver=True):
+        """
+        Initialize the SeleniumActions class.
+        script_resolver=False locates elements with separate WebDriver waits instead of RESOLVE_ELEMENT_JS.
+        """
         self.reporting = reporting
+        self.browser = browser
+        self.headless = headless
+        self.script_resolver = script_resolver
+        self._resolved = None
+        self.element_cache = ElementCache()
         if(self.driver is None):           
             self._init_driver()  # Initialize the WebDriver
         os.makedirs('Reports', exist_ok=True)  # Ensure the Reports directory exists
@@ -116,15 +284,28 @@ class SeleniumActions(AutomationActionsInterface):
         """Initialize WebDriver."""
         try:
             #self.driver = webdriver.Chrome()  # Use Chrome WebDriver
-            self.driver = self.initiatedriver(browser='edge', headless=False)
+            self.driver = self.initiatedriver(browser=self.browser, headless=self.headless)
             self.driver.maximize_window()  # Maximize the browser window
+            self._install_settle_probe()
         except Exception as e:
             self.reporting.log_error(
                 f"WebDriver initialization failed: {str(e)}")
             raise
 
+    def _install_settle_probe(self):
+        """
+        Register the settle instrumentation to run at the start of every document (Chromium CDP),
+        so requests started while a page loads are counted. Other drivers install it on first probe.
+        """
+        from modules.page_settle import SETTLE_INSTALL_JS
+        try:
+            self.driver.execute_cdp_cmd('Page.addScriptToEvaluateOnNewDocument', {'source': SETTLE_INSTALL_JS})
+        except Exception as e:
+            self.reporting.log_info(f"Settle probe installs on first use (no CDP): {e}")
+
     def open_url(self, url):
         """Open the specified URL in the browser."""
+        self.element_cache.invalidate()
         try:
             self.driver.get(url)  # Navigate to the URL
             self.reporting.log_info(f"Opened URL: {url}")
@@ -144,7 +325,8 @@ class SeleniumActions(AutomationActionsInterface):
             from selenium.webdriver.common.keys import Keys
 
             element = self._find_element(xpath)  # Locate the element
-            element_type = element.get_attribute("type")
+            info = self._resolved_info(element)
+            element_type = info['type'] if info else element.get_attribute("type")
             element_type = element_type.lower() if element_type else None
             known_types = ["text", "email", "number", "password", "radio", "checkbox"]
 
@@ -163,7 +345,7 @@ class SeleniumActions(AutomationActionsInterface):
                 else:
                     if element.is_selected():
                         element.click()
-            elif element.tag_name.lower() == "select":
+            elif (info['tag'] if info else element.tag_name.lower()) == "select":
                 from selenium.webdriver.support.ui import Select
                 Select(element).select_by_visible_text(value)
             else:
@@ -182,6 +364,56 @@ class SeleniumActions(AutomationActionsInterface):
             self.reporting.log_error(error_message)
             return False, error_message
 
+    def fill_fields(self, fields):
+        """Fill several fields with one FILL_FIELDS_JS call (see AutomationActionsInterface.fill_fields)."""
+        from modules.form_fill import FILL_FIELDS_JS, fill_outcomes
+        fields = [(selector, str(value)) for selector, value in fields]
+        try:
+            results = self.driver.execute_script("return (" + FILL_FIELDS_JS.strip() + ")(arguments[0]);",
+                                                 [list(field) for field in fields])
+        except WebDriverException as e:
+            self.reporting.log_info(f"Batched form fill unavailable, filling fields one by one: {e.msg}")
+            return []
+        return fill_outcomes(results, fields, self.reporting)
+
+    def read_values(self, selectors):
+        """Read several elements with one SNAPSHOT_VALUES_JS call (see AutomationActionsInterface.read_values)."""
+        from modules.snapshot_assertions import SNAPSHOT_VALUES_JS
+        try:
+            entries = self.driver.execute_script("return (" + SNAPSHOT_VALUES_JS.strip() + ")(arguments[0]);",
+                                                 list(selectors))
+        except WebDriverException as e:
+            self.reporting.log_info(f"Snapshot read unavailable, reading fields one by one: {e.msg}")
+            return {}
+        values = {}
+        for selector, entry in (entries or {}).items():
+            # Same precedence as get_value: <select> -> selected option text, fields -> value, else text
+            values[selector] = entry['text'] if entry['tag'] == 'select' or entry['value'] is None else entry['value']
+        return values
+
+    def read_table(self, selector, wait=0, budget=20):
+        """Read a whole table with one READ_TABLE_JS call (see AutomationActionsInterface.read_table)."""
+        from modules.table_extraction import READ_TABLE_JS, selenium_async_script
+        try:
+            # The script stops within budget seconds itself, inside WebDriver's script timeout (30s by default)
+            return self.driver.execute_async_script(selenium_async_script(READ_TABLE_JS),
+                                                    [selector, int(wait * 1000), int(budget * 1000)])
+        except WebDriverException as e:
+            return {'error': e.msg}
+
+    def next_table_page(self, selector, next_selector, timeout=10):
+        """Turn a table page with one TURN_PAGE_JS call (see AutomationActionsInterface.next_table_page)."""
+        from modules.table_extraction import TURN_PAGE_JS, selenium_async_script
+        try:
+            # The script waits up to timeout itself, within WebDriver's script timeout (30s by default)
+            turned = self.driver.execute_async_script(selenium_async_script(TURN_PAGE_JS),
+                                                      [selector, next_selector, int(timeout * 1000)])
+        except WebDriverException as e:
+            self.reporting.log_error(f"Failed to turn table page: {e.msg}")
+            return 'unchanged'
+        self.element_cache.invalidate()
+        return turned if isinstance(turned, str) else 'unchanged'
+
     def get_value(self, xpath):
         """Retrieve the value of an element identified by its XPath."""
         try:
@@ -191,7 +423,10 @@ class SeleniumActions(AutomationActionsInterface):
             element = self._find_element(xpath)  # Locate the element
 
             # Handle different element types
-            if element.tag_name.lower() in ["input", "textarea"]:
+            info = self._resolved_info(element)
+            if info:
+                value = info['value']  # read by the resolver in the same round trip
+            elif element.tag_name.lower() in ["input", "textarea"]:
                 value = element.get_attribute("value")
             elif element.tag_name.lower() == "select":
                 from selenium.webdriver.support.ui import Select
@@ -243,21 +478,95 @@ class SeleniumActions(AutomationActionsInterface):
         return 'css'
 
     def _find_element(self, selector):
-        """Find an element using XPath or CSS selector with robust error handling. Waits for presence and clickability."""
+        """
+        Find an element using XPath or CSS selector with robust error handling. Waits for presence and clickability.
+        The in-page resolver does the waits, checks and scroll in one round trip; the WebDriver waits
+        below are only used when the script cannot run, and the scroll search when nothing matched.
+        """
         by_type = self._detect_selector_type(selector)
         by = By.XPATH if by_type == 'xpath' else By.CSS_SELECTOR
+        self._resolved = None
+        cached = self._cached_element(selector)
+        if cached is not None:
+            return cached
+        timeout = self.element_timeout_for(selector, self.element_timeout)
+        if self.script_resolver:
+            resolved = self._resolve_in_page(selector, by_type, timeout)
+            if resolved is not None:
+                status = resolved['status']
+                if status == 'missing':
+                    self.reporting.log_info(f"Element not found initially, attempting to scroll and locate: {selector}")
+                    return self._scroll_to_find(by, selector)
+                if status == 'not_clickable':
+                    self.reporting.log_info(f"Element present but not clickable within {timeout}s: {selector}")
+                elif status == 'hidden':
+                    self.reporting.log_info(f"Element present but not clickable within {timeout}s: {selector}")
+                    self.reporting.log_info(f"Element found but not visible: {selector}")
+                self._resolved = resolved
+                if status == 'ready':
+                    self.element_cache.put(selector, resolved['element'])
+                return resolved['element']
+        return self._wait_for_element(by, selector, timeout)
+
+    def _cached_element(self, selector):
+        """
+        The element cached for selector if it is still attached, visible and enabled (one
+        CHECK_CACHED_ELEMENT_JS call), else None. Elements from a previous page raise a stale
+        reference error here and are dropped like detached ones.
+        """
+        element = self.element_cache.get(selector)
+        if element is None:
+            return None
+        try:
+            checked = self.driver.execute_script(CHECK_CACHED_ELEMENT_JS, element)
+        except WebDriverException:
+            checked = None
+        if not isinstance(checked, dict) or checked.get('status') != 'ready':
+            self.element_cache.discard(selector)
+            return None
+        checked['element'] = element
+        self._resolved = checked
+        return element
+
+    def _resolve_in_page(self, selector, by_type, timeout):
+        """
+        Run RESOLVE_ELEMENT_JS: returns its result dict (status ready / not_clickable / hidden /
+        missing, plus the element and its tag, type, value and visibility), or None when the
+        script could not run or reported an error, so the caller falls back to WebDriver waits.
+        timeout (seconds) applies to presence and again to clickability, like the WebDriver waits.
+        """
+        timeout_ms = int(timeout * 1000)
+        try:
+            resolved = self.driver.execute_async_script(
+                RESOLVE_ELEMENT_JS, selector, by_type == 'xpath', timeout_ms, timeout_ms,
+                int(self.resolver_poll_interval * 1000))
+        except WebDriverException as e:
+            self.reporting.log_info(f"In-page resolver unavailable for {selector}, using WebDriver waits: {e.msg}")
+            return None
+        if not isinstance(resolved, dict) or resolved.get('status') == 'error':
+            return None
+        return resolved
+
+    def _resolved_info(self, element):
+        """What the in-page resolver reported for element, or None if it came from the fallback path."""
+        if self._resolved is not None and self._resolved.get('element') is element:
+            return self._resolved
+        return None
+
+    def _wait_for_element(self, by, selector, timeout):
+        """WebDriver-wait version of the resolver: presence, clickability, visibility and scroll as separate calls."""
         try:
             # Wait for the element to be present in the DOM
-            element = WebDriverWait(self.driver, 10).until(
+            element = WebDriverWait(self.driver, timeout).until(
                 EC.presence_of_element_located((by, selector))
             )
             # Wait for the element to be clickable (if visible)
             try:
-                element = WebDriverWait(self.driver, 10).until(
+                element = WebDriverWait(self.driver, timeout).until(
                     EC.element_to_be_clickable((by, selector))
                 )
             except Exception:
-                self.reporting.log_info(f"Element present but not clickable within 10s: {selector}")
+                self.reporting.log_info(f"Element present but not clickable within {timeout}s: {selector}")
             # Check if the element is visible
             if not element.is_displayed():
                 self.reporting.log_info(f"Element found but not visible: {selector}")
@@ -268,56 +577,100 @@ class SeleniumActions(AutomationActionsInterface):
             return element
         except TimeoutException:
             self.reporting.log_info(f"Element not found initially, attempting to scroll and locate: {selector}")
+            return self._scroll_to_find(by, selector)
 
-            # Detect the immediate scrollable parent container of the element (only for XPath)
-            container = None
-            if by == By.XPATH:
-                detect_container_script = """
-                    var element = document.evaluate(arguments[0], document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
-                    if (!element) return null;
-                    var parent = element.parentElement;
-                    while (parent) {
-                        var overflowY = window.getComputedStyle(parent).overflowY;
-                        if (overflowY === 'auto' || overflowY === 'scroll') {
-                            return parent;
-                        }
-                        parent = parent.parentElement;
-                    }
-                    return null;
-                """
-                container = self.driver.execute_script(detect_container_script, selector)
-                if not container:
-                    self.reporting.log_info("No scrollable container found; defaulting to window scroll.")
-                    container = None  # Default to window scroll
-            scroll_script = """
-                var container = arguments[0] || window;
-                var scrollStep = arguments[1];
-                var currentScroll = container.scrollTop || window.pageYOffset;
-                var maxScroll = container.scrollHeight - container.clientHeight;
-                if (currentScroll + scrollStep <= maxScroll) {
-                    container.scrollBy(0, scrollStep);
-                    return false; // Not at the end of scroll
-                } else {
-                    return true; // Reached the end of scroll
-                }
-            """
-            scroll_step = 100  # Scroll by 100px at a time
-            while True:
-                at_end = self.driver.execute_script(scroll_script, container, scroll_step)
-                try:
-                    element = WebDriverWait(self.driver, 2).until(
-                        EC.presence_of_element_located((by, selector))
-                    )
-                    self.reporting.log_info(f"Element found after scrolling: {selector}")
-                    return element
-                except TimeoutException:
-                    pass  # Continue scrolling
-                if at_end:
-                    break  # Stop if reached the end of the scrollable area
-            # if still not found then do not raise error, just return None
+    def _scroll_to_find(self, by, selector):
+        """
+        Scroll search for an element that is not in the DOM (see SCROLL_SEARCH_JS): viewport-sized
+        jumps through every scrollable container, one WebDriver call in total. Returns the element or None.
+        """
+        self.scroll_searches += 1
+        try:
+            result = self.driver.execute_async_script(
+                SCROLL_SEARCH_JS, selector, by == By.XPATH, int(self.scroll_search_budget * 1000),
+                int(self.scroll_search_step_delay * 1000), int(self.scroll_search_growth_wait * 1000))
+        except WebDriverException as e:
+            self.reporting.log_info(f"Scroll search failed for {selector}: {e.msg}")
             return None
-                   
-            #raise Exception(f"Element not found after scrolling: {selector}")
+        status = result.get('status') if isinstance(result, dict) else None
+        if status == 'found':
+            self.reporting.log_info(f"Element found after scrolling: {selector} ({result['jumps']} jump(s))")
+            return result['element']
+        if status == 'timeout':
+            self.reporting.log_info(f"Element not found within the {self.scroll_search_budget}s scroll search budget: {selector}")
+        elif status == 'error':
+            self.reporting.log_info(f"Scroll search failed for {selector}: {result.get('message')}")
+        else:
+            self.reporting.log_info(f"Element not found after scrolling every container: {selector}")
+        # if still not found then do not raise error, just return None
+        return None
+
+    def wait_for_page_settle(self, quiet_ms=300, timeout=3, poll_interval=0.05):
+        from modules.page_settle import wait_for_settle, SETTLE_PROBE_JS
+        probe_script = "return " + SETTLE_PROBE_JS.strip()
+        return wait_for_settle(lambda: self.driver.execute_script(probe_script), quiet_ms, timeout, poll_interval)
+
+    def check_wait_condition(self, condition, selector):
+        from modules.page_settle import SETTLE_PROBE_JS, is_network_idle
+        kind = condition.kind
+        if kind == 'url':
+            return condition.argument in self.driver.current_url
+        if kind == 'network_idle':
+            return is_network_idle(self.driver.execute_script("return " + SETTLE_PROBE_JS.strip()))
+        by = By.XPATH if self._detect_selector_type(selector) == 'xpath' else By.CSS_SELECTOR
+        elements = self.driver.find_elements(by, selector)
+        if kind == 'gone':
+            return not any(element.is_displayed() for element in elements)
+        if not elements:
+            return False
+        element = elements[0]
+        if kind == 'visible':
+            return element.is_displayed()
+        if kind == 'clickable':
+            return element.is_displayed() and element.is_enabled()
+        if kind == 'text':
+            return condition.argument in (element.text or element.get_attribute('value') or '')
+        return False
+
+    def reset_session(self):
+        """
+        Clear cookies and storage of every origin visited in this session and leave one fresh
+        about:blank tab. Origins come from each tab's navigation history (Chromium CDP), so pages
+        reached by clicks are covered too; closing the old tabs drops their sessionStorage.
+        Drivers without CDP cannot clear other origins' storage, so the reset fails and the
+        session pool recycles the browser instead.
+        """
+        self.element_cache.invalidate()
+        if not hasattr(self.driver, 'execute_cdp_cmd'):
+            error_message = "Cannot clear storage of every visited origin without CDP; browser will be recycled"
+            self.reporting.log_info(error_message)
+            return False, error_message
+        try:
+            handles = self.driver.window_handles
+            origins = set()
+            for handle in handles:
+                self.driver.switch_to.window(handle)
+                history = self.driver.execute_cdp_cmd('Page.getNavigationHistory', {})
+                origins.update(_origin(entry.get('url')) for entry in history.get('entries', []))
+                origins.add(_origin(self.driver.current_url))
+            origins.discard(None)
+            self.driver.switch_to.new_window('tab')
+            fresh = self.driver.current_window_handle
+            for handle in handles:
+                self.driver.switch_to.window(handle)
+                self.driver.close()
+            self.driver.switch_to.window(fresh)
+            for origin in sorted(origins):
+                self.driver.execute_cdp_cmd('Storage.clearDataForOrigin', {'origin': origin, 'storageTypes': 'all'})
+            # Chromium drivers (Edge/Chrome) can drop cookies of every domain at once
+            self.driver.execute_cdp_cmd('Network.clearBrowserCookies', {})
+            log_message = f"Browser session reset for reuse ({len(origins)} origin(s) cleared)."
+            self.reporting.log_info(log_message)
+            return True, log_message
+        except Exception as e:
+            error_message = f"Failed to reset browser session: {str(e)}"
+            self.reporting.log_error(error_message)
+            return False, error_message
 
     def quit(self):
         """Close the browser and clean up resources."""
@@ -384,7 +737,8 @@ class SeleniumActions(AutomationActionsInterface):
             if not xpath:
                 raise ValueError("XPath cannot be empty for is_element_visible action")
             element = self._find_element(xpath)
-            visible = element.is_displayed()
+            info = self._resolved_info(element)
+            visible = info['visible'] if info else element.is_displayed()
             self.reporting.log_info(f"Element visibility for {xpath}: {visible}")
             return True, str(visible)
         except Exception as e:
@@ -0,0 +1,87 @@
+# session_pool.py
+# Keeps browser sessions alive across datasets, resetting them in between instead of relaunching.
+
+import time
+
+
+class SessionPool:
+    """
+    Hands out automation action instances (see middleware.get_framework_class) for datasets.
+    A released session is reset (cookies, storage, extra tabs, about:blank) and reused; it is
+    recycled (quit and relaunched on next acquire) after max_uses datasets, when the dataset
+    raised, or when the reset itself fails.
+    """
+
+    def __init__(self, factory=None, max_uses=20, reporting=None):
+        if factory is None:
+            from modules.middleware import get_framework_class as factory
+        self.factory = factory
+        self.max_uses = max(1, int(max_uses))
+        self.reporting = reporting
+        self._idle = []
+        self._uses = {}
+        self.stats = {'launched': 0, 'reused': 0, 'recycled': 0, 'reset_times': []}
+
+    def acquire(self):
+        """Return an idle session, or launch a new one."""
+        if self._idle:
+            actions = self._idle.pop()
+            self.stats['reused'] += 1
+        else:
+            actions = self.factory()
+            self._uses[id(actions)] = 0
+            self.stats['launched'] += 1
+        self._uses[id(actions)] += 1
+        return actions
+
+    def release(self, actions, failed=False):
+        """
+        Give a session back after a dataset. Returns the reset time in seconds, or None when the
+        session was recycled instead of reset.
+        """
+        if failed or self._uses.get(id(actions), 0) >= self.max_uses:
+            self._recycle(actions)
+            return None
+        start = time.perf_counter()
+        success, message = actions.reset_session()
+        elapsed = time.perf_counter() - start
+        if not success:
+            self._log(f"Session reset failed, recycling browser: {message}")
+            self._recycle(actions)
+            return None
+        self.stats['reset_times'].append(elapsed)
+        self._idle.append(actions)
+        return elapsed
+
+    def _recycle(self, actions):
+        self.stats['recycled'] += 1
+        self._uses.pop(id(actions), None)
+        try:
+            actions.quit()
+        except Exception as e:
+            self._log(f"Error while closing recycled browser: {e}")
+
+    def _log(self, message):
+        if self.reporting is not None:
+            self.reporting.log_info(message)
+        print(message)
+
+    def close(self):
+        """Quit every idle session."""
+        while self._idle:
+            actions = self._idle.pop()
+            self._uses.pop(id(actions), None)
+            try:
+                actions.quit()
+            except Exception as e:
+                self._log(f"Error while closing browser: {e}")
+
+
+def format_session_stats(launched, reused, recycled, reset_times):
+    """One-line summary of browser reuse and the measured reset cost."""
+    if reset_times:
+        avg_ms = sum(reset_times) / len(reset_times) * 1000
+        reset_info = f", {len(reset_times)} reset(s) avg {avg_ms:.0f} ms / max {max(reset_times) * 1000:.0f} ms"
+    else:
+        reset_info = ", no resets"
+    return f"Browser sessions: {launched} launched, {reused} reused, {recycled} recycled{reset_info}"
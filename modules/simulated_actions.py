@@ -0,0 +1,312 @@
+# simulated_actions.py
+# Browser-free backend for measuring engine overhead (plan, dispatch, logging, reporting).
+# Selected with "framework": "simulated"; tuned by the "simulated" section of automation_config.json.
+
+import os
+import random
+import time
+
+from modules.reporting_v2 import RobustReporting
+from modules.automation_interface import AutomationActionsInterface
+
+DEFAULT_SIMULATED_SETTINGS = {
+    'latency_ms': 0,            # added to every browser call
+    'jitter_ms': 0,             # random extra latency, 0..jitter_ms
+    'failure_rate': 0.0,        # probability that any element action fails
+    'fail_selectors': [],       # selectors whose actions always fail
+    'auto_create_elements': True,  # unknown selectors resolve to a fresh element instead of "not found"
+    'elements': {},             # preset DOM: {selector: {"value": ..., "text": ..., "visible": ..., "enabled": ...}}
+    'tables': {},               # preset tables: {selector: {"headers": [...], "pages": [[row, ...], ...]}}
+    'seed': None,
+}
+
+# Smallest valid PNG (1x1 transparent pixel), written for screenshots
+_PNG_1X1 = bytes.fromhex(
+    '89504e470d0a1a0a0000000d4948445200000001000000010806000000'
+    '1f15c4890000000d4944415478da63f8ffff3f0005fe02fea7d6a5f500'
+    '00000049454e44ae426082'
+)
+
+
+class SimulatedElement:
+    """
+    One node of the in-memory DOM. value / text None mean 'unknown' (an auto-created element),
+    which any assertion or text wait condition accepts.
+    """
+    __slots__ = ('value', 'text', 'visible', 'enabled')
+
+    def __init__(self, value=None, text=None, visible=True, enabled=True):
+        self.value = value
+        self.text = text
+        self.visible = visible
+        self.enabled = enabled
+
+
+class SimulatedDriver:
+    """Stand-in for the WebDriver / Page handed to custom actions and used for screenshots."""
+    def __init__(self):
+        self.current_url = 'about:blank'
+        self.title = ''
+        self.elements = {}
+        self.table_pages = {}
+        self.window_handles = ['tab-0']
+
+    @property
+    def url(self):
+        return self.current_url
+
+    def save_screenshot(self, path):
+        with open(path, 'wb') as f:
+            f.write(_PNG_1X1)
+        return True
+
+    def execute_script(self, script, *args):
+        return None
+
+
+class SimulatedActions(AutomationActionsInterface):
+    """
+    AutomationActionsInterface over SimulatedDriver's in-memory DOM, with configurable latency and
+    failure injection. Every action returns the same (success, message) shapes as SeleniumActions.
+    """
+    def __init__(self, reporting: RobustReporting, settings=None):
+        self.reporting = reporting
+        self.settings = dict(DEFAULT_SIMULATED_SETTINGS)
+        self.settings.update(settings or {})
+        self._latency = float(self.settings['latency_ms']) / 1000
+        self._jitter = float(self.settings['jitter_ms']) / 1000
+        self._failure_rate = float(self.settings['failure_rate'])
+        self._fail_selectors = set(self.settings['fail_selectors'] or [])
+        self._random = random.Random(self.settings['seed'])
+        self.driver = SimulatedDriver()
+        self._load_preset()
+        os.makedirs('Reports', exist_ok=True)
+
+    def _load_preset(self):
+        self.driver.elements = {
+            selector: SimulatedElement(**attributes)
+            for selector, attributes in (self.settings['elements'] or {}).items()
+        }
+        self.driver.table_pages = dict.fromkeys(self.settings['tables'] or {}, 0)
+
+    def _browser_call(self):
+        delay = self._latency + (self._random.random() * self._jitter if self._jitter else 0)
+        if delay > 0:
+            time.sleep(delay)
+
+    def _injected_failure(self, selector):
+        if selector in self._fail_selectors:
+            return f"Simulated failure for element: {selector}"
+        if self._failure_rate and self._random.random() < self._failure_rate:
+            return f"Simulated random failure for element: {selector}"
+        return None
+
+    def _find_element(self, selector):
+        """Return the element for selector (created on demand when auto_create_elements) or None."""
+        self._browser_call()
+        element = self.driver.elements.get(selector)
+        if element is None and self.settings['auto_create_elements']:
+            element = self.driver.elements[selector] = SimulatedElement()
+        return element
+
+    def _element_action(self, selector, action_name):
+        """Common start of element actions: returns (element, error_message)."""
+        if not selector:
+            return None, f"XPath cannot be empty for {action_name} action"
+        failure = self._injected_failure(selector)
+        if failure:
+            return None, failure
+        element = self._find_element(selector)
+        if element is None:
+            return None, f"Element not found: {selector}"
+        return element, None
+
+    def _fail(self, message):
+        self.reporting.log_error(message)
+        return False, message
+
+    def open_url(self, url):
+        self._browser_call()
+        failure = self._injected_failure(url)
+        if failure:
+            return self._fail(f"Failed to open URL {url}: {failure}")
+        self.driver.current_url = str(url)
+        self.reporting.log_info(f"Opened URL: {url}")
+        return True, None
+
+    def set_value(self, selector, value):
+        element, error = self._element_action(selector, 'set_value')
+        if error:
+            return self._fail(f"Failed to set value: {error}")
+        element.value = str(value)
+        self.reporting.log_info(f"Set value '{value}' to element: {selector}")
+        return True, None
+
+    def fill_fields(self, fields):
+        # One simulated browser call for the whole batch, then set_value's checks per field
+        self._browser_call()
+        outcomes = []
+        for selector, value in fields:
+            failure = self._injected_failure(selector)
+            element = self.driver.elements.get(selector)
+            if element is None and self.settings['auto_create_elements'] and not failure:
+                element = self.driver.elements[selector] = SimulatedElement()
+            if failure or element is None:
+                outcomes.append(self._fail(f"Failed to set value: {failure or f'Element not found: {selector}'}"))
+                break
+            element.value = str(value)
+            self.reporting.log_info(f"Set value '{value}' to element: {selector}")
+            outcomes.append((True, None))
+        return outcomes
+
+    def read_values(self, selectors):
+        # One simulated browser call for the whole snapshot; injected failures and elements without
+        # a value (assert_value adopts the expected one) are left to the per-step actions
+        self._browser_call()
+        values = {}
+        for selector in selectors:
+            element = self.driver.elements.get(selector)
+            if element is not None and element.value is not None and not self._injected_failure(selector):
+                values[selector] = element.value
+        return values
+
+    def read_table(self, selector, wait=0, budget=20):
+        self._browser_call()
+        table = (self.settings['tables'] or {}).get(selector)
+        failure = self._injected_failure(selector)
+        if failure:
+            return {'error': failure}
+        if table is None:
+            return None
+        pages = table.get('pages') or [[]]
+        return {'headers': list(table.get('headers') or []), 'rows': pages[self.driver.table_pages[selector]]}
+
+    def next_table_page(self, selector, next_selector, timeout=10):
+        self._browser_call()
+        table = (self.settings['tables'] or {}).get(selector)
+        if table is None:
+            return 'missing'
+        if self.driver.table_pages[selector] + 1 >= len(table.get('pages') or [[]]):
+            return 'last'
+        self.driver.table_pages[selector] += 1
+        return 'advanced'
+
+    def get_value(self, selector):
+        element, error = self._element_action(selector, 'get_value')
+        if error:
+            return self._fail(f"Failed to get value: {error}")
+        value = element.value if element.value is not None else (element.text or '')
+        self.reporting.log_info(f"Got value '{value}' from element: {selector}")
+        return True, value
+
+    def assert_value(self, selector, expected_value):
+        element, error = self._element_action(selector, 'assert_value')
+        if error:
+            return self._fail(f"Assertion failed: {error}")
+        if element.value is None:
+            element.value = str(expected_value)
+        if str(element.value) != str(expected_value):
+            return self._fail(f"Assertion failed: Expected '{expected_value}', got '{element.value}'")
+        self.reporting.log_info(f"Assertion passed: {expected_value} == {element.value}")
+        return True, None
+
+    def element_click(self, selector):
+        element, error = self._element_action(selector, 'element_click')
+        if error:
+            return self._fail(f"Failed to click element {selector}: {error}")
+        if not element.visible or not element.enabled:
+            return self._fail(f"Failed to click element {selector}: element is not clickable")
+        self.reporting.log_info(f"Clicked element: {selector}")
+        return True, None
+
+    def scroll_page(self, scroll_count=1):
+        self._browser_call()
+        self.reporting.log_info(f"Scrolled {scroll_count} time(s) in window")
+        return True, None
+
+    def clear_text(self, selector):
+        element, error = self._element_action(selector, 'clear_text')
+        if error:
+            return self._fail(f"Failed to clear text: {error}")
+        element.value = ''
+        self.reporting.log_info(f"Cleared text for element: {selector}")
+        return True, None
+
+    def is_element_visible(self, selector):
+        element, error = self._element_action(selector, 'is_element_visible')
+        if error:
+            return self._fail(f"Failed to check element visibility: {error}")
+        self.reporting.log_info(f"Element visibility for {selector}: {element.visible}")
+        return True, str(element.visible)
+
+    def element_exists(self, selector):
+        if not selector:
+            return self._fail("Error in element_exists: XPath cannot be empty for element_exists action")
+        self._browser_call()
+        exists = selector in self.driver.elements or bool(self.settings['auto_create_elements'])
+        self.reporting.log_info(f"Element exists: {selector}: {exists}")
+        return True, exists
+
+    def switch_to_tab(self, tab_index):
+        self._browser_call()
+        if tab_index < 0 or tab_index >= len(self.driver.window_handles):
+            return self._fail(f"Tab index {tab_index} out of range. Available tabs: {len(self.driver.window_handles)}")
+        log_message = f"Switched to browser tab: {tab_index}"
+        self.reporting.log_info(log_message)
+        return True, log_message
+
+    def reload_window(self):
+        self._browser_call()
+        log_message = "Reloaded the current browser window successfully."
+        self.reporting.log_info(log_message)
+        return True, log_message
+
+    def send_downarrow_then_tab(self, selector):
+        element, error = self._element_action(selector, 'send_downarrow_then_tab')
+        if error:
+            return self._fail(f"Failed to press down arrow and tab key: {error}")
+        log_message = "Pressed down arrow and tab key."
+        self.reporting.log_info(log_message)
+        return True, log_message
+
+    def wait_for_page_settle(self, quiet_ms=300, timeout=3, poll_interval=0.05):
+        # The simulated page is settled as soon as the call returns
+        start = time.perf_counter()
+        self._browser_call()
+        return True, time.perf_counter() - start
+
+    def check_wait_condition(self, condition, selector):
+        self._browser_call()
+        kind = condition.kind
+        if kind == 'url':
+            return condition.argument in self.driver.current_url
+        if kind == 'network_idle':
+            return True
+        element = self.driver.elements.get(selector)
+        if element is None and self.settings['auto_create_elements'] and kind != 'gone':
+            element = self._find_element(selector)
+        if kind == 'gone':
+            return element is None or not element.visible
+        if element is None:
+            return False
+        if kind == 'visible':
+            return element.visible
+        if kind == 'clickable':
+            return element.visible and element.enabled
+        if kind == 'text':
+            if element.text is None and element.value is None:
+                return True
+            return condition.argument in (element.text or element.value or '')
+        return False
+
+    def reset_session(self):
+        self._browser_call()
+        self.driver.current_url = 'about:blank'
+        self._load_preset()
+        log_message = "Browser session reset for reuse."
+        self.reporting.log_info(log_message)
+        return True, log_message
+
+    def quit(self):
+        self.driver.elements = {}
+        self.reporting.log_info("Browser closed and cleanup completed")
@@ -0,0 +1,96 @@
+# snapshot_assertions.py
+# Bulk reads for verification sections: a run of consecutive GetElementText / AssertValue /
+# custom-compare_text steps on one screen reads every locator of the run with one in-page script
+# (SNAPSHOT_VALUES_JS), then runs each step against that snapshot, so a 40-field check costs one
+# browser round trip instead of forty. Each field still gets its own step result.
+
+from modules.form_fill import FIND_ELEMENT_JS
+from modules.wait_conditions import WaitCondition
+
+# Action keywords whose steps only read the page through actions.get_value / assert_value
+SNAPSHOT_ACTIONS = {'getelementtext', 'assertvalue', 'custom-compare_text'}
+
+# Reads [selector, ...] and returns {selector: {tag, value, text}} for the selectors that match:
+# value for input/textarea/select, text for the rendered text (the selected option's text for a
+# <select>; '' for hidden elements, as WebElement.text). Missing selectors are left out.
+SNAPSHOT_VALUES_JS = """
+(selectors) => {
+""" + FIND_ELEMENT_JS + """    function renderedText(el) {
+        if (!el.getClientRects().length || window.getComputedStyle(el).visibility === 'hidden') return '';
+        return el.innerText.replace(/\\u00a0/g, ' ').split('\\n').map(function (line) { return line.trim(); }).join('\\n').trim();
+    }
+    var values = {};
+    for (var i = 0; i < selectors.length; i++) {
+        var el;
+        try { el = find(selectors[i]); } catch (e) { el = null; }
+        if (!el) continue;
+        var tag = el.tagName.toLowerCase(), entry = {tag: tag, value: null, text: null};
+        if (tag === 'input' || tag === 'textarea') {
+            entry.value = el.value;
+        } else if (tag === 'select') {
+            entry.value = el.value;
+            entry.text = el.selectedOptions.length ? el.selectedOptions[0].text.trim() : null;
+        } else {
+            entry.text = renderedText(el);
+        }
+        values[selectors[i]] = entry;
+    }
+    return values;
+}
+"""
+
+_snapshot_assertions = None
+
+
+def is_snapshot_enabled():
+    """Config 'snapshot_assertions' (default true), read once."""
+    global _snapshot_assertions
+    if _snapshot_assertions is None:
+        from modules.middleware import get_config
+        _snapshot_assertions = bool(get_config().get('snapshot_assertions', True))
+    return _snapshot_assertions
+
+
+def is_snapshot_step(step):
+    """A read-only step that can join a snapshot run: known action, a locator, no pre-wait, no pass screenshot."""
+    handler = step.get('handler')
+    return (handler is not None and handler.keyword in SNAPSHOT_ACTIONS and step['xpath']
+            and not isinstance(step['wait_time'], WaitCondition) and not step['wait_time']
+            and not step['get_pass_screenshot'])
+
+
+class SnapshotActions:
+    """
+    Stands in for the actions object while a snapshot run executes: get_value and assert_value
+    answer from the snapshot ({selector: value}, as returned by actions.read_values) with the
+    same results and log lines as the backend; selectors missing from it, and every other
+    attribute, go to the real actions. Reads do not change the page, so there is nothing to settle.
+    """
+    def __init__(self, actions, snapshot, reporting):
+        self._actions = actions
+        self._snapshot = snapshot
+        self._reporting = reporting
+
+    def __getattr__(self, name):
+        return getattr(self._actions, name)
+
+    def get_value(self, selector):
+        if selector not in self._snapshot:
+            return self._actions.get_value(selector)
+        value = self._snapshot[selector]
+        self._reporting.log_info(f"Got value '{value}' from element: {selector}")
+        return True, value
+
+    def assert_value(self, selector, expected_value):
+        if selector not in self._snapshot:
+            return self._actions.assert_value(selector, expected_value)
+        actual_value = self._snapshot[selector]
+        if str(actual_value) != str(expected_value):
+            error_message = f"Assertion failed: Expected '{expected_value}', got '{actual_value}'"
+            self._reporting.log_error(error_message)
+            return False, error_message
+        self._reporting.log_info(f"Assertion passed: {expected_value} == {actual_value}")
+        return True, None
+
+    def wait_for_page_settle(self, quiet_ms=300, timeout=3, poll_interval=0.05):
+        return True, 0.0
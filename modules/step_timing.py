@@ -0,0 +1,135 @@
+# step_timing.py
+# Per-step phase timings (perf_counter based) recorded in every step result, and the end-of-run
+# "slowest steps / slowest locators" summary built from them.
+
+import functools
+import inspect
+import time
+from contextlib import contextmanager
+
+# Phases in execution order; each becomes a '<phase>_ms' column in the step results and reports.
+# snapshot is the one bulk read of a verification run (snapshot_assertions), kept apart from
+# locate because it covers every locator of the run, not the step's own element.
+PHASES = ('lookup', 'pre_wait', 'snapshot', 'locate', 'action', 'settle', 'screenshot', 'log')
+PHASE_COLUMNS = tuple(f"{phase}_ms" for phase in PHASES)
+TOTAL_COLUMN = 'total_ms'
+
+
+class StepTimer:
+    """
+    Accumulates the seconds one step spends in each phase. The total runs from construction to
+    columns(), so anything between the phases (e.g. building the result) is counted in it.
+    """
+    __slots__ = ('seconds', 'started')
+
+    def __init__(self):
+        self.seconds = dict.fromkeys(PHASES, 0.0)
+        self.started = time.perf_counter()
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.seconds[name] += time.perf_counter() - start
+
+    def add(self, name, seconds):
+        self.seconds[name] += seconds
+
+    def columns(self, total=None):
+        """
+        {'lookup_ms': ..., ..., 'total_ms': ...} in milliseconds, as stored in the step result.
+        total (seconds) replaces the wall-clock total, e.g. for steps that shared a batch.
+        """
+        row = {f"{phase}_ms": round(value * 1000, 3) for phase, value in self.seconds.items()}
+        if total is None:
+            total = time.perf_counter() - self.started
+        row[TOTAL_COLUMN] = round(total * 1000, 3)
+        return row
+
+
+def timed_locate(find_element):
+    """
+    Wrap a backend's _find_element so the time spent in it is added to the instance's
+    locate_seconds counter; process_step reads the counter around the action to split element
+    location from the action itself. Works for plain and async methods; nested calls (an override
+    calling super()._find_element, a retry calling itself) are counted once.
+    """
+    if inspect.iscoroutinefunction(find_element):
+        @functools.wraps(find_element)
+        async def async_wrapper(self, *args, **kwargs):
+            if self.__dict__.get('_locating'):
+                return await find_element(self, *args, **kwargs)
+            self._locating = True
+            start = time.perf_counter()
+            try:
+                return await find_element(self, *args, **kwargs)
+            finally:
+                self._locating = False
+                self.locate_seconds = getattr(self, 'locate_seconds', 0.0) + time.perf_counter() - start
+        return async_wrapper
+
+    @functools.wraps(find_element)
+    def wrapper(self, *args, **kwargs):
+        if self.__dict__.get('_locating'):
+            return find_element(self, *args, **kwargs)
+        self._locating = True
+        start = time.perf_counter()
+        try:
+            return find_element(self, *args, **kwargs)
+        finally:
+            self._locating = False
+            self.locate_seconds = getattr(self, 'locate_seconds', 0.0) + time.perf_counter() - start
+    return wrapper
+
+
+def summarize_step_timings(step_results, top=10):
+    """
+    Aggregate step results into {'steps', 'phases': {phase: total ms}, 'slowest_steps': [...],
+    'slowest_locators': [...]}. Locators are ranked by their mean element time (pre-wait, locate
+    and action), which is where slow or unstable selectors show up.
+    """
+    phases = dict.fromkeys(PHASES, 0.0)
+    timed = []
+    locators = {}
+    for step in step_results:
+        if step.get(TOTAL_COLUMN) is None:
+            continue
+        timed.append(step)
+        for phase in PHASES:
+            phases[phase] += step.get(f"{phase}_ms") or 0.0
+        xpath = step.get('xpath')
+        if xpath:
+            element_ms = sum(step.get(column) or 0.0 for column in ('pre_wait_ms', 'locate_ms', 'action_ms'))
+            entry = locators.setdefault(xpath, {'xpath': xpath, 'screen': step.get('screen'), 'field': step.get('field'),
+                                                'count': 0, 'total_ms': 0.0, 'max_ms': 0.0})
+            entry['count'] += 1
+            entry['total_ms'] += element_ms
+            entry['max_ms'] = max(entry['max_ms'], element_ms)
+    for entry in locators.values():
+        entry['mean_ms'] = entry['total_ms'] / entry['count']
+    slowest_steps = sorted(timed, key=lambda step: step[TOTAL_COLUMN], reverse=True)[:top]
+    slowest_locators = sorted(locators.values(), key=lambda entry: entry['mean_ms'], reverse=True)[:top]
+    return {'steps': len(timed), 'phases': phases, 'slowest_steps': slowest_steps, 'slowest_locators': slowest_locators}
+
+
+def format_timing_summary(summary):
+    """Multiline text of summarize_step_timings' result for the console and the execution log."""
+    if not summary['steps']:
+        return "Step timings: no timed steps"
+    total = sum(summary['phases'].values()) or 1.0
+    lines = [f"Step timings over {summary['steps']} step(s):"]
+    lines.append("  " + ", ".join(f"{phase} {ms / 1000:.2f}s ({ms / total:.0%})"
+                                  for phase, ms in summary['phases'].items()))
+    lines.append("  Slowest steps:")
+    for step in summary['slowest_steps']:
+        breakdown = ", ".join(f"{phase} {step.get(f'{phase}_ms') or 0:.1f}" for phase in PHASES
+                              if step.get(f"{phase}_ms"))
+        lines.append(f"    {step[TOTAL_COLUMN]:9.1f} ms  {step.get('testcasename')} #{step.get('dataset number')} "
+                     f"{step.get('screen')}/{step.get('field')} {step.get('action')} ({breakdown})")
+    lines.append("  Slowest locators (mean pre-wait + locate + action):")
+    for entry in summary['slowest_locators']:
+        lines.append(f"    {entry['mean_ms']:9.1f} ms  max {entry['max_ms']:.1f} ms  x{entry['count']}  "
+                     f"{entry['screen']}/{entry['field']}  {entry['xpath']}")
+    return "\n".join(lines)
@@ -0,0 +1,394 @@
+# table_extraction.py
+# Whole-table reads and paginated row search for the FindTableRow action. One in-page script
+# (READ_TABLE_JS) returns every row of an HTML table or ARIA / Angular Material grid, scrolling
+# virtualized grids (ag-grid style aria-rowindex rows) to collect the rows they do not render, and
+# one more (TURN_PAGE_JS) clicks "next" and waits for the table content to change. Step data such as
+# "$$acc_no = Account No where Customer = John Smith" finds the first row where Customer is
+# John Smith, from the page the table is on onwards, and stores its Account No in $$acc_no.
+
+import time
+
+import pandas as pd
+
+from modules.form_fill import FIND_ELEMENT_JS
+from modules.globals import global_dict
+
+DEFAULT_TABLE_SEARCH = {
+    # Pagination control clicked to reach the next page (XPath or CSS)
+    'next_page_selector': "//a[contains(@class, 'next') or contains(text(), 'Next')] | "
+                          "//button[contains(@class, 'paginator-navigation-next') or @aria-label='Next page']",
+    'max_pages': 50,        # pages searched before giving up
+    'page_timeout': 10,     # seconds to wait for the table to appear, and to change after clicking next
+    'search_timeout': 60,   # seconds the whole search may take, over all pages
+    'read_timeout': 20,     # seconds one in-page table read may take, waiting for the table and
+                            # scrolling a virtualized grid included; below Selenium's 30 s script timeout
+}
+
+_TABLE_HELPERS_JS = FIND_ELEMENT_JS + """    var TABLE = 'table, [role="grid"], [role="treegrid"], [role="table"], mat-table';
+    var ROW = 'tr, [role="row"], mat-header-row, mat-row';
+    function locateTable(selector) {
+        var el;
+        try { el = find(selector); } catch (e) { el = null; }
+        if (!el || el.matches(TABLE)) return el;
+        return el.querySelector(TABLE);
+    }
+    function wait(ms) {
+        return new Promise(function (resolve) { setTimeout(resolve, ms); });
+    }
+"""
+
+# ([selector, waitMs, budgetMs]) -> {headers: [...], rows: [[...], ...], virtualized, truncated} for
+# the table at selector (or the first table inside it), or null when none appears within waitMs.
+# Cell text is whitespace-collapsed innerText. The last header row gives the headers. Rows with
+# aria-rowindex / row-index are merged by that index (pinned and centre containers), and their grid
+# is scrolled top to bottom when its viewport scrolls, then restored. The whole call stops scrolling
+# after budgetMs; truncated is then true and the rows collected so far are returned.
+READ_TABLE_JS = """
+async (args) => {
+""" + _TABLE_HELPERS_JS + """    var CELL = 'th, td, [role="columnheader"], [role="rowheader"], [role="gridcell"], [role="cell"], mat-header-cell, mat-cell';
+    var selector = args[0], started = Date.now(), budgetEnd = started + args[2];
+    var table = locateTable(selector);
+    while (!table && Date.now() - started < args[1]) {
+        await wait(100);
+        table = locateTable(selector);
+    }
+    if (!table) return null;
+    function text(el) {
+        return (el.innerText || el.textContent || '').replace(/\\u00a0/g, ' ').replace(/\\s+/g, ' ').trim();
+    }
+    function rows() {
+        return Array.prototype.filter.call(table.querySelectorAll(ROW), function (row) {
+            return row.closest(TABLE) === table;
+        });
+    }
+    function cells(row) {
+        return Array.prototype.filter.call(row.querySelectorAll(CELL), function (cell) {
+            return cell.closest(ROW) === row;
+        });
+    }
+    function isHeader(row, rowCells) {
+        if (row.tagName === 'MAT-HEADER-ROW' || (row.parentElement && row.parentElement.tagName === 'THEAD')) return true;
+        return rowCells.length > 0 && rowCells.every(function (cell) {
+            return cell.tagName === 'TH' || cell.tagName === 'MAT-HEADER-CELL' || cell.getAttribute('role') === 'columnheader';
+        });
+    }
+    function rowKey(row) {
+        return row.getAttribute('aria-rowindex') || row.getAttribute('row-index');
+    }
+    var headers = [], keyed = {}, plain = [], first = true;
+    function collect() {
+        var groups = {}, order = [];
+        rows().forEach(function (row, i) {
+            var rowCells = cells(row), header = isHeader(row, rowCells), key = rowKey(row);
+            var id = (header ? 'h' : 'b') + (key !== null ? key : '#' + i);
+            if (!groups[id]) {
+                groups[id] = {header: header, key: key, cells: []};
+                order.push(id);
+            }
+            rowCells.forEach(function (cell) { groups[id].cells.push(text(cell)); });
+        });
+        order.forEach(function (id) {
+            var group = groups[id];
+            if (group.header) {
+                if (first) headers = group.cells;
+            } else if (group.key !== null) {
+                if (!(group.key in keyed)) keyed[group.key] = group.cells;
+            } else if (first) {
+                plain.push(group.cells);
+            }
+        });
+        first = false;
+    }
+    function scroller() {
+        var keyedRow = rows().filter(function (row) { return rowKey(row) !== null && !isHeader(row, cells(row)); })[0];
+        for (var el = keyedRow && keyedRow.parentElement; el; el = el.parentElement) {
+            var overflow = window.getComputedStyle(el).overflowY;
+            if ((overflow === 'auto' || overflow === 'scroll') && el.scrollHeight > el.clientHeight + 1) return el;
+            if (el === table) break;
+        }
+        return null;
+    }
+    collect();
+    var viewport = scroller(), truncated = false;
+    if (viewport) {
+        var start = viewport.scrollTop, stride = Math.max(1, Math.floor(viewport.clientHeight * 0.9));
+        viewport.scrollTop = 0;
+        truncated = true;
+        for (var turns = 0; turns < 1000 && Date.now() < budgetEnd; turns++) {
+            await wait(60);
+            collect();
+            var before = viewport.scrollTop;
+            if (before + viewport.clientHeight >= viewport.scrollHeight - 1) { truncated = false; break; }
+            viewport.scrollTop = before + stride;
+            if (viewport.scrollTop === before) { truncated = false; break; }
+        }
+        viewport.scrollTop = start;
+    }
+    var keys = Object.keys(keyed).sort(function (a, b) { return Number(a) - Number(b); });
+    return {
+        headers: headers,
+        rows: keys.map(function (key) { return keyed[key]; }).concat(plain),
+        virtualized: viewport !== null,
+        truncated: truncated
+    };
+}
+"""
+
+# ([tableSelector, nextSelector, timeoutMs]) -> 'advanced' once the table text changed after
+# clicking next and then stayed the same for 150 ms, 'last' when there is no enabled and visible
+# next control, 'unchanged' when the table did not change in time, 'missing' without a table.
+TURN_PAGE_JS = """
+async (args) => {
+""" + _TABLE_HELPERS_JS + """    var table = locateTable(args[0]), next;
+    if (!table) return 'missing';
+    try { next = find(args[1]); } catch (e) { next = null; }
+    if (!next || !next.getClientRects().length || next.disabled
+            || next.closest('.disabled, [aria-disabled="true"], [disabled]')) {
+        return 'last';
+    }
+    var before = table.innerText, deadline = Date.now() + args[2], seen = null, seenAt = 0;
+    next.click();
+    while (Date.now() < deadline) {
+        await wait(50);
+        var current = locateTable(args[0]);
+        var content = current ? current.innerText : null;
+        if (content === null || content === before) continue;
+        if (content !== seen) {
+            seen = content;
+            seenAt = Date.now();
+        } else if (Date.now() - seenAt >= 150) {
+            return 'advanced';
+        }
+    }
+    return seen !== null ? 'advanced' : 'unchanged';
+}
+"""
+
+
+def selenium_async_script(script):
+    """Wrap one of the async in-page functions above for WebDriver's execute_async_script(script, arg)."""
+    return ("var done = arguments[arguments.length - 1];\n(" + script.strip() + ")(arguments[0])"
+            ".then(done, function (e) { done({error: String(e)}); });")
+
+
+class TableQuery:
+    """
+    A parsed FindTableRow step: the row where match_column equals match_value, and optionally
+    the column whose value is stored in variable ($$name).
+    """
+    __slots__ = ('source', 'variable', 'column', 'match_column', 'match_value')
+
+    def __init__(self, source, match_column, match_value, variable=None, column=None):
+        self.source = source
+        self.match_column = match_column
+        self.match_value = match_value
+        self.variable = variable
+        self.column = column
+
+    def __str__(self):
+        return self.source
+
+    def __repr__(self):
+        return f"TableQuery({self.source!r})"
+
+
+def parse_table_query(value):
+    """
+    Parse FindTableRow data: "[$$var = <column> where] <match column> = <value>".
+    Raises ValueError for anything else.
+    """
+    text = str(value or '').strip()
+    lowered = text.lower()
+    head, tail = '', text
+    if ' where ' in lowered:
+        split_at = lowered.index(' where ')
+        head, tail = text[:split_at].strip(), text[split_at + len(' where '):]
+    elif lowered.startswith('where '):
+        tail = text[len('where '):]
+    match_column, equals, match_value = tail.partition('=')
+    if not equals or not match_column.strip():
+        raise ValueError(f"Invalid table query '{text}'. Use '$$var = <column> where <match column> = <value>' "
+                         f"or '<match column> = <value>'.")
+    variable = column = None
+    if head:
+        variable, equals, column = head.partition('=')
+        variable, column = variable.strip(), column.strip()
+        if not equals or not variable.startswith('$$') or not column:
+            raise ValueError(f"Invalid table query '{text}': the part before 'where' must be '$$var = <column>'.")
+    return TableQuery(text, match_column.strip(), match_value.strip(), variable, column)
+
+
+_table_search = None
+
+
+def get_table_search():
+    """Table search settings from config 'table_search' merged over the defaults (read once)."""
+    global _table_search
+    if _table_search is None:
+        from modules.middleware import get_config
+        settings = dict(DEFAULT_TABLE_SEARCH)
+        settings.update(get_config().get('table_search') or {})
+        _table_search = settings
+    return _table_search
+
+
+def table_frame(table):
+    """DataFrame of a READ_TABLE_JS result; unnamed columns become 'Column <n>', short rows are padded with ''."""
+    rows = table.get('rows') or []
+    width = max([len(table.get('headers') or [])] + [len(row) for row in rows])
+    headers = list(table.get('headers') or [])
+    headers = [header or f"Column {i + 1}" for i, header in enumerate(headers)]
+    headers += [f"Column {i + 1}" for i in range(len(headers), width)]
+    return pd.DataFrame([list(row) + [''] * (width - len(row)) for row in rows], columns=headers, dtype=str)
+
+
+def _normalize(text):
+    """Text as table names and values are compared: case-folded, whitespace trimmed and collapsed."""
+    return ' '.join(str(text).split()).lower()
+
+
+def _column(frame, name):
+    """Frame column matching name, ignoring case and surrounding/repeated whitespace."""
+    wanted = _normalize(name)
+    for column in frame.columns:
+        if _normalize(column) == wanted:
+            return column
+    raise ValueError(f"Column '{name}' not found in table; columns are: {', '.join(map(str, frame.columns))}")
+
+
+def find_row(frame, query):
+    """
+    First row (a Series) whose match column equals the query's value, or None. Like column names,
+    values are compared ignoring case and surrounding/repeated whitespace.
+    """
+    match_column = _column(frame, query.match_column)
+    if query.column:
+        _column(frame, query.column)
+    matches = frame[frame[match_column].map(_normalize) == _normalize(query.match_value)]
+    return None if matches.empty else matches.iloc[0]
+
+
+def _store_match(actions, query, value, page, selector, reporting):
+    message = f"Found row where {query.match_column} = '{query.match_value}' on page {page} of table {selector}"
+    if query.variable:
+        # The async engine keeps each dataset's $$ values on its actions object
+        store = getattr(actions, 'variables', None)
+        (global_dict if store is None else store)[query.variable] = value
+        message += f"; stored {query.column} '{value}' in {query.variable}"
+    reporting.log_info(message)
+    return True, message
+
+
+def _search_page(actions, query, table, page, selector, reporting):
+    """(done, result) for one page read: done is True once the search found the row or cannot go on."""
+    if not table or table.get('error'):
+        error = table.get('error') if table else f"Table not found: {selector}"
+        return True, _fail(reporting, f"Failed to read table: {error}")
+    if table.get('truncated'):
+        reporting.log_info(f"Virtualized grid {selector} was only partly read on page {page}: "
+                           f"its {get_table_search()['read_timeout']}s read time limit was reached")
+    frame = table_frame(table)
+    try:
+        row = find_row(frame, query)
+    except ValueError as e:
+        return True, _fail(reporting, str(e))
+    if row is None:
+        return False, None
+    value = row[_column(frame, query.column)] if query.column else None
+    return True, _store_match(actions, query, value, page, selector, reporting)
+
+
+def _not_found(reporting, query, selector, pages, turned):
+    message = f"No row where {query.match_column} = '{query.match_value}' in table {selector} after {pages} page(s)"
+    if turned == 'unchanged':
+        message += " (the table did not change after clicking next)"
+    elif turned == 'timeout':
+        message += f" (the {get_table_search()['search_timeout']}s search time limit was reached)"
+    return _fail(reporting, message)
+
+
+def _fail(reporting, message):
+    reporting.log_error(message)
+    return False, message
+
+
+def _page_timeout(settings, deadline):
+    """Seconds the next page turn may wait: page_timeout, cut to what is left of the search; None once it is used up."""
+    remaining = deadline - time.perf_counter()
+    if remaining <= 0:
+        return None
+    return min(float(settings['page_timeout']), remaining)
+
+
+def _first_read_wait(settings, deadline):
+    """Seconds the first read may wait for the table to appear: page_timeout, within the search and read limits."""
+    return max(0.0, min(float(settings['page_timeout']), float(settings['read_timeout']),
+                        deadline - time.perf_counter()))
+
+
+def _prepare(actions, data, reporting):
+    """(query, None) for valid step data, with a stored $$ match value substituted, or (None, failure result)."""
+    try:
+        query = parse_table_query(data)
+    except ValueError as e:
+        return None, _fail(reporting, str(e))
+    store = getattr(actions, 'variables', None)
+    store = global_dict if store is None else store
+    if query.match_value in store:
+        query.match_value = str(store[query.match_value]).strip()
+    return query, None
+
+
+def search_table(actions, selector, data, reporting):
+    """
+    Read the table at selector page by page (actions.read_table / actions.next_table_page) until a
+    row matches the query in data, storing the requested column. The first read waits up to
+    page_timeout for the table to appear, as element actions wait for their element. Gives up after
+    max_pages pages or search_timeout seconds, whichever comes first. Returns (success, message).
+    """
+    query, failure = _prepare(actions, data, reporting)
+    if failure:
+        return failure
+    settings = get_table_search()
+    deadline = time.perf_counter() + float(settings['search_timeout'])
+    turned = None
+    for page in range(1, int(settings['max_pages']) + 1):
+        # Only the first read waits for the table to appear; later pages were waited for by the page turn
+        wait = _first_read_wait(settings, deadline) if page == 1 else 0
+        table = actions.read_table(selector, wait, float(settings['read_timeout']))
+        done, result = _search_page(actions, query, table, page, selector, reporting)
+        if done:
+            return result
+        page_timeout = _page_timeout(settings, deadline)
+        if page_timeout is None:
+            turned = 'timeout'
+            break
+        turned = actions.next_table_page(selector, settings['next_page_selector'], page_timeout)
+        if turned != 'advanced':
+            break
+    return _not_found(reporting, query, selector, page, turned)
+
+
+async def search_table_async(actions, selector, data, reporting):
+    """search_table for the async engine, whose read_table / next_table_page are coroutines."""
+    query, failure = _prepare(actions, data, reporting)
+    if failure:
+        return failure
+    settings = get_table_search()
+    deadline = time.perf_counter() + float(settings['search_timeout'])
+    turned = None
+    for page in range(1, int(settings['max_pages']) + 1):
+        # Only the first read waits for the table to appear; later pages were waited for by the page turn
+        wait = _first_read_wait(settings, deadline) if page == 1 else 0
+        table = await actions.read_table(selector, wait, float(settings['read_timeout']))
+        done, result = _search_page(actions, query, table, page, selector, reporting)
+        if done:
+            return result
+        page_timeout = _page_timeout(settings, deadline)
+        if page_timeout is None:
+            turned = 'timeout'
+            break
+        turned = await actions.next_table_page(selector, settings['next_page_selector'], page_timeout)
+        if turned != 'advanced':
+            break
+    return _not_found(reporting, query, selector, page, turned)
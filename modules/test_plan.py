@@ -0,0 +1,415 @@
+# test_plan.py
+# Compiles the driver workbook into an in-memory test plan so execution never re-reads Excel.
+
+import os
+import re
+import shutil
+import tempfile
+from collections.abc import Mapping
+import openpyxl
+import pandas as pd
+from modules.locator_template import LocatorTemplate
+from modules.wait_conditions import parse_wait_cell
+from modules.action_registry import resolve_action
+
+CONFIG_FOLDER = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'config')
+EXCEL_FILE = os.path.join(CONFIG_FOLDER, 'testcase_driver_data_sheet.xlsx')
+
+DRIVER_SHEET = 'DriverSheet'
+COMMON_SHEET = 'CommonSheet'
+COMPONENTS_SHEET = 'Components'
+# Components-sheet action that inlines another component; the Field column names it
+RUN_COMPONENT_ACTION = 'runcomponent'
+
+
+def _cell_text(value):
+    """Return a stripped string for a cell value, '' for empty cells."""
+    return str(value).strip() if value else ''
+
+
+def parse_datasheet_refs(ref_str):
+    """
+    Parses a string like 'DataSheet!B4:DataSheet!B6' and returns (sheet_name, [row_numbers]).
+    Supports single cell or range. Returns (sheet_name, [row_numbers]).
+    """
+    if not ref_str:
+        return None, []
+    # Example: DataSheet!B4:DataSheet!B6
+    refs = ref_str.split(":")
+    row_nums = []
+    sheet_name = None
+    for ref in refs:
+        m = re.match(r"([\w\s]+)!([A-Z]+)(\d+)", ref)
+        if m:
+            sheet_name = m.group(1)
+            row_nums.append(int(m.group(3)))
+    if len(row_nums) == 2:
+        # Range, fill in-between
+        row_nums = list(range(row_nums[0], row_nums[1]+1))
+    return sheet_name, row_nums
+
+
+def read_sheet_rows(worksheet):
+    """Read a worksheet once and return (headers, [row tuples]) with rows starting at sheet row 2."""
+    rows = list(worksheet.iter_rows(values_only=True))
+    if not rows:
+        return [], []
+    return list(rows[0]), rows[1:]
+
+
+def read_workbook(excel_file=EXCEL_FILE, sheet_names=None):
+    """
+    Load every sheet (or only sheet_names) of the workbook in a single openpyxl pass.
+    The workbook is read from a temporary copy so it can stay open in Excel.
+    Returns {sheet_name: (headers, [row tuples])}.
+    """
+    tmp = tempfile.NamedTemporaryFile(delete=False, suffix='.xlsx')
+    tmp.close()
+    shutil.copy2(excel_file, tmp.name)
+    try:
+        wb = openpyxl.load_workbook(tmp.name, data_only=True, read_only=True)
+        try:
+            return {name: read_sheet_rows(wb[name]) for name in wb.sheetnames
+                    if sheet_names is None or name in sheet_names}
+        finally:
+            wb.close()
+    finally:
+        os.unlink(tmp.name)
+
+
+def parse_driver_sheet(headers, rows):
+    """
+    Index the DriverSheet.
+    Returns (testcase_datarefs, testcase_steps) where testcase_steps keeps every
+    Execute == 'Y' row per testcase in sheet order.
+    Only testcases whose first occurrence has Execute == 'Y' get data references.
+    """
+    col_idx = {h: i for i, h in enumerate(headers)}
+    if 'TestCaseName' not in col_idx or 'TestDataSheetReference' not in col_idx or 'Execute' not in col_idx:
+        raise ValueError("Required columns not found in DriverSheet.")
+
+    def cell(row, name):
+        idx = col_idx.get(name)
+        if idx is None or idx >= len(row):
+            return ''
+        return _cell_text(row[idx])
+
+    get_pass_screenshot_col = None
+    for name in col_idx:
+        if str(name).strip().lower() == 'getpassscreenshot':
+            get_pass_screenshot_col = name
+            break
+
+    testcase_first_execute = {}
+    testcase_datarefs = {}
+    testcase_steps = {}
+    for row in rows:
+        testcase = cell(row, 'TestCaseName')
+        execute = cell(row, 'Execute').upper()
+        dataref = cell(row, 'TestDataSheetReference')
+        if testcase and execute == 'Y':
+            testcase_steps.setdefault(testcase, []).append({
+                'screen': cell(row, 'Screen'),
+                'field': cell(row, 'Field'),
+                'action': cell(row, 'Action'),
+                'testcase_description': cell(row, 'TestCaseDescription'),
+                'validation': cell(row, 'Validation'),
+                'expected_validation': cell(row, 'ExpectedValidation'),
+                'component_name': cell(row, 'ComponentName'),
+                'get_pass_screenshot': bool(get_pass_screenshot_col) and cell(row, get_pass_screenshot_col).upper() == 'Y',
+            })
+        if not testcase or not dataref:
+            continue
+        # Only process testcases where the first occurrence has Execute == 'Y'
+        if testcase not in testcase_first_execute:
+            testcase_first_execute[testcase] = execute
+            if execute != 'Y':
+                continue  # Skip this testcase entirely if first occurrence is not Y
+        if testcase_first_execute[testcase] != 'Y':
+            continue  # Skip all subsequent rows for this testcase if first was not Y
+        sheet, row_nums = parse_datasheet_refs(dataref)
+        testcase_datarefs.setdefault(testcase, [])
+        if sheet and row_nums:
+            testcase_datarefs[testcase].append((sheet, row_nums))
+    return testcase_datarefs, testcase_steps
+
+
+def parse_common_sheet(headers, rows):
+    """
+    Build the CommonSheet lookup: {(Screen, Field): (LocatorTemplate, wait)}.
+    wait is the parsed WaitTimeInSec cell: seconds to sleep or a WaitCondition (see wait_conditions);
+    text that is not a wait is kept as an 'invalid' WaitCondition for preflight to report.
+    """
+    locators = {}
+    for row in rows:
+        if len(row) < 3:
+            continue
+        screen, field, xpath = row[:3]
+        wait_time = parse_wait_cell(row[3]) if len(row) > 3 else 0
+        if screen and field and xpath:
+            locators[(str(screen).strip(), str(field).strip())] = (LocatorTemplate(str(xpath).strip()), wait_time)
+    return locators
+
+
+def parse_components_sheet(headers, rows):
+    """
+    Index the Components sheet: {ComponentName: [step dict, ...]}.
+    Handles merged cells by forward-filling the ComponentName.
+    """
+    components = {}
+    last_component = None
+    for row in rows:
+        comp_val = row[0] if row else None
+        if comp_val is not None and str(comp_val).strip() != '':
+            last_component = str(comp_val).strip()
+        if last_component is None:
+            continue
+        step = {headers[i]: (row[i] if i < len(row) else None) for i in range(len(headers))}
+        step[headers[0]] = last_component  # Ensure ComponentName is set
+        components.setdefault(last_component, []).append(step)
+    return components
+
+
+def expand_components(components):
+    """
+    Flatten every component into its executable steps, inlining nested components.
+    A Components row with Action 'RunComponent' calls the component named in its Field column.
+    Raises ValueError on unknown nested components and on cycles (A -> B -> A).
+    Returns {ComponentName: [step dict, ...]} with screen/field/action/description/validation keys.
+    """
+    expanded = {}
+
+    def expand(name, path):
+        if name in expanded:
+            return expanded[name]
+        if name in path:
+            raise ValueError(f"Component cycle detected: {' -> '.join(path + [name])}")
+        steps = []
+        for comp_step in components[name]:
+            action = _cell_text(comp_step.get('Action'))
+            field = _cell_text(comp_step.get('Field'))
+            if action.lower() == RUN_COMPONENT_ACTION:
+                if field not in components:
+                    raise ValueError(f"Component '{name}' calls unknown component '{field}'")
+                steps.extend(expand(field, path + [name]))
+                continue
+            steps.append({
+                'screen': _cell_text(comp_step.get('Screen')),
+                'field': field,
+                'action': action,
+                'testcase_description': _cell_text(comp_step.get('TestCaseDescription')),
+                'validation': _cell_text(comp_step.get('Validation')),
+                'expected_validation': _cell_text(comp_step.get('ExpectedValidation')),
+            })
+        expanded[name] = steps
+        return steps
+
+    for name in components:
+        expand(name, [])
+    return expanded
+
+
+def parse_data_sheet(headers, rows):
+    """
+    Load a data sheet as a columnar DataFrame indexed by sheet row number (first data row is 2).
+    Only the first occurrence of each named header becomes a column; cells keep their raw values.
+    """
+    columns = []
+    positions = []
+    for idx, header in enumerate(headers):
+        if header is not None and header not in columns:
+            columns.append(header)
+            positions.append(idx)
+    data = [[row[i] if i < len(row) else None for i in positions] for row in rows]
+    return pd.DataFrame(data, columns=columns, index=range(2, len(rows) + 2), dtype=object)
+
+
+_EMPTY_LOCATOR = LocatorTemplate('')
+
+
+class BoundDatasets(Mapping):
+    """
+    Result of TestPlan.bind_datasets: per-step columns of bound (xpath, data) values.
+    Step dicts for a row are only materialized when that row is looked up.
+    """
+    def __init__(self, row_nums, templates, bound_columns):
+        self._positions = {row_num: position for position, row_num in enumerate(row_nums)}
+        self._templates = templates
+        self._bound_columns = bound_columns
+
+    def __getitem__(self, row_num):
+        position = self._positions[row_num]
+        return [
+            dict(template, xpath=xpaths[position], data=data_values[position])
+            for template, (xpaths, data_values) in zip(self._templates, self._bound_columns)
+        ]
+
+    def __iter__(self):
+        return iter(self._positions)
+
+    def __len__(self):
+        return len(self._positions)
+
+
+class TestPlan:
+    """
+    Fully indexed, in-memory view of the driver workbook.
+    Built once per run; execution asks it for resolved steps instead of touching Excel.
+    """
+    def __init__(self, sheets, driver_sheet=DRIVER_SHEET):
+        if driver_sheet not in sheets:
+            raise ValueError(f"Sheet '{driver_sheet}' not found in Excel file.")
+        if COMMON_SHEET not in sheets:
+            raise ValueError(f"Sheet '{COMMON_SHEET}' not found in Excel file.")
+        components = None
+        if COMPONENTS_SHEET in sheets:
+            # Components are expanded once here so execution never walks the sheet
+            components = expand_components(parse_components_sheet(*sheets[COMPONENTS_SHEET]))
+        data_sheets = {
+            name: parse_data_sheet(*content)
+            for name, content in sheets.items()
+            if name not in (driver_sheet, COMMON_SHEET, COMPONENTS_SHEET)
+        }
+        self._setup(sheets[driver_sheet], parse_common_sheet(*sheets[COMMON_SHEET]), components, data_sheets)
+
+    @classmethod
+    def from_parts(cls, driver_sheet, locators, components, data_sheets):
+        """
+        Build a plan from DriverSheet content (headers, rows) and already parsed shared parts.
+        data_sheets may be any mapping of sheet name -> DataFrame, including a lazily loading one.
+        """
+        plan = cls.__new__(cls)
+        plan._setup(driver_sheet, locators, components, data_sheets)
+        return plan
+
+    def _setup(self, driver_sheet, locators, components, data_sheets):
+        self.testcase_datarefs, self.testcase_steps = parse_driver_sheet(*driver_sheet)
+        self.locators = locators
+        self.components = components
+        self.data_sheets = data_sheets
+        self.check_locator_placeholders()
+
+    def check_locator_placeholders(self):
+        """
+        Fail at compile time when a locator placeholder names a column that is missing
+        from a data sheet the testcase is bound to. All offending steps are reported at once.
+        """
+        problems = []
+        for testcase, refs in self.testcase_datarefs.items():
+            templates = self.get_step_templates(testcase)
+            for sheet in dict.fromkeys(sheet for sheet, _ in refs):
+                frame = self.data_sheets.get(sheet)
+                if frame is None:
+                    continue
+                for template in templates:
+                    for key in template['locator'].missing_columns(frame.columns):
+                        problems.append(
+                            f"TestCase '{testcase}' {template['screen']}/{template['field']}: locator placeholder "
+                            f"<<{key}>> has no column in data sheet '{sheet}'")
+        if problems:
+            raise ValueError("Invalid locator placeholders:\n  " + "\n  ".join(dict.fromkeys(problems)))
+
+    def _get_frame(self, sheet):
+        frame = self.data_sheets.get(sheet)
+        if frame is None:
+            raise ValueError(f"Data sheet '{sheet}' not found in Excel file.")
+        return frame
+
+    def get_data_value(self, sheet, row_num, column):
+        """Return the raw cell value of a data sheet row/column, or None when absent."""
+        frame = self.data_sheets.get(sheet)
+        if frame is None or column not in frame.columns or row_num not in frame.index:
+            return None
+        return frame.at[row_num, column]
+
+    def has_column(self, sheet, column):
+        frame = self.data_sheets.get(sheet)
+        return frame is not None and column in frame.columns
+
+    def is_row_enabled(self, sheet, row_num):
+        """True unless the data sheet has an Execute column whose value for this row is not 'Y'."""
+        frame = self._get_frame(sheet)
+        for header in frame.columns:
+            if str(header).strip().lower() == 'execute':
+                return str(self.get_data_value(sheet, row_num, header)).strip().upper() == 'Y'
+        return True
+
+    def is_headless(self, sheet, row_num):
+        """Headless unless the data sheet's 'HeadLess' column says otherwise for this row."""
+        if not self.has_column(sheet, 'HeadLess'):
+            return True
+        return str(self.get_data_value(sheet, row_num, 'HeadLess')).strip().upper() == 'T'
+
+    def get_step_templates(self, testcase):
+        """
+        Dataset-independent steps of a testcase: components inlined and locators looked up.
+        'locator' is the step's LocatorTemplate; 'xpath' is its unbound source text; 'handler' is the
+        action's ActionSpec from action_registry (None for an unknown action).
+        """
+        templates = []
+        for driver_step in self.testcase_steps.get(testcase, []):
+            component_name = driver_step['component_name']
+            if component_name and self.components is not None:
+                for comp_step in self.components.get(component_name, []):
+                    locator, wait_time = self.locators.get((comp_step['screen'], comp_step['field']), (_EMPTY_LOCATOR, 0))
+                    templates.append(dict(
+                        comp_step,
+                        handler=resolve_action(comp_step['action']),
+                        xpath=locator.source,
+                        locator=locator,
+                        wait_time=wait_time,
+                        get_pass_screenshot=driver_step['get_pass_screenshot'],
+                    ))
+            else:
+                locator, wait_time = self.locators.get((driver_step['screen'], driver_step['field']), (_EMPTY_LOCATOR, 0))
+                templates.append({
+                    'screen': driver_step['screen'],
+                    'field': driver_step['field'],
+                    'action': driver_step['action'],
+                    'handler': resolve_action(driver_step['action']),
+                    'xpath': locator.source,
+                    'locator': locator,
+                    'wait_time': wait_time,
+                    'get_pass_screenshot': driver_step['get_pass_screenshot'],
+                    'testcase_description': driver_step['testcase_description'],
+                    'validation': driver_step['validation'],
+                    'expected_validation': driver_step['expected_validation'],
+                })
+        return templates
+
+    def bind_datasets(self, testcase, sheet, row_nums):
+        """
+        Bind a testcase's step template to many data sheet rows in one columnar pass.
+        Returns a BoundDatasets mapping {row_number: [step dict, ...]}; each step carries screen,
+        field, action, xpath, data, wait_time, get_pass_screenshot and the description/validation texts.
+        """
+        row_nums = list(row_nums)
+        templates = self.get_step_templates(testcase)
+        frame = self._get_frame(sheet).reindex(row_nums)
+        frame = frame.astype(object).where(frame.notna(), None)
+        # Cell text per column, computed once for all requested rows
+        text_columns = {}
+
+        def column_text(column):
+            if column not in text_columns:
+                text_columns[column] = [str(value) for value in frame[column].tolist()]
+            return text_columns[column]
+
+        blank = [''] * len(row_nums)
+        bound_columns = []
+        for template in templates:
+            field = template['field']
+            data_values = column_text(field) if field in frame.columns else blank
+            xpaths = template['locator'].render_columns(column_text, len(row_nums))
+            bound_columns.append((xpaths, data_values))
+
+        return BoundDatasets(row_nums, templates, bound_columns)
+
+    def resolve_steps(self, testcase, sheet, row_num):
+        """Return the executable steps of a testcase bound to one data sheet row."""
+        return self.bind_datasets(testcase, sheet, [row_num])[row_num]
+
+
+def compile_test_plan(excel_file=EXCEL_FILE, driver_sheet=DRIVER_SHEET):
+    """Read the workbook exactly once and return its compiled TestPlan."""
+    return TestPlan(read_workbook(excel_file), driver_sheet=driver_sheet)
@@ -0,0 +1,169 @@
+# wait_conditions.py
+# Declarative pre-step waits for the CommonSheet WaitTimeInSec column. A number still means a fixed
+# sleep; text such as "visible", "clickable", "text=Welcome", "url contains /home", "network idle"
+# or "element gone" (optionally "| <timeout seconds>") is polled until it holds or times out.
+
+import asyncio
+import time
+
+DEFAULT_CONDITION_TIMEOUT = 10
+POLL_INTERVAL = 0.1
+
+# Conditions that need the step's locator
+ELEMENT_CONDITIONS = ('visible', 'clickable', 'text', 'gone')
+
+_KEYWORDS = {
+    'visible': 'visible',
+    'clickable': 'clickable',
+    'network idle': 'network_idle',
+    'networkidle': 'network_idle',
+    'element gone': 'gone',
+    'gone': 'gone',
+}
+
+
+# Kind of a cell that did not parse; its argument is the parse error
+INVALID = 'invalid'
+
+
+class WaitCondition:
+    """
+    A parsed wait condition: kind is one of visible, clickable, text, url, network_idle, gone;
+    argument is the expected text / URL fragment; timeout is None for the configured default.
+    Kind 'invalid' keeps a cell that did not parse, with the error as argument (see parse_wait_cell).
+    """
+    __slots__ = ('source', 'kind', 'argument', 'timeout')
+
+    def __init__(self, source, kind, argument=None, timeout=None):
+        self.source = source
+        self.kind = kind
+        self.argument = argument
+        self.timeout = timeout
+
+    @property
+    def needs_element(self):
+        return self.kind in ELEMENT_CONDITIONS
+
+    def __str__(self):
+        return self.source
+
+    def __repr__(self):
+        return f"WaitCondition({self.source!r})"
+
+    def __eq__(self, other):
+        return isinstance(other, WaitCondition) and other.source == self.source
+
+    def __hash__(self):
+        return hash(self.source)
+
+
+def parse_wait_value(value):
+    """
+    Parse a WaitTimeInSec cell: empty -> 0, a number -> float seconds, anything else -> WaitCondition.
+    Raises ValueError for text that is neither.
+    """
+    if value is None:
+        return 0
+    if isinstance(value, (int, float)):
+        return float(value)
+    text = str(value).strip()
+    if not text:
+        return 0
+    try:
+        return float(text)
+    except ValueError:
+        pass
+    body, timeout = text, None
+    if '|' in text:
+        head, _, tail = text.rpartition('|')
+        try:
+            body, timeout = head.strip(), float(tail)
+        except ValueError:
+            pass
+    lowered = body.lower()
+    if lowered in _KEYWORDS:
+        return WaitCondition(text, _KEYWORDS[lowered], timeout=timeout)
+    if lowered.startswith('text='):
+        return WaitCondition(text, 'text', body[len('text='):], timeout)
+    if lowered.startswith('url contains '):
+        return WaitCondition(text, 'url', body[len('url contains '):].strip(), timeout)
+    raise ValueError(f"Unknown wait condition '{text}'. Use a number of seconds, visible, clickable, "
+                     f"text=..., url contains ..., network idle or element gone (optionally '| seconds').")
+
+
+def parse_wait_cell(value):
+    """
+    parse_wait_value for compiling a plan: text that is not a wait becomes an 'invalid'
+    WaitCondition carrying the error instead of raising, so preflight can report it against
+    the step and the step fails when it runs.
+    """
+    try:
+        return parse_wait_value(value)
+    except ValueError as e:
+        return WaitCondition(str(value).strip(), INVALID, str(e))
+
+
+_default_timeout = None
+
+
+def get_default_condition_timeout():
+    """Timeout for conditions without '| seconds', from config 'wait_condition_timeout' (read once)."""
+    global _default_timeout
+    if _default_timeout is None:
+        from modules.middleware import get_config
+        _default_timeout = float(get_config().get('wait_condition_timeout', DEFAULT_CONDITION_TIMEOUT))
+    return _default_timeout
+
+
+def _condition_timeout(condition, default_timeout):
+    return condition.timeout if condition.timeout is not None else default_timeout
+
+
+def _timeout_message(condition, selector, elapsed):
+    target = f" for {selector}" if condition.needs_element and selector else ''
+    return f"Wait condition '{condition}'{target} not met within {elapsed:.1f}s"
+
+
+def wait_for_condition(actions, condition, selector, default_timeout=DEFAULT_CONDITION_TIMEOUT, poll_interval=POLL_INTERVAL):
+    """
+    Poll actions.check_wait_condition(condition, selector) until it returns True.
+    Returns (True, elapsed_seconds) or (False, error_message).
+    """
+    if condition.kind == INVALID:
+        return False, condition.argument
+    timeout = _condition_timeout(condition, default_timeout)
+    start = time.perf_counter()
+    while True:
+        try:
+            met = actions.check_wait_condition(condition, selector)
+        except NotImplementedError:
+            return False, f"{type(actions).__name__} does not support wait conditions"
+        except Exception:
+            met = False
+        elapsed = time.perf_counter() - start
+        if met:
+            return True, elapsed
+        if elapsed >= timeout:
+            return False, _timeout_message(condition, selector, elapsed)
+        time.sleep(poll_interval)
+
+
+async def async_wait_for_condition(actions, condition, selector, default_timeout=DEFAULT_CONDITION_TIMEOUT, poll_interval=POLL_INTERVAL):
+    """wait_for_condition for async actions, yielding to the event loop between polls."""
+    if condition.kind == INVALID:
+        return False, condition.argument
+    timeout = _condition_timeout(condition, default_timeout)
+    start = time.perf_counter()
+    while True:
+        try:
+            met = await actions.check_wait_condition(condition, selector)
+        except NotImplementedError:
+            return False, f"{type(actions).__name__} does not support wait conditions"
+        except Exception:
+            met = False
+        elapsed = time.perf_counter() - start
+        if met:
+            return True, elapsed
+        if elapsed >= timeout:
+            return False, _timeout_message(condition, selector, elapsed)
+        await asyncio.sleep(poll_interval)
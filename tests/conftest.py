@@ -0,0 +1,97 @@
+# conftest.py
+# Shared helpers: driver workbooks built in memory as {sheet_name: (headers, [row tuples])},
+# the shape read_workbook returns and TestPlan compiles.
+
+import pytest
+
+DRIVER_HEADERS = ['Execute', 'GetPassScreenshot', 'TestCaseName', 'ComponentName', 'Screen', 'Field', 'FieldCode',
+                  'Action', 'TestCaseDescription', 'Validation', 'ExpectedValidation', 'TestDataSheetReference']
+COMMON_HEADERS = ['Screen', 'Fields', 'Xpath', 'WaitTimeBeforeExecInSec']
+COMPONENT_HEADERS = ['CompomentName', 'Screen', 'Field', 'Action', 'TestCaseDescription', 'Validation', 'ExpectedValidation']
+
+
+def driver_row(testcase, screen, field, action, dataref=None, component=None):
+    return ('Y', 'N', testcase, component, screen, field, None, action, f"{action} {field}", None, None, dataref)
+
+
+@pytest.fixture
+def make_sheets():
+    """
+    make_sheets(steps, locators, data, components=None) -> sheets for TestPlan.
+    steps: [(testcase, screen, field, action)], the first row of each testcase referencing every
+    data row of the 'Data' sheet; locators: [(screen, field, xpath, wait)]; data: {column: [values]};
+    components: {name: [(screen, field, action)]}.
+    """
+    def build(steps, locators, data, components=None):
+        row_count = len(next(iter(data.values())))
+        dataref = f"Data!A2:Data!A{row_count + 1}"
+        seen = set()
+        driver_rows = []
+        for testcase, screen, field, action in steps:
+            driver_rows.append(driver_row(testcase, screen, field, action, None if testcase in seen else dataref))
+            seen.add(testcase)
+        sheets = {
+            'DriverSheet': (list(DRIVER_HEADERS), driver_rows),
+            'CommonSheet': (list(COMMON_HEADERS), [tuple(locator) for locator in locators]),
+            'Data': (list(data), list(zip(*data.values()))),
+        }
+        if components is not None:
+            rows = []
+            for name, body in components.items():
+                for position, (screen, field, action) in enumerate(body):
+                    rows.append((name if position == 0 else None, screen, field, action, None, None, None))
+            sheets['Components'] = (list(COMPONENT_HEADERS), rows)
+        return sheets
+    return build
+
+
+class RecordingReporting:
+    """Stands in for RobustReporting: keeps the log lines instead of writing the execution log."""
+    def __init__(self):
+        self.infos = []
+        self.errors = []
+
+    def log_info(self, message):
+        self.infos.append(message)
+
+    def log_error(self, message):
+        self.errors.append(message)
+
+
+@pytest.fixture
+def reporting():
+    return RecordingReporting()
+
+
+@pytest.fixture
+def run_plan(reporting, monkeypatch):
+    """
+    run_plan(plan, actions, batch_form_fill=False, snapshot_assertions_enabled=False) runs every testcase
+    and data row of a compiled plan through run_resolved_steps and returns the step results.
+    """
+    import modules.excel_data_reader as excel_data_reader
+    import modules.form_fill as form_fill
+    import modules.snapshot_assertions as snapshot_assertions
+    monkeypatch.delenv('CURRENT_REPORT_FOLDER', raising=False)
+    monkeypatch.setattr(excel_data_reader, 'step_results', [])
+
+    def run(plan, actions, batch_form_fill=False, snapshot_assertions_enabled=False):
+        monkeypatch.setattr(form_fill, '_batch_form_fill', batch_form_fill)
+        monkeypatch.setattr(snapshot_assertions, '_snapshot_assertions', snapshot_assertions_enabled)
+        for testcase, refs in plan.testcase_datarefs.items():
+            dataset_number = 1
+            for sheet, row_nums in refs:
+                bound = plan.bind_datasets(testcase, sheet, row_nums)
+                for row_num in row_nums:
+                    excel_data_reader.run_resolved_steps(testcase, bound[row_num], actions.driver, reporting,
+                                                         actions, dataset_number)
+                    dataset_number += 1
+        return excel_data_reader.step_results
+    return run
+
+
+@pytest.fixture
+def simulated(reporting):
+    """simulated(**settings) -> SimulatedActions without latency, logging to the recording reporting."""
+    from modules.simulated_actions import SimulatedActions
+    return lambda **settings: SimulatedActions(reporting, settings=settings)
@@ -0,0 +1,95 @@
+# test_action_registry.py
+
+import types
+
+import pytest
+
+import modules.action_registry as action_registry
+from modules.action_registry import COMPONENT, CUSTOM, register_module, resolve_action, unknown_action_message
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    """An empty, already loaded registry and no load failures."""
+    monkeypatch.setattr(action_registry, '_registry', {})
+    monkeypatch.setattr(action_registry, '_loaded', True)
+    monkeypatch.setattr(action_registry, '_load_failures', {})
+    return action_registry._registry
+
+
+def imported_helper(driver, actions, xpath, data, field, screen, testcasename):
+    return True, None
+
+
+def make_module(name):
+    module = types.ModuleType(name)
+    exec("def zoom_in(driver, actions, xpath, data, field, screen, testcasename):\n"
+         "    return True, None\n"
+         "def _private(driver, actions, xpath, data, field, screen, testcasename):\n"
+         "    return True, None\n", module.__dict__)
+    module.imported_helper = imported_helper
+    module.pattern = 'not a function'
+    return module
+
+
+def test_register_module_registers_only_its_own_public_functions(registry):
+    register_module(make_module('customization.custom_actions'), CUSTOM)
+    assert set(registry) == {'custom-zoom_in'}
+    spec = resolve_action('custom-zoom_in')
+    assert (spec.kind, spec.name) == (CUSTOM, 'zoom_in')
+
+
+def test_register_module_keeps_decorated_registrations(registry):
+    @action_registry.component_action(name='zoom_in')
+    def decorated(testcasename, actions, driver, reporting, screen, field, xpath, data):
+        pass
+    register_module(make_module('customization.custom_component'), COMPONENT)
+    assert resolve_action('component-zoom_in').func is decorated
+
+
+def test_builtin_keywords_are_case_insensitive(registry):
+    action_registry.register_action('PressKey', lambda actions, xpath, data: True)
+    assert resolve_action('presskey') is resolve_action('PRESSKEY') is not None
+    assert resolve_action('custom-PressKey') is None
+
+
+def test_unknown_keyword_names_failed_loads(registry):
+    assert unknown_action_message('custom-zoomin') == "Custom function 'zoomin' not found in custom_actions.py"
+    action_registry._load_failures.update({
+        'customization.custom_actions': "No module named 'selenium'",
+        "action pack 'extra' (extra_pack.actions)": 'boom',
+    })
+    assert unknown_action_message('custom-zoomin') == (
+        "Custom function 'zoomin' not found in custom_actions.py (failed to load customization.custom_actions: "
+        "No module named 'selenium'; action pack 'extra' (extra_pack.actions): boom)")
+    assert unknown_action_message('PressKeys') == (
+        "No matching action for: PressKeys (failed to load action pack 'extra' (extra_pack.actions): boom)")
+
+
+def test_entry_point_load_failure_is_recorded(registry, monkeypatch):
+    import importlib.metadata
+
+    class BrokenEntryPoint:
+        name = 'extra'
+        value = 'extra_pack.actions'
+
+        def load(self):
+            raise ImportError('No module named extra_pack')
+
+    monkeypatch.setattr(importlib.metadata, 'entry_points', lambda group: [BrokenEntryPoint()])
+    action_registry._load_entry_points()
+    assert action_registry.load_failures() == {"action pack 'extra' (extra_pack.actions)": 'No module named extra_pack'}
+
+
+def test_preflight_warns_about_failed_loads(registry, make_sheets):
+    import modules.test_plan as test_plan
+    from modules.plan_validator import validate_plan
+    action_registry.register_action('inputtext', lambda actions, xpath, data: True, needs_locator=True, uses_data=True)
+    action_registry._load_failures["action pack 'extra' (extra_pack.actions)"] = 'boom'
+    plan = test_plan.TestPlan(make_sheets(
+        steps=[('TC01', 'Login', 'user', 'InputText')],
+        locators=[('Login', 'user', '//input', None)],
+        data={'user': ['alice']},
+    ))
+    assert validate_plan(plan) == [{'level': 'warning', 'testcase': '', 'step': '',
+                                    'message': "Could not load action pack 'extra' (extra_pack.actions): boom"}]
@@ -0,0 +1,115 @@
+# test_async_executor.py
+
+import asyncio
+
+import pytest
+
+import modules.async_executor as async_executor
+from modules.action_registry import CUSTOM, ActionSpec
+from modules.globals import global_dict
+
+
+class FakeAsyncActions:
+    """Just what process_step_async uses of AsyncPlaywrightActions, without a browser."""
+    def __init__(self):
+        self.variables = {}
+        self.page = None
+        self.driver = None
+        self.locate_seconds = 0.0
+        self.closed = False
+
+    async def quit(self):
+        self.closed = True
+
+
+@pytest.fixture
+def engine(monkeypatch):
+    """The async engine with fake per-dataset actions and no post-action wait."""
+    created = []
+
+    async def create(reporting, browser):
+        created.append(FakeAsyncActions())
+        return created[-1]
+
+    monkeypatch.setattr(async_executor.AsyncPlaywrightActions, 'create', create)
+    monkeypatch.setattr(async_executor, 'get_post_action_wait', lambda: {'strategy': 'none'})
+    monkeypatch.delenv('CURRENT_REPORT_FOLDER', raising=False)
+    global_dict.clear()
+    yield created
+    global_dict.clear()
+
+
+def step(field, data, handler):
+    return {'screen': 'Form', 'field': field, 'action': handler.keyword, 'xpath': '', 'data': data,
+            'get_pass_screenshot': False, 'testcase_description': '', 'validation': '', 'expected_validation': '',
+            'wait_time': 0, 'handler': handler}
+
+
+def job(index, steps):
+    return {'index': index, 'testcase': 'TC01', 'sheet': 'Data', 'row_num': index + 2,
+            'dataset_number': index + 1, 'steps': steps}
+
+
+def test_custom_actions_writing_global_dict_stay_in_their_dataset(engine, reporting):
+    seen = {}
+
+    async def store(driver, actions, xpath, data, field, _, testcasename):
+        # Written the way shared custom_actions code does it
+        global_dict['$$acc'] = data
+        await asyncio.sleep(0.01)
+        return True, ''
+
+    async def check(driver, actions, xpath, data, field, _, testcasename):
+        seen[data] = global_dict.get('$$acc')
+        return True, ''
+
+    store_spec, check_spec = ActionSpec('custom-store', store, CUSTOM), ActionSpec('custom-check', check, CUSTOM)
+
+    async def run_both():
+        return await asyncio.gather(*(
+            async_executor.run_job_async(job(index, [step('acc', value, store_spec), step('check', value, check_spec)]),
+                                         None, reporting)
+            for index, value in enumerate(['first', 'second'])))
+
+    results = asyncio.run(run_both())
+    assert [[result['execution_status'] for result in dataset] for dataset in results] == [['pass', 'pass']] * 2
+    assert seen == {'first': 'first', 'second': 'second'}
+    assert [actions.variables for actions in engine] == [{'$$acc': 'first'}, {'$$acc': 'second'}]
+    # The process-wide variables are untouched
+    assert dict(global_dict) == {}
+
+
+def test_stored_values_are_read_back_through_actions_variables(engine, reporting):
+    async def store(driver, actions, xpath, data, field, _, testcasename):
+        global_dict['$$acc'] = '42'
+        return True, ''
+
+    async def echo(driver, actions, xpath, data, field, _, testcasename):
+        return (data == '42'), f"got {data}"
+
+    steps = [step('acc', None, ActionSpec('custom-store', store, CUSTOM)),
+             step('echo', '$$acc', ActionSpec('custom-echo', echo, CUSTOM))]
+    results = asyncio.run(async_executor.run_job_async(job(0, steps), None, reporting))
+    assert [result['execution_status'] for result in results] == ['pass', 'pass']
+
+
+def test_a_dataset_that_breaks_off_keeps_its_partial_results(engine, reporting, monkeypatch):
+    calls = []
+    process_step_async = async_executor.process_step_async
+
+    async def failing_second_step(*args, **kwargs):
+        calls.append(args[2])
+        if len(calls) == 2:
+            raise RuntimeError('context crashed')
+        return await process_step_async(*args, **kwargs)
+
+    async def ok(driver, actions, xpath, data, field, _, testcasename):
+        return True, ''
+
+    monkeypatch.setattr(async_executor, 'process_step_async', failing_second_step)
+    spec = ActionSpec('custom-ok', ok, CUSTOM)
+    results = asyncio.run(async_executor.run_job_async(job(0, [step('a', None, spec), step('b', None, spec),
+                                                                  step('c', None, spec)]), None, reporting))
+    assert [(result['field'], result['execution_status']) for result in results] == [('a', 'pass')]
+    assert reporting.errors == ["Error in process_testcase_rows for testcase 'TC01': context crashed"]
+    assert engine[0].closed
@@ -0,0 +1,54 @@
+# test_components.py
+
+import pytest
+
+from modules.test_plan import expand_components
+
+
+def component(*steps):
+    return [{'Screen': screen, 'Field': field, 'Action': action} for screen, field, action in steps]
+
+
+def test_nested_components_are_inlined():
+    expanded = expand_components({
+        'Login': component(('Login', 'user', 'InputText'), ('Login', 'submit', 'ClickElement')),
+        'Checkout': component(('Home', 'Login', 'RunComponent'), ('Cart', 'pay', 'ClickElement')),
+    })
+    assert [(step['screen'], step['field'], step['action']) for step in expanded['Checkout']] == [
+        ('Login', 'user', 'InputText'), ('Login', 'submit', 'ClickElement'), ('Cart', 'pay', 'ClickElement')]
+
+
+def test_run_component_keyword_is_case_insensitive():
+    expanded = expand_components({
+        'Inner': component(('S', 'f', 'ClickElement')),
+        'Outer': component(('S', 'Inner', 'runComponent')),
+    })
+    assert [step['field'] for step in expanded['Outer']] == ['f']
+
+
+def test_direct_cycle_is_rejected():
+    with pytest.raises(ValueError, match='Component cycle detected: A -> B -> A'):
+        expand_components({
+            'A': component(('S', 'B', 'RunComponent')),
+            'B': component(('S', 'A', 'RunComponent')),
+        })
+
+
+def test_self_reference_is_rejected():
+    with pytest.raises(ValueError, match='Component cycle detected: A -> A'):
+        expand_components({'A': component(('S', 'x', 'ClickElement'), ('S', 'A', 'RunComponent'))})
+
+
+def test_shared_component_is_not_a_cycle():
+    expanded = expand_components({
+        'Common': component(('S', 'x', 'ClickElement')),
+        'First': component(('S', 'Common', 'RunComponent'), ('S', 'Common', 'RunComponent')),
+        'Second': component(('S', 'Common', 'RunComponent')),
+    })
+    assert len(expanded['First']) == 2
+    assert len(expanded['Second']) == 1
+
+
+def test_unknown_nested_component_is_rejected():
+    with pytest.raises(ValueError, match="Component 'A' calls unknown component 'Missing'"):
+        expand_components({'A': component(('S', 'Missing', 'RunComponent'))})
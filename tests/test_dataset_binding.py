@@ -0,0 +1,76 @@
+# test_dataset_binding.py
+
+import pytest
+
+import modules.test_plan as test_plan
+from modules.test_plan import BoundDatasets
+
+
+@pytest.fixture
+def plan(make_sheets):
+    return test_plan.TestPlan(make_sheets(
+        steps=[('TC01', 'Orders', 'customer', 'InputText'), ('TC01', 'Orders', 'qty', 'InputText'),
+               ('TC01', 'Orders', 'open', 'ClickElement')],
+        locators=[('Orders', 'customer', '//input[@name="customer"]', None), ('Orders', 'qty', '//input[@name="qty"]', 2),
+                  ('Orders', 'open', '//tr[@id="<<order_id>>"]//a[text()="<<customer>>"]', None)],
+        data={'customer': ['Ann', 'Bo', 'Cy', 'Di'], 'qty': [1, 2.5, None, '04'], 'order_id': [101, 102, 103, 104]},
+    ))
+
+
+def bound_per_cell(plan, testcase, sheet, row_num):
+    """The bound steps worked out cell by cell, as the per-row binding used to do."""
+    steps = []
+    for template in plan.get_step_templates(testcase):
+        row = {column: str(plan.get_data_value(sheet, row_num, column)) for column in template['locator'].placeholders}
+        data = str(plan.get_data_value(sheet, row_num, template['field'])) if plan.has_column(sheet, template['field']) else ''
+        steps.append((template['field'], template['locator'].render(row), data, template['wait_time']))
+    return steps
+
+
+def as_tuples(steps):
+    return [(step['field'], step['xpath'], step['data'], step['wait_time']) for step in steps]
+
+
+def test_columnar_binding_matches_binding_each_cell(plan):
+    bound = plan.bind_datasets('TC01', 'Data', [2, 3, 4, 5])
+    for row_num in (2, 3, 4, 5):
+        assert as_tuples(bound[row_num]) == bound_per_cell(plan, 'TC01', 'Data', row_num)
+    assert as_tuples(bound[3]) == [('customer', '//input[@name="customer"]', 'Bo', 0),
+                                   ('qty', '//input[@name="qty"]', '2.5', 2),
+                                   ('open', '//tr[@id="102"]//a[text()="Bo"]', '', 0)]
+
+
+def test_bound_datasets_keep_the_requested_rows_in_order(plan):
+    bound = plan.bind_datasets('TC01', 'Data', [5, 2])
+    assert isinstance(bound, BoundDatasets)
+    assert list(bound) == [5, 2] and len(bound) == 2
+    assert bound[5][0]['data'] == 'Di'
+    with pytest.raises(KeyError):
+        bound[3]
+
+
+def test_each_lookup_builds_its_own_step_dicts(plan):
+    bound = plan.bind_datasets('TC01', 'Data', [2, 3])
+    first = bound[2]
+    first[0]['data'] = 'changed'
+    assert bound[2][0]['data'] == 'Ann'
+    assert bound[3][0]['data'] == 'Bo'
+    # Step templates are shared, not copied into the plan per row
+    assert first[1]['handler'] is bound[3][1]['handler']
+    assert set(first[0]) >= {'screen', 'field', 'action', 'xpath', 'data', 'wait_time', 'get_pass_screenshot',
+                             'testcase_description', 'validation', 'expected_validation'}
+
+
+def test_resolve_steps_is_one_row_of_bind_datasets(plan):
+    assert plan.resolve_steps('TC01', 'Data', 4) == plan.bind_datasets('TC01', 'Data', [2, 3, 4, 5])[4]
+
+
+def test_cell_types_are_kept_as_text(plan):
+    bound = plan.bind_datasets('TC01', 'Data', [2, 3, 4, 5])
+    # str() of the raw cell, blank cells included, exactly as the cell-by-cell binding produced it
+    assert [bound[row_num][1]['data'] for row_num in (2, 3, 4, 5)] == ['1', '2.5', 'None', '04']
+
+
+def test_unknown_data_sheet_raises(plan):
+    with pytest.raises(ValueError, match="Data sheet 'Missing' not found"):
+        plan.bind_datasets('TC01', 'Missing', [2])
@@ -0,0 +1,144 @@
+# test_element_cache.py
+
+import pytest
+
+import modules.automation_process as automation_process
+from modules.element_cache import ElementCache, format_cache_summary, summarize_element_cache
+
+
+def test_put_then_get_is_a_hit():
+    cache = ElementCache()
+    assert cache.get('//input') is None
+    cache.put('//input', 'element')
+    assert cache.get('//input') == 'element'
+    assert cache.stats == {'hits': 1, 'misses': 1, 'stale': 0, 'invalidations': 0}
+
+
+def test_discarding_a_stale_hit_counts_it_as_a_stale_miss():
+    cache = ElementCache()
+    cache.put('//input', 'element')
+    before = cache.snapshot()
+    assert cache.get('//input') == 'element'
+    cache.discard('//input')
+    assert cache.stats == {'hits': 0, 'misses': 1, 'stale': 1, 'invalidations': 0}
+    assert cache.outcome_since(before) == 'stale'
+    assert cache.get('//input') is None
+
+
+def test_another_scope_empties_the_cache():
+    first_page, second_page = object(), object()
+    cache = ElementCache()
+    cache.get('//input', scope=first_page)
+    cache.put('//input', 'element')
+    assert cache.get('//input', scope=first_page) == 'element'
+    assert cache.get('//input', scope=second_page) is None
+    assert cache.stats['invalidations'] == 1
+
+
+def test_oldest_entry_is_dropped_when_full():
+    cache = ElementCache(max_entries=2)
+    for selector in ('//a', '//b', '//c'):
+        cache.put(selector, selector.upper())
+    assert [cache.get(selector) for selector in ('//a', '//b', '//c')] == [None, '//B', '//C']
+
+
+def test_outcome_since_reports_the_lookups_of_one_step():
+    cache = ElementCache()
+    before = cache.snapshot()
+    assert cache.outcome_since(before) == ''
+    cache.get('//input')
+    assert cache.outcome_since(before) == 'miss'
+    cache.put('//input', 'element')
+    before = cache.snapshot()
+    cache.get('//input')
+    assert cache.outcome_since(before) == 'hit'
+
+
+class CachingActions:
+    """get_value through an ElementCache; elements listed in stale turn out detached when reused."""
+    def __init__(self):
+        self.element_cache = ElementCache()
+        self.stale = set()
+
+    def get_value(self, xpath):
+        element = self.element_cache.get(xpath)
+        if element is not None and element in self.stale:
+            self.element_cache.discard(xpath)
+            element = None
+        if element is None:
+            element = f"element for {xpath}"
+            self.element_cache.put(xpath, element)
+        return True, element
+
+
+def test_process_step_records_each_step_cache_outcome(reporting, monkeypatch):
+    monkeypatch.setattr(automation_process, 'get_post_action_wait', lambda: {'strategy': 'none'})
+    monkeypatch.delenv('CURRENT_REPORT_FOLDER', raising=False)
+    actions = CachingActions()
+
+    def step():
+        return automation_process.process_step('TC01', 'Form', 'name', 'GetElementText', '//input', None,
+                                               None, reporting, actions)['element_cache']
+
+    assert step() == 'miss'
+    assert step() == 'hit'
+    actions.stale.add('element for //input')
+    assert step() == 'stale'
+    results = [{'element_cache': outcome} for outcome in ('miss', 'hit', 'stale', '')]
+    assert summarize_element_cache(results) == {'hit': 1, 'miss': 1, 'stale': 1}
+
+
+def test_format_cache_summary():
+    assert format_cache_summary(3, 1, 0) == "Element cache: 3 hit(s), 1 miss(es) (0 stale), hit rate 75% over 4 step(s)"
+    assert format_cache_summary(1, 2, 1) == "Element cache: 1 hit(s), 3 miss(es) (1 stale), hit rate 25% over 4 step(s)"
+    assert format_cache_summary(0, 0, 0) == "Element cache: no element lookups"
+
+
+class FakeResolverDriver:
+    """execute_script answers the cached-element check; execute_async_script the in-page resolver."""
+    def __init__(self, check):
+        self.check = check
+        self.resolved = 0
+
+    def execute_script(self, script, element):
+        if isinstance(self.check, Exception):
+            raise self.check
+        return self.check
+
+    def execute_async_script(self, script, *args):
+        self.resolved += 1
+        return {'status': 'ready', 'element': f"element {self.resolved}", 'tag': 'input', 'value': ''}
+
+
+def selenium_actions_with(reporting, check):
+    selenium_actions = pytest.importorskip('modules.selenium_actions')
+    actions = selenium_actions.SeleniumActions.__new__(selenium_actions.SeleniumActions)
+    actions.reporting = reporting
+    actions.script_resolver = True
+    actions._resolved = None
+    actions.element_cache = ElementCache()
+    actions.driver = FakeResolverDriver(check)
+    return actions
+
+
+def test_selenium_reuses_a_cached_element_that_is_still_ready(reporting):
+    actions = selenium_actions_with(reporting, {'status': 'ready', 'tag': 'input', 'value': 'x'})
+    assert actions._find_element('//input') == 'element 1'
+    assert actions._find_element('//input') == 'element 1'
+    assert actions.driver.resolved == 1
+    assert actions.element_cache.stats['hits'] == 1
+
+
+def test_selenium_relocates_a_stale_element(reporting):
+    exceptions = pytest.importorskip('selenium.common.exceptions')
+    actions = selenium_actions_with(reporting, exceptions.StaleElementReferenceException('stale element reference'))
+    assert actions._find_element('//input') == 'element 1'
+    assert actions._find_element('//input') == 'element 2'
+    assert actions.element_cache.stats['stale'] == 1
+
+
+def test_selenium_relocates_an_element_that_is_no_longer_ready(reporting):
+    actions = selenium_actions_with(reporting, {'status': 'detached'})
+    actions._find_element('//input')
+    assert actions._find_element('//input') == 'element 2'
+    assert actions.element_cache.stats['stale'] == 1
@@ -0,0 +1,106 @@
+# test_element_resolver.py
+
+import pytest
+
+selenium_actions = pytest.importorskip('modules.selenium_actions')
+from selenium.common.exceptions import WebDriverException  # noqa: E402
+
+from modules.element_cache import ElementCache  # noqa: E402
+
+
+class ResolverDriver:
+    """Answers every execute_async_script with the next canned resolver result and records the calls."""
+    def __init__(self, *results):
+        self.results = list(results)
+        self.calls = []
+
+    def execute_async_script(self, script, *args):
+        self.calls.append((script, args))
+        result = self.results.pop(0)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+
+class PlainElement:
+    """An element the fallback would have to query; the resolver's details make that unnecessary."""
+    def __getattr__(self, name):
+        raise AssertionError(f"WebElement.{name} used although the resolver returned the details")
+
+
+@pytest.fixture
+def backend(reporting):
+    def build(*results, script_resolver=True):
+        actions = selenium_actions.SeleniumActions.__new__(selenium_actions.SeleniumActions)
+        actions.reporting = reporting
+        actions.script_resolver = script_resolver
+        actions._resolved = None
+        actions.element_cache = ElementCache()
+        actions.driver = ResolverDriver(*results)
+        actions.fallbacks = []
+        actions._wait_for_element = lambda by, selector, timeout: actions.fallbacks.append((selector, timeout)) or 'waited'
+        actions._scroll_to_find = lambda by, selector: 'scrolled'
+        return actions
+    return build
+
+
+def ready(element, value='Ann', type_='text'):
+    return {'status': 'ready', 'element': element, 'tag': 'input', 'type': type_, 'value': value, 'visible': True}
+
+
+def test_element_is_located_in_one_script_call(backend):
+    element = PlainElement()
+    actions = backend(ready(element))
+    assert actions._find_element('//input[@id="name"]') is element
+    ((script, args),) = actions.driver.calls
+    assert script == selenium_actions.RESOLVE_ELEMENT_JS
+    # selector, is-XPath, presence and clickable waits (ms), poll interval (ms)
+    assert args == ('//input[@id="name"]', True, 10000, 10000, 50)
+    assert actions.fallbacks == []
+
+
+def test_css_selectors_and_learned_timeouts_are_passed_to_the_script(backend):
+    actions = backend(ready(PlainElement()))
+    actions.locator_timeouts = {('Form', 'name'): 2.5}
+    actions.set_step_locator('Form', 'name', '#name')
+    actions._find_element('#name')
+    assert actions.driver.calls[0][1] == ('#name', False, 2500, 2500, 50)
+
+
+def test_get_value_uses_what_the_resolver_read(backend, reporting):
+    actions = backend(ready(PlainElement(), value='Ann'))
+    assert actions.get_value('//input') == (True, 'Ann')
+    assert len(actions.driver.calls) == 1
+
+
+def test_missing_element_goes_to_the_scroll_search(backend, reporting):
+    actions = backend({'status': 'missing'})
+    assert actions._find_element('//row[500]') == 'scrolled'
+    assert reporting.infos == ["Element not found initially, attempting to scroll and locate: //row[500]"]
+
+
+def test_hidden_element_is_returned_but_not_cached(backend, reporting):
+    element = PlainElement()
+    actions = backend(dict(ready(element, value=''), status='hidden', visible=False))
+    assert actions._find_element('//input') is element
+    assert reporting.infos[-1] == "Element found but not visible: //input"
+    assert actions.element_cache.get('//input') is None
+
+
+@pytest.mark.parametrize('result', [WebDriverException('javascript error'), {'status': 'error', 'message': 'bad xpath'}, None])
+def test_script_failure_falls_back_to_webdriver_waits(backend, result):
+    actions = backend(result)
+    assert actions._find_element('//input') == 'waited'
+    assert actions.fallbacks == [('//input', 10)]
+
+
+def test_resolver_can_be_switched_off(backend):
+    actions = backend(script_resolver=False)
+    assert actions._find_element('//input') == 'waited'
+    assert actions.driver.calls == []
+
+
+def test_resolver_time_counts_as_locate_time(backend):
+    actions = backend(ready(PlainElement()))
+    actions._find_element('//input')
+    assert actions.locate_seconds > 0
@@ -0,0 +1,73 @@
+# test_form_fill.py
+
+import modules.test_plan as test_plan
+from modules.form_fill import group_step_runs
+
+
+def steps(*specs):
+    return [{'screen': screen, 'field': field, 'kind': kind} for screen, field, kind in specs]
+
+
+def runs(step_list):
+    return [(kind, [step['field'] for step in run])
+            for kind, run in group_step_runs(step_list, lambda step: step['kind'])]
+
+
+def test_consecutive_steps_of_one_kind_and_screen_form_a_run():
+    assert runs(steps(('Form', 'a', 'fill'), ('Form', 'b', 'fill'), ('Form', 'c', 'fill'))) == [('fill', ['a', 'b', 'c'])]
+
+
+def test_single_steps_are_not_runs():
+    assert runs(steps(('Form', 'a', 'fill'), ('Form', 'b', None), ('Form', 'c', 'fill'))) == [
+        (None, ['a']), (None, ['b']), (None, ['c'])]
+
+
+def test_screen_change_ends_a_run():
+    assert runs(steps(('One', 'a', 'fill'), ('One', 'b', 'fill'), ('Two', 'c', 'fill'), ('Two', 'd', 'fill'))) == [
+        ('fill', ['a', 'b']), ('fill', ['c', 'd'])]
+
+
+def test_kind_change_ends_a_run():
+    assert runs(steps(('Form', 'a', 'fill'), ('Form', 'b', 'fill'), ('Form', 'c', 'snapshot'), ('Form', 'd', 'snapshot'),
+                      ('Form', 'e', None))) == [('fill', ['a', 'b']), ('snapshot', ['c', 'd']), (None, ['e'])]
+
+
+def test_order_is_kept():
+    step_list = steps(('Form', 'a', None), ('Form', 'b', 'fill'), ('Form', 'c', 'fill'), ('Form', 'd', None))
+    assert [field for _, fields in runs(step_list) for field in fields] == ['a', 'b', 'c', 'd']
+
+
+def test_empty():
+    assert runs([]) == []
+
+
+def fill_plan(make_sheets):
+    return test_plan.TestPlan(make_sheets(
+        steps=[('TC01', 'Form', field, 'InputText') for field in ('first', 'last', 'email')],
+        locators=[('Form', field, f'//*[@id="{field}"]', None) for field in ('first', 'last', 'email')],
+        data={'first': ['Ann'], 'last': ['Lee'], 'email': ['ann@example.com']},
+    ))
+
+
+def test_batch_fills_every_field(make_sheets, run_plan, simulated):
+    actions = simulated()
+    results = run_plan(fill_plan(make_sheets), actions, batch_form_fill=True)
+    assert [result['execution_status'] for result in results] == ['pass'] * 3
+    assert actions.driver.elements['//*[@id="email"]'].value == 'ann@example.com'
+
+
+def test_fields_after_a_failed_field_fail_as_not_filled(make_sheets, run_plan, simulated):
+    actions = simulated(fail_selectors=['//*[@id="first"]'])
+    results = run_plan(fill_plan(make_sheets), actions, batch_form_fill=True)
+    assert [result['execution_status'] for result in results] == ['fail'] * 3
+    assert 'Simulated failure' in results[0]['error message']
+    for result in results[1:]:
+        assert result['error message'] == 'Not filled: the batched fill stopped at the failed field Form/first'
+    # The rest of the run was not typed one by one after the failure
+    assert '//*[@id="last"]' not in actions.driver.elements
+
+
+def test_without_batching_every_field_runs_on_its_own(make_sheets, run_plan, simulated):
+    actions = simulated(fail_selectors=['//*[@id="first"]'])
+    results = run_plan(fill_plan(make_sheets), actions, batch_form_fill=False)
+    assert [result['execution_status'] for result in results] == ['fail', 'pass', 'pass']
@@ -0,0 +1,108 @@
+# test_locator_history.py
+
+import pytest
+
+from modules.locator_history import (
+    DEFAULT_ADAPTIVE_TIMEOUTS, derive_locator_timeouts, find_drifting_locators, load_locator_history,
+    percentile, readiness_samples, record_locator_history,
+)
+
+SETTINGS = dict(DEFAULT_ADAPTIVE_TIMEOUTS)
+
+
+def history(samples, screen='Login', field='user'):
+    return {(screen, field): list(samples)}
+
+
+@pytest.mark.parametrize('values, pct, expected', [
+    ([5], 99, 5),
+    ([1, 2, 3, 4], 50, 2),
+    ([1, 2, 3, 4], 75, 3),
+    (list(range(1, 101)), 99, 99),
+    ([4, 1, 3, 2], 100, 4),
+])
+def test_percentile_is_nearest_rank(values, pct, expected):
+    assert percentile(values, pct) == expected
+
+
+def test_timeout_is_percentile_times_margin():
+    # p99 of 100..500 ms is 500 ms; x3 margin = 1.5 s, raised to the 2 s minimum
+    assert derive_locator_timeouts(history([100, 200, 300, 400, 500]), SETTINGS) == {('Login', 'user'): 2.0}
+    assert derive_locator_timeouts(history([1000] * 5), SETTINGS) == {('Login', 'user'): 3.0}
+
+
+def test_too_few_samples_keep_the_default():
+    assert derive_locator_timeouts(history([1000] * 4), SETTINGS) == {}
+
+
+def test_cap_is_per_backend():
+    slow = history([9000] * 5)
+    assert derive_locator_timeouts(slow, SETTINGS, 'selenium') == {('Login', 'user'): 14.0}
+    assert derive_locator_timeouts(slow, SETTINGS, 'playwright') == {('Login', 'user'): 27.0}
+    assert derive_locator_timeouts(history([20000] * 5), SETTINGS, 'playwright') == {('Login', 'user'): 30.0}
+    # Backends without a cap of their own get the lowest one
+    assert derive_locator_timeouts(slow, SETTINGS, 'other') == {('Login', 'user'): 14.0}
+    assert derive_locator_timeouts(slow, dict(SETTINGS, max_seconds=20), 'playwright') == {('Login', 'user'): 20.0}
+
+
+def test_same_xpath_on_several_screens_gets_a_timeout_per_screen():
+    both = {**history([1000] * 5, screen='A'), **history([2000] * 5, screen='B')}
+    assert derive_locator_timeouts(both, SETTINGS) == {('A', 'user'): 3.0, ('B', 'user'): 6.0}
+
+
+def step(**overrides):
+    result = {'screen': 'Login', 'field': 'user', 'xpath': '//input', 'locate_ms': 120.0,
+              'execution_status': 'pass', 'element_cache': 'miss', 'located_by': '', 'snapshot_ms': 0.0}
+    result.update(overrides)
+    return result
+
+
+def test_readiness_samples_keep_plain_lookups():
+    assert readiness_samples([step()]) == [('Login', 'user', '//input', 120.0)]
+
+
+@pytest.mark.parametrize('overrides', [
+    {'execution_status': 'fail'},
+    {'element_cache': 'hit'},
+    {'locate_ms': 0.0},
+    {'xpath': ''},
+    {'located_by': 'scroll'},
+    {'located_by': 'snapshot'},
+    {'snapshot_ms': 35.0},
+])
+def test_readiness_samples_leave_out(overrides):
+    assert readiness_samples([step(**overrides)]) == []
+
+
+def test_record_and_load_keep_the_newest_samples(tmp_path):
+    path = str(tmp_path / 'history.sqlite3')
+    assert load_locator_history(path) == {}
+    for ready_ms in (10, 20, 30):
+        record_locator_history([step(locate_ms=ready_ms)], path=path, history_size=2)
+    assert load_locator_history(path) == {('Login', 'user'): [20.0, 30.0]}
+
+
+def test_templated_locator_builds_one_history_across_bound_xpaths(tmp_path):
+    path = str(tmp_path / 'history.sqlite3')
+    for row_id in range(6):
+        record_locator_history([step(xpath=f'//tr[@id="{row_id}"]', locate_ms=1000.0)], path=path, history_size=5)
+    loaded = load_locator_history(path)
+    assert loaded == {('Login', 'user'): [1000.0] * 5}
+    assert derive_locator_timeouts(loaded, SETTINGS) == {('Login', 'user'): 3.0}
+
+
+def test_backend_uses_the_learned_timeout_of_the_current_step(simulated):
+    backend = simulated()
+    backend.locator_timeouts = {('Login', 'user'): 3.0}
+    assert backend.element_timeout_for('//tr[@id="7"]', 10) == 10
+    backend.set_step_locator('Login', 'user', '//tr[@id="7"]')
+    assert backend.element_timeout_for('//tr[@id="7"]', 10) == 3.0
+    # Other elements the step's action looks up keep the default
+    assert backend.element_timeout_for('//button', 10) == 10
+
+
+def test_drift_compares_the_newest_window_with_the_samples_before():
+    settings = dict(SETTINGS, drift_window=3)
+    drifting = find_drifting_locators(history([100, 110, 90, 400, 420, 380]), settings)
+    assert [(entry['baseline_ms'], entry['recent_ms']) for entry in drifting] == [(100, 400)]
+    assert find_drifting_locators(history([100, 110, 90, 120, 100, 110]), settings) == []
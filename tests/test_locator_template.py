@@ -0,0 +1,42 @@
+# test_locator_template.py
+
+from modules.locator_template import LocatorTemplate
+
+
+def test_static_locator():
+    template = LocatorTemplate('//button[@id="save"]')
+    assert template.is_static
+    assert template.placeholders == ()
+    assert template.render({}) == '//button[@id="save"]'
+    assert template.render_columns(lambda column: [], 3) == ['//button[@id="save"]'] * 3
+
+
+def test_placeholders_in_order_without_duplicates():
+    template = LocatorTemplate('//tr[td="<<name>>"]/td[<<col>>]//*[@title="<<name>>"]')
+    assert template.placeholders == ('name', 'col')
+    assert not template.is_static
+
+
+def test_render_one_row():
+    template = LocatorTemplate('//tr[@id="row-<<row_id>>"]/td[<<col>>]')
+    assert template.render({'row_id': 21, 'col': '3'}) == '//tr[@id="row-21"]/td[3]'
+
+
+def test_render_columns_matches_render_per_row():
+    template = LocatorTemplate('<<a>>-<<b>>-<<a>>')
+    columns = {'a': ['x', 'y'], 'b': ['1', '2']}
+    rendered = template.render_columns(columns.__getitem__, 2)
+    assert rendered == ['x-1-x', 'y-2-y']
+    assert rendered == [template.render({'a': a, 'b': b}) for a, b in zip(columns['a'], columns['b'])]
+
+
+def test_missing_columns():
+    template = LocatorTemplate('//a[@href="<<url>>"][text()="<<label>>"]')
+    assert template.missing_columns(['url', 'other']) == ['label']
+    assert template.missing_columns(['url', 'label']) == []
+
+
+def test_none_source_and_equality():
+    assert LocatorTemplate(None).source == ''
+    assert LocatorTemplate('//a') == LocatorTemplate('//a')
+    assert len({LocatorTemplate('//a'), LocatorTemplate('//a'), LocatorTemplate('//b')}) == 2
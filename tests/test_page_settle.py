@@ -0,0 +1,62 @@
+# test_page_settle.py
+
+import pytest
+
+import modules.page_settle as page_settle
+from modules.page_settle import is_network_idle, wait_for_settle
+
+
+def probes(*results):
+    """run_probe returning the given SETTLE_PROBE_JS results in turn, then the last one forever."""
+    results = list(results)
+    return lambda: results.pop(0) if len(results) > 1 else results[0]
+
+
+def test_settles_once_quiet_and_idle():
+    run_probe = probes(['loading', [], 0], ['complete', [50], 400], ['complete', [], 100], ['complete', [], 350])
+    settled, elapsed = wait_for_settle(run_probe, quiet_ms=300, timeout=2, poll_interval=0, long_request_ms=1000)
+    assert settled
+    assert elapsed < 2
+
+
+def test_long_requests_are_not_waited_for():
+    # A long-poll open for 5 s does not hold the page up; a 200 ms old fetch does
+    assert wait_for_settle(probes(['complete', [5000], 500]), 300, timeout=0.2, poll_interval=0, long_request_ms=1000)[0]
+    assert not wait_for_settle(probes(['complete', [200], 500]), 300, timeout=0.05, poll_interval=0, long_request_ms=1000)[0]
+
+
+def test_gives_up_at_the_timeout():
+    settled, elapsed = wait_for_settle(probes(['complete', [], 0]), 300, timeout=0.05, poll_interval=0.01, long_request_ms=1000)
+    assert not settled
+    assert elapsed >= 0.05
+
+
+def test_probe_errors_during_navigation_are_retried():
+    calls = []
+
+    def run_probe():
+        calls.append(1)
+        if len(calls) < 3:
+            raise RuntimeError('Execution context was destroyed')
+        return ['complete', [], 1000]
+
+    assert wait_for_settle(run_probe, 300, timeout=1, poll_interval=0, long_request_ms=1000)[0]
+    assert len(calls) == 3
+
+
+@pytest.mark.parametrize('probe, idle', [
+    (['complete', [], 0], True),
+    (['complete', [1500], 0], True),
+    (['complete', [10], 0], False),
+    (['interactive', [], 0], False),
+    (None, False),
+])
+def test_is_network_idle(probe, idle):
+    assert is_network_idle(probe, long_request_ms=1000) is idle
+
+
+def test_settle_timeout_defaults_to_the_fixed_sleep(monkeypatch):
+    monkeypatch.setattr(page_settle, '_post_action_wait', None)
+    monkeypatch.setattr('modules.middleware.get_config', lambda: {'post_action_wait': {'strategy': ' Settle ', 'fixed_seconds': 2}})
+    settings = page_settle.get_post_action_wait()
+    assert (settings['strategy'], settings['timeout'], settings['long_request_ms']) == ('settle', 2, 1000)
@@ -0,0 +1,72 @@
+# test_parallel_runner.py
+
+import pytest
+
+import modules.excel_data_reader as excel_data_reader
+import modules.middleware as middleware
+import modules.parallel_runner as parallel_runner
+import modules.test_plan as test_plan
+from modules.globals import global_dict
+
+JOB = {'index': 4, 'testcase': 'TC01', 'sheet': 'Data', 'row_num': 2, 'dataset_number': 1, 'steps': []}
+
+
+@pytest.fixture
+def worker(reporting, simulated, monkeypatch):
+    """This process set up as a pool worker without session reuse, on the simulated backend."""
+    monkeypatch.setattr(parallel_runner, '_worker_reporting', reporting)
+    monkeypatch.setattr(parallel_runner, '_worker_sessions', None)
+    monkeypatch.setattr(middleware, 'get_framework_class', lambda *args, **kwargs: simulated())
+    monkeypatch.setattr(excel_data_reader, 'step_results', [])
+    monkeypatch.delenv('CURRENT_REPORT_FOLDER', raising=False)
+    return reporting
+
+
+def test_a_job_that_breaks_off_keeps_its_partial_results(worker, monkeypatch):
+    def run_resolved_steps(testcase, steps, driver, reporting, actions, dataset_number):
+        excel_data_reader.step_results.append({'field': 'first', 'execution_status': 'pass'})
+        raise RuntimeError('browser crashed')
+
+    monkeypatch.setattr(excel_data_reader, 'run_resolved_steps', run_resolved_steps)
+    index, results, session_events = parallel_runner._run_job(JOB)
+    assert (index, results, session_events) == (4, [{'field': 'first', 'execution_status': 'pass'}], None)
+    assert worker.errors == ["Error in process_testcase_rows for testcase 'TC01': browser crashed"]
+    assert excel_data_reader.step_results == []
+
+
+@pytest.fixture
+def variables():
+    global_dict.clear()
+    yield global_dict
+    global_dict.clear()
+
+
+def test_sequential_datasets_carry_variables_over(variables, make_sheets, run_plan, simulated):
+    seen = []
+    plan = test_plan.TestPlan(make_sheets(
+        steps=[('TC01', 'Form', 'user', 'InputText')],
+        locators=[('Form', 'user', '//input', None)],
+        data={'user': ['alice', 'bob']},
+    ))
+    actions = simulated()
+    set_value = actions.set_value
+
+    def recording_set_value(selector, value):
+        seen.append(dict(variables))
+        variables['$$previous'] = value
+        return set_value(selector, value)
+
+    actions.set_value = recording_set_value
+    results = run_plan(plan, actions)
+    assert [result['execution_status'] for result in results] == ['pass', 'pass']
+    # A value stored by one dataset is still there for the next one
+    assert seen == [{}, {'$$previous': 'alice'}]
+
+
+def test_a_worker_job_starts_without_earlier_variables(worker, variables, monkeypatch):
+    seen = []
+    variables['$$left_over'] = 'from an earlier dataset'
+    monkeypatch.setattr(excel_data_reader, 'run_resolved_steps',
+                        lambda *args: seen.append(dict(variables)))
+    parallel_runner._run_job(JOB)
+    assert seen == [{}]
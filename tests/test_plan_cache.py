@@ -0,0 +1,135 @@
+# test_plan_cache.py
+
+import os
+
+import openpyxl
+import pytest
+
+import modules.plan_cache as plan_cache
+
+
+def write_workbook(path, user='alice', title=None):
+    workbook = openpyxl.Workbook()
+    driver = workbook.active
+    driver.title = 'DriverSheet'
+    driver.append(['Execute', 'TestCaseName', 'Screen', 'Field', 'Action', 'TestDataSheetReference'])
+    driver.append(['Y', 'TC01', 'Login', 'user', 'InputText', 'Data!A2:Data!A2'])
+    common = workbook.create_sheet('CommonSheet')
+    common.append(['Screen', 'Fields', 'Xpath', 'WaitTimeBeforeExecInSec'])
+    common.append(['Login', 'user', '//input[@id="user"]', None])
+    data = workbook.create_sheet('Data')
+    data.append(['user'])
+    data.append([user])
+    if title:
+        workbook.properties.title = title
+    workbook.save(path)
+
+
+@pytest.fixture
+def cache_folder(tmp_path, monkeypatch):
+    folder = tmp_path / 'cache'
+    monkeypatch.setattr(plan_cache, 'CACHE_FOLDER', str(folder))
+    return folder
+
+
+def test_cache_path_is_per_workbook(cache_folder):
+    path = plan_cache.get_cache_path('/a/plan.xlsx')
+    assert os.path.dirname(path) == str(cache_folder)
+    assert os.path.basename(path).startswith('plan.xlsx.') and path.endswith('.plan.pkl')
+    assert path != plan_cache.get_cache_path('/a/other.xlsx')
+    # Same file name in another folder gets its own cache
+    assert path != plan_cache.get_cache_path('/b/plan.xlsx')
+    assert path == plan_cache.get_cache_path('/a/../a/plan.xlsx')
+
+
+def test_fingerprint_is_stable_across_saves(tmp_path):
+    first, second = tmp_path / 'first.xlsx', tmp_path / 'second.xlsx'
+    write_workbook(first)
+    write_workbook(second)
+    assert plan_cache.get_workbook_fingerprint(str(first)) == plan_cache.get_workbook_fingerprint(str(second))
+
+
+def test_fingerprint_ignores_document_properties(tmp_path):
+    plain, titled = tmp_path / 'plain.xlsx', tmp_path / 'titled.xlsx'
+    write_workbook(plain)
+    write_workbook(titled, title='Release 42')
+    assert plan_cache.get_workbook_fingerprint(str(plain)) == plan_cache.get_workbook_fingerprint(str(titled))
+
+
+def test_fingerprint_tracks_the_changed_sheet(tmp_path):
+    before, after = tmp_path / 'before.xlsx', tmp_path / 'after.xlsx'
+    write_workbook(before, user='alice')
+    write_workbook(after, user='bob')
+    shared_before, sheets_before = plan_cache.get_workbook_fingerprint(str(before))
+    shared_after, sheets_after = plan_cache.get_workbook_fingerprint(str(after))
+    assert shared_before == shared_after
+    assert [name for name in sheets_before if sheets_before[name] != sheets_after[name]] == ['Data']
+
+
+def test_shared_hash_covers_the_sheet_list(tmp_path):
+    before, after = tmp_path / 'before.xlsx', tmp_path / 'after.xlsx'
+    write_workbook(before)
+    write_workbook(after)
+    workbook = openpyxl.load_workbook(after)
+    workbook.create_sheet('Extra')
+    workbook.save(after)
+    assert plan_cache.get_workbook_fingerprint(str(before))[0] != plan_cache.get_workbook_fingerprint(str(after))[0]
+
+
+def test_load_reuses_the_cache_until_the_workbook_changes(tmp_path, cache_folder):
+    path = str(tmp_path / 'plan.xlsx')
+    write_workbook(path)
+    plan = plan_cache.load_test_plan(path)
+    assert os.path.exists(plan_cache.get_cache_path(path))
+    assert plan_cache.is_cache_fresh(path)
+    assert plan_cache.load_test_plan(path).testcase_datarefs == plan.testcase_datarefs
+
+    write_workbook(path, user='bob')
+    os.utime(path, ns=(0, 0))
+    assert not plan_cache.is_cache_fresh(path)
+    reloaded = plan_cache.load_test_plan(path)
+    assert reloaded.get_data_value('Data', 2, 'user') == 'bob'
+
+
+def test_cache_of_another_version_is_ignored(tmp_path, cache_folder, monkeypatch):
+    path = str(tmp_path / 'plan.xlsx')
+    write_workbook(path)
+    plan_cache.load_test_plan(path)
+    monkeypatch.setattr(plan_cache, 'CACHE_VERSION', plan_cache.CACHE_VERSION + 1)
+    assert not plan_cache.is_cache_fresh(path)
+
+
+def test_freshness_reads_only_the_sidecar(tmp_path, cache_folder, monkeypatch):
+    path = str(tmp_path / 'plan.xlsx')
+    write_workbook(path)
+    plan_cache.load_test_plan(path)
+    assert os.path.exists(plan_cache.get_meta_path(plan_cache.get_cache_path(path)))
+    loads = []
+    read_cache = plan_cache._read_cache
+    monkeypatch.setattr(plan_cache, '_read_cache', lambda cache_path: loads.append(cache_path) or read_cache(cache_path))
+    assert plan_cache.is_cache_fresh(path)
+    assert loads == []
+    plan_cache.load_test_plan(path)
+    assert len(loads) == 1
+
+
+def test_resave_without_changes_keeps_the_pickled_plan(tmp_path, cache_folder):
+    path = str(tmp_path / 'plan.xlsx')
+    write_workbook(path)
+    plan_cache.load_test_plan(path)
+    cache_path = plan_cache.get_cache_path(path)
+    pickled_at = os.stat(cache_path).st_mtime_ns
+    os.utime(path, ns=(0, 0))
+    assert not plan_cache.is_cache_fresh(path)
+    plan_cache.load_test_plan(path)
+    assert plan_cache.is_cache_fresh(path)
+    assert os.stat(cache_path).st_mtime_ns == pickled_at
+
+
+def test_clear_removes_cache_and_sidecar(tmp_path, cache_folder):
+    path = str(tmp_path / 'plan.xlsx')
+    write_workbook(path)
+    plan_cache.load_test_plan(path)
+    plan_cache.clear_plan_cache(path)
+    assert not plan_cache.is_cache_fresh(path)
+    assert os.listdir(cache_folder) == []
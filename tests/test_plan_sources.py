@@ -0,0 +1,86 @@
+# test_plan_sources.py
+
+import os
+
+import pytest
+
+import modules.test_plan as test_plan
+from modules.plan_sources import (
+    CsvPlanSource, ExcelPlanSource, JsonPlanSource, SqlitePlanSource, export_plan_source, get_plan_source,
+)
+
+
+@pytest.fixture
+def sheets(make_sheets):
+    return make_sheets(
+        steps=[('TC01', 'Login', 'user', 'InputText'), ('TC01', 'Login', 'go', 'Click')],
+        locators=[('Login', 'user', '//input[@id="<<id>>"]', 2), ('Login', 'go', '//button', None)],
+        data={'user': ['alice', 'bob'], 'id': ['u1', 'u2'], 'go': [None, None]},
+    )
+
+
+def resolved(plan):
+    """Every step of every dataset as comparable tuples."""
+    return [(testcase, sheet, row_num, step['field'], step['xpath'], step['data'], step['wait_time'])
+            for testcase, refs in plan.testcase_datarefs.items()
+            for sheet, row_nums in refs
+            for row_num in row_nums
+            for step in plan.resolve_steps(testcase, sheet, row_num)]
+
+
+def open_handles(path):
+    return [fd for fd in os.listdir('/proc/self/fd') if os.path.realpath(f'/proc/self/fd/{fd}') == str(path)]
+
+
+@pytest.mark.parametrize('destination, source_class', [
+    ('plan.json', JsonPlanSource),
+    ('plan.sqlite', SqlitePlanSource),
+    ('plan_csv', CsvPlanSource),
+])
+def test_export_round_trip_compiles_the_same_plan(tmp_path, sheets, destination, source_class):
+    path = str(tmp_path / destination)
+    export_plan_source(sheets, path)
+    source = get_plan_source(path)
+    assert isinstance(source, source_class)
+    assert resolved(test_plan.TestPlan(source.read_sheets())) == resolved(test_plan.TestPlan(sheets))
+
+
+@pytest.mark.parametrize('destination', ['plan.json', 'plan.sqlite', 'plan_csv'])
+def test_read_only_the_named_sheets(tmp_path, sheets, destination):
+    path = str(tmp_path / destination)
+    export_plan_source(sheets, path)
+    assert set(get_plan_source(path).read_sheets(sheet_names=['Data'])) == {'Data'}
+
+
+def test_sqlite_connections_are_closed(tmp_path, sheets):
+    if not os.path.isdir('/proc/self/fd'):
+        pytest.skip('needs /proc to list open files')
+    path = tmp_path / 'plan.sqlite'
+    export_plan_source(sheets, str(path))
+    assert open_handles(path) == []
+    SqlitePlanSource(str(path)).read_sheets()
+    assert open_handles(path) == []
+    # Exporting again replaces the file in place
+    export_plan_source(sheets, str(path))
+    assert open_handles(path) == []
+
+
+def test_sqlite_driver_sheet_keeps_only_executed_testcases(tmp_path, sheets):
+    headers, rows = sheets['DriverSheet']
+    execute = headers.index('Execute')
+    skipped = tuple('N' if i == execute else value for i, value in enumerate(rows[0]))
+    sheets['DriverSheet'] = (headers, [skipped, rows[1]] + [
+        tuple('TC02' if value == 'TC01' else value for value in row) for row in rows])
+    path = str(tmp_path / 'plan.sqlite')
+    export_plan_source(sheets, path)
+    driver_rows = SqlitePlanSource(path).read_sheets(['DriverSheet'])['DriverSheet'][1]
+    assert {row[headers.index('TestCaseName')] for row in driver_rows} == {'TC02'}
+
+
+def test_plan_source_is_picked_by_path(tmp_path):
+    assert isinstance(get_plan_source(str(tmp_path / 'plan.xlsx')), ExcelPlanSource)
+    assert isinstance(get_plan_source(str(tmp_path / 'plan.db')), SqlitePlanSource)
+    with pytest.raises(ValueError, match='Unsupported test plan source'):
+        get_plan_source(str(tmp_path / 'plan.txt'))
+    with pytest.raises(ValueError, match='Unsupported export destination'):
+        export_plan_source({}, str(tmp_path / 'plan.txt'))
@@ -0,0 +1,101 @@
+# test_plan_stream.py
+
+import openpyxl
+import pytest
+
+from modules.plan_stream import FailedBlock, iter_execution_units, stream_execution_units
+from modules.plan_validator import run_preflight
+
+FIELDS = ('user', 'row')
+
+
+@pytest.fixture
+def workbook(tmp_path, make_sheets):
+    """Three testcases on 'Data'; TC02 is rebound to 'Other', which has no column for the <<row_id>> placeholder."""
+    sheets = make_sheets(
+        steps=[(testcase, 'Login', field, 'InputText') for testcase in ('TC01', 'TC02', 'TC03') for field in FIELDS],
+        locators=[('Login', 'user', '//input', None), ('Login', 'row', '//tr[@id="<<row_id>>"]', None)],
+        data={'user': ['alice', 'bob'], 'row': ['r1', 'r2'], 'row_id': ['1', '2']},
+    )
+    headers, rows = sheets['DriverSheet']
+    ref = headers.index('TestDataSheetReference')
+    sheets['DriverSheet'] = (headers, [row[:ref] + ('Other!A2:Other!A3',) if row[2] == 'TC02' and row[ref] else row
+                                       for row in rows])
+    sheets['Other'] = (['user', 'row'], [('carol', 'r3'), ('dave', 'r4')])
+    path = tmp_path / 'plan.xlsx'
+    book = openpyxl.Workbook()
+    book.remove(book.active)
+    for name, (sheet_headers, sheet_rows) in sheets.items():
+        sheet = book.create_sheet(name)
+        sheet.append(sheet_headers)
+        for row in sheet_rows:
+            sheet.append(list(row))
+    book.save(path)
+    return str(path)
+
+
+def summary(units):
+    return [(unit['testcase'], unit['sheet'], unit['row_num'], unit['steps'] is not None) for unit in units]
+
+
+def test_a_block_that_does_not_compile_comes_out_as_failed_units(workbook):
+    units = list(stream_execution_units(workbook))
+    assert summary(units) == [
+        ('TC01', 'Data', 2, True), ('TC01', 'Data', 3, True),
+        ('TC02', 'Other', 2, False), ('TC02', 'Other', 3, False),
+        ('TC03', 'Data', 2, True), ('TC03', 'Data', 3, True),
+    ]
+    failed = units[2]['plan']
+    assert isinstance(failed, FailedBlock)
+    assert failed.is_row_enabled('Other', 2)
+    with pytest.raises(ValueError, match=r"<<row_id>> has no column in data sheet 'Other'"):
+        failed.resolve_steps('TC02', 'Other', 2)
+
+
+def test_units_are_bound_per_dataset(workbook):
+    units = list(stream_execution_units(workbook))
+    assert [step['data'] for step in units[1]['steps']] == ['bob', 'r2']
+    assert units[1]['steps'][1]['xpath'] == '//tr[@id="2"]'
+    assert [unit['dataset_number'] for unit in units[:2]] == [1, 2]
+
+
+def test_validate_runs_per_block_and_abort_fails_only_that_block(workbook):
+    validated = []
+
+    def validate(plan):
+        validated.append(list(plan.testcase_datarefs))
+        if 'TC03' in plan.testcase_datarefs:
+            raise ValueError('Plan validation failed')
+
+    units = list(stream_execution_units(workbook, validate=validate))
+    assert validated == [['TC01'], ['TC03']]
+    assert [unit['steps'] is not None for unit in units] == [True, True, False, False, False, False]
+
+
+def test_stream_with_preflight(workbook):
+    units = list(stream_execution_units(workbook, validate=lambda plan: run_preflight(plan, abort_on_error=True)))
+    assert len(units) == 6
+
+
+def test_failed_block_units_match_iter_execution_units():
+    block = FailedBlock({'TC09': [('Data', [2, 3])]}, 'broken')
+    assert [(unit['testcase'], unit['row_num'], unit['dataset_number'], unit['steps']) for unit in iter_execution_units(block)] == [
+        ('TC09', 2, 1, None), ('TC09', 3, 2, None)]
+
+
+def test_workbook_errors_are_raised_before_the_stream_starts(workbook):
+    book = openpyxl.load_workbook(workbook)
+    del book['CommonSheet']
+    book.save(workbook)
+    with pytest.raises(ValueError, match="Sheet 'CommonSheet' not found"):
+        stream_execution_units(workbook)
+
+
+def test_component_cycles_are_raised_before_the_stream_starts(workbook):
+    book = openpyxl.load_workbook(workbook)
+    sheet = book.create_sheet('Components')
+    sheet.append(['CompomentName', 'Screen', 'Field', 'Action'])
+    sheet.append(['Loop', 'Login', 'Loop', 'RunComponent'])
+    book.save(workbook)
+    with pytest.raises(ValueError, match='Component cycle detected: Loop -> Loop'):
+        stream_execution_units(workbook)
@@ -0,0 +1,112 @@
+# test_plan_validator.py
+
+import pytest
+
+import modules.plan_validator as plan_validator
+import modules.test_plan as test_plan
+from modules.plan_validator import run_preflight, validate_plan
+
+
+@pytest.fixture(autouse=True)
+def no_load_failures(monkeypatch):
+    """Customization modules that cannot load here (no selenium) are not what these tests check."""
+    monkeypatch.setattr(plan_validator, 'load_failures', dict)
+
+
+def test_unknown_wait_condition_is_a_step_error(make_sheets):
+    sheets = make_sheets(
+        steps=[('TC01', 'Login', 'user', 'InputText'), ('TC01', 'Login', 'submit', 'ClickElement')],
+        locators=[('Login', 'user', '//input[@id="user"]', None), ('Login', 'submit', '//button', 'clikable')],
+        data={'user': ['alice']},
+    )
+    plan = test_plan.TestPlan(sheets)
+    errors = [p for p in validate_plan(plan) if p['level'] == 'error']
+    assert len(errors) == 1
+    assert errors[0]['testcase'] == 'TC01'
+    assert errors[0]['step'] == 'Login/submit'
+    assert "Unknown wait condition 'clikable'" in errors[0]['message']
+
+
+def plan_with(make_sheets, steps, locators=None, data=None, **kwargs):
+    locators = locators if locators is not None else [('Login', 'user', '//input', None), ('Login', 'submit', '//button', None)]
+    return test_plan.TestPlan(make_sheets(steps=steps, locators=locators, data=data or {'user': ['alice']}, **kwargs))
+
+
+def problems_of(plan, level='error'):
+    return [(p['testcase'], p['step'], p['message']) for p in validate_plan(plan) if p['level'] == level]
+
+
+def test_clean_plan_has_no_problems(make_sheets):
+    plan = plan_with(make_sheets, [('TC01', 'Login', 'user', 'InputText'), ('TC01', 'Login', 'submit', 'ClickElement')])
+    assert validate_plan(plan) == []
+
+
+def test_unknown_action_keyword_is_a_step_error(make_sheets):
+    plan = plan_with(make_sheets, [('TC01', 'Login', 'user', 'InputText'), ('TC01', 'Login', 'submit', 'ClikElement')])
+    assert problems_of(plan) == [('TC01', 'Login/submit', "Unknown action 'ClikElement'")]
+
+
+def test_action_that_needs_a_locator_without_one_is_an_error(make_sheets):
+    plan = plan_with(make_sheets, [('TC01', 'Login', 'user', 'InputText'), ('TC01', 'Login', 'submit', 'ClickElement')],
+                     locators=[('Login', 'user', '//input', None)])
+    assert problems_of(plan) == [('TC01', 'Login/submit', "No CommonSheet locator for (Login, submit)")]
+
+
+def test_action_that_uses_data_without_a_column_is_an_error(make_sheets):
+    plan = plan_with(make_sheets, [('TC01', 'Login', 'user', 'InputText')], data={'name': ['alice']})
+    assert problems_of(plan) == [('TC01', 'Login/user', "Data sheet 'Data' has no column 'user'")]
+
+
+def test_unknown_component_is_a_testcase_error(make_sheets):
+    sheets = make_sheets(steps=[('TC01', 'Login', 'user', 'InputText')],
+                         locators=[('Login', 'user', '//input', None)], data={'user': ['alice']},
+                         components={'SignIn': [('Login', 'user', 'InputText')]})
+    headers, rows = sheets['DriverSheet']
+    component = headers.index('ComponentName')
+    sheets['DriverSheet'] = (headers, [tuple('Checkout' if i == component else value for i, value in enumerate(row))
+                                       for row in rows])
+    assert problems_of(test_plan.TestPlan(sheets)) == [('TC01', '', "Component 'Checkout' not found in Components sheet")]
+
+
+def test_missing_data_rows_are_a_warning(make_sheets):
+    sheets = make_sheets(steps=[('TC01', 'Login', 'user', 'InputText')],
+                         locators=[('Login', 'user', '//input', None)], data={'user': ['alice']})
+    headers, rows = sheets['DriverSheet']
+    dataref = headers.index('TestDataSheetReference')
+    sheets['DriverSheet'] = (headers, [tuple('Data!A2:Data!A4' if i == dataref else value for i, value in enumerate(row))
+                                       for row in rows])
+    plan = test_plan.TestPlan(sheets)
+    assert problems_of(plan) == []
+    assert problems_of(plan, 'warning') == [('TC01', '', "Data sheet 'Data' has no row(s) [3, 4]")]
+
+
+def test_preflight_warns_and_continues_by_default(make_sheets, reporting, capsys):
+    plan = plan_with(make_sheets, [('TC01', 'Login', 'user', 'InputText'), ('TC01', 'Login', 'submit', 'ClikElement')])
+    problems = run_preflight(plan, reporting)
+    assert [p['message'] for p in problems] == ["Unknown action 'ClikElement'"]
+    assert len(reporting.errors) == 1
+    assert "1 error(s), 0 warning(s)" in reporting.errors[0]
+    assert "Unknown action 'ClikElement'" in capsys.readouterr().out
+
+
+def test_preflight_aborts_on_errors_when_strict(make_sheets, reporting):
+    plan = plan_with(make_sheets, [('TC01', 'Login', 'user', 'InputText'), ('TC01', 'Login', 'submit', 'ClikElement')])
+    with pytest.raises(ValueError, match='Plan validation failed'):
+        run_preflight(plan, reporting, abort_on_error=True)
+    assert len(reporting.errors) == 1
+
+
+def test_preflight_does_not_abort_on_warnings_only(make_sheets, reporting, monkeypatch):
+    monkeypatch.setattr(plan_validator, 'load_failures', lambda: {'customization.custom_actions': 'broken'})
+    plan = plan_with(make_sheets, [('TC01', 'Login', 'user', 'InputText'), ('TC01', 'Login', 'submit', 'ClickElement')])
+    problems = run_preflight(plan, reporting, abort_on_error=True)
+    assert [(p['level'], p['message']) for p in problems] == [
+        ('warning', 'Could not load customization.custom_actions: broken')]
+    assert "0 error(s), 1 warning(s)" in reporting.errors[0]
+
+
+def test_clean_preflight_is_logged_as_info(make_sheets, reporting):
+    plan = plan_with(make_sheets, [('TC01', 'Login', 'user', 'InputText'), ('TC01', 'Login', 'submit', 'ClickElement')])
+    assert run_preflight(plan, reporting, abort_on_error=True) == []
+    assert reporting.errors == []
+    assert reporting.infos[0].endswith("0 error(s), 0 warning(s)")
@@ -0,0 +1,129 @@
+# test_playwright_host.py
+
+import pytest
+
+playwright_actions = pytest.importorskip('modules.playwright_actions')
+
+
+class FakePage:
+    def __init__(self):
+        self.closed = False
+
+    def on(self, event, handler):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+class FakeContext:
+    def __init__(self, number):
+        self.number = number
+        self.init_scripts = []
+        self.pages = []
+        self.closed = False
+
+    def add_init_script(self, script):
+        self.init_scripts.append(script)
+
+    def on(self, event, handler):
+        pass
+
+    def new_page(self):
+        self.pages.append(FakePage())
+        return self.pages[-1]
+
+    def close(self):
+        self.closed = True
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.contexts = []
+        self.closed = False
+
+    def new_context(self):
+        self.contexts.append(FakeContext(len(self.contexts) + 1))
+        return self.contexts[-1]
+
+    def close(self):
+        self.closed = True
+
+
+class FakePlaywright:
+    """sync_playwright() stand-in: counts starts, launches and stops."""
+    def __init__(self):
+        self.starts = 0
+        self.stops = 0
+        self.browsers = []
+        self.chromium = self
+
+    def start(self):
+        self.starts += 1
+        return self
+
+    def launch(self, headless=False):
+        self.browsers.append(FakeBrowser())
+        return self.browsers[-1]
+
+    def stop(self):
+        self.stops += 1
+
+
+@pytest.fixture
+def fake_playwright(monkeypatch):
+    fake = FakePlaywright()
+    monkeypatch.setattr(playwright_actions, 'sync_playwright', lambda: fake)
+    monkeypatch.setattr(playwright_actions, '_shared_hosts', {})
+    return fake
+
+
+def test_instances_on_a_shared_host_get_their_own_context(fake_playwright, reporting):
+    host = playwright_actions.get_shared_browser_host()
+    first = playwright_actions.PlaywrightActions(reporting, host=host)
+    second = playwright_actions.PlaywrightActions(reporting, host=playwright_actions.get_shared_browser_host())
+    assert (fake_playwright.starts, len(fake_playwright.browsers)) == (1, 1)
+    assert first.context is not second.context
+    assert fake_playwright.browsers[0].contexts == [first.context, second.context]
+    assert first.context.init_scripts == [playwright_actions.SETTLE_INSTALL_JS]
+
+
+def test_quit_on_a_shared_host_closes_only_the_context(fake_playwright, reporting):
+    host = playwright_actions.get_shared_browser_host()
+    actions = playwright_actions.PlaywrightActions(reporting, host=host)
+    page, context = actions.page, actions.context
+    actions.quit()
+    assert page.closed and context.closed
+    assert not fake_playwright.browsers[0].closed and fake_playwright.stops == 0
+    # The next dataset opens a context on the same browser
+    playwright_actions.PlaywrightActions(reporting, host=playwright_actions.get_shared_browser_host())
+    assert len(fake_playwright.browsers) == 1 and len(fake_playwright.browsers[0].contexts) == 2
+
+
+def test_reset_replaces_the_context(fake_playwright, reporting):
+    actions = playwright_actions.PlaywrightActions(reporting, host=playwright_actions.get_shared_browser_host())
+    old = actions.context
+    actions.element_cache.put('//input', 'handle')
+    assert actions.reset_session() == (True, "Browser context replaced for reuse.")
+    assert old.closed and not actions.context.closed
+    assert actions.page is actions.context.pages[0] and actions.driver is actions.page
+    assert actions.context.init_scripts == [playwright_actions.SETTLE_INSTALL_JS]
+    assert actions.element_cache.get('//input') is None
+    assert not fake_playwright.browsers[0].closed
+
+
+def test_closed_host_is_launched_again(fake_playwright):
+    host = playwright_actions.get_shared_browser_host()
+    host.close()
+    assert fake_playwright.browsers[0].closed and fake_playwright.stops == 1
+    assert playwright_actions.get_shared_browser_host() is not host
+    assert len(fake_playwright.browsers) == 2
+    # Headed and headless runs do not share a browser
+    playwright_actions.get_shared_browser_host(headless=True)
+    assert len(fake_playwright.browsers) == 3
+
+
+def test_without_a_host_quit_stops_the_own_browser(fake_playwright, reporting):
+    actions = playwright_actions.PlaywrightActions(reporting)
+    actions.quit()
+    assert fake_playwright.browsers[0].closed and fake_playwright.stops == 1
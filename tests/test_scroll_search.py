@@ -0,0 +1,89 @@
+# test_scroll_search.py
+
+import pytest
+
+import modules.automation_process as automation_process
+
+
+@pytest.fixture
+def selenium_actions():
+    return pytest.importorskip('modules.selenium_actions')
+
+
+class ScrollDriver:
+    """Answers the scroll search with a canned result; 'script timeout' raises like WebDriver would."""
+    def __init__(self, result, error_class):
+        self.result = result
+        self.error_class = error_class
+        self.calls = []
+
+    def execute_async_script(self, script, *args):
+        self.calls.append((script, args))
+        if self.result == 'script timeout':
+            raise self.error_class('script timeout')
+        return self.result
+
+
+@pytest.fixture
+def backend(selenium_actions, reporting):
+    def build(result):
+        actions = selenium_actions.SeleniumActions.__new__(selenium_actions.SeleniumActions)
+        actions.reporting = reporting
+        actions.driver = ScrollDriver(result, selenium_actions.WebDriverException)
+        return actions
+    return build
+
+
+def test_scroll_search_is_one_budgeted_script_call(selenium_actions, backend, reporting):
+    actions = backend({'status': 'found', 'element': 'row 500', 'jumps': 12})
+    assert actions._scroll_to_find(selenium_actions.By.XPATH, '//tr[500]') == 'row 500'
+    ((script, args),) = actions.driver.calls
+    assert script == selenium_actions.SCROLL_SEARCH_JS
+    # selector, is-XPath, budget, pause after each jump, wait for growth at the end (ms)
+    assert args == ('//tr[500]', True, 5000, 50, 500)
+    assert actions.scroll_searches == 1
+    assert reporting.infos == ["Element found after scrolling: //tr[500] (12 jump(s))"]
+
+
+def test_budget_stays_below_the_webdriver_script_timeout(selenium_actions):
+    actions = selenium_actions.SeleniumActions
+    assert actions.scroll_search_budget + actions.scroll_search_growth_wait < 30
+
+
+def test_configured_budget_is_passed_in_milliseconds(selenium_actions, backend):
+    actions = backend({'status': 'missing', 'jumps': 3})
+    actions.scroll_search_budget = 1.5
+    assert actions._scroll_to_find(selenium_actions.By.CSS_SELECTOR, '.row-500') is None
+    assert actions.driver.calls[0][1][:3] == ('.row-500', False, 1500)
+
+
+@pytest.mark.parametrize('result, message', [
+    ({'status': 'timeout', 'jumps': 80}, "Element not found within the 5s scroll search budget: //tr[500]"),
+    ({'status': 'missing', 'jumps': 4}, "Element not found after scrolling every container: //tr[500]"),
+    ({'status': 'error', 'message': 'SyntaxError'}, "Scroll search failed for //tr[500]: SyntaxError"),
+    ('script timeout', "Scroll search failed for //tr[500]: script timeout"),
+])
+def test_element_not_found_is_logged_with_the_reason(selenium_actions, backend, reporting, result, message):
+    actions = backend(result)
+    assert actions._scroll_to_find(selenium_actions.By.XPATH, '//tr[500]') is None
+    assert reporting.infos == [message]
+
+
+class ScrollingActions:
+    """Finds '//far' only by a scroll search."""
+    scroll_searches = 0
+
+    def element_click(self, xpath):
+        if xpath == '//far':
+            self.scroll_searches += 1
+        return True, None
+
+
+def test_steps_found_by_scrolling_are_marked(reporting, monkeypatch):
+    monkeypatch.setattr(automation_process, 'get_post_action_wait', lambda: {'strategy': 'none'})
+    monkeypatch.delenv('CURRENT_REPORT_FOLDER', raising=False)
+    actions = ScrollingActions()
+    located_by = [automation_process.process_step('TC01', 'List', field, 'ClickElement', xpath, None, None,
+                                                  reporting, actions)['located_by']
+                  for field, xpath in (('near', '//near'), ('far', '//far'))]
+    assert located_by == ['', 'scroll']
@@ -0,0 +1,161 @@
+# test_session_pool.py
+
+import pytest
+
+from modules.session_pool import SessionPool, format_session_stats
+
+
+class FakeSession:
+    """Stands in for an actions instance: counts resets and quits; reset fails when told to."""
+    def __init__(self, number):
+        self.number = number
+        self.resets = 0
+        self.quit_calls = 0
+        self.reset_fails = False
+
+    def reset_session(self):
+        self.resets += 1
+        return (False, 'tab crashed') if self.reset_fails else (True, 'reset')
+
+    def quit(self):
+        self.quit_calls += 1
+
+
+@pytest.fixture
+def pool(reporting):
+    launched = []
+
+    def factory():
+        launched.append(FakeSession(len(launched) + 1))
+        return launched[-1]
+
+    pool = SessionPool(factory=factory, max_uses=3, reporting=reporting)
+    pool.launched = launched
+    return pool
+
+
+def test_released_session_is_reset_and_reused(pool):
+    first = pool.acquire()
+    assert pool.release(first) is not None
+    assert pool.acquire() is first
+    assert first.resets == 1
+    assert pool.stats['launched'] == 1 and pool.stats['reused'] == 1
+    assert len(pool.stats['reset_times']) == 1
+
+
+def test_session_is_recycled_after_max_uses(pool):
+    sessions = []
+    for _ in range(4):
+        session = pool.acquire()
+        sessions.append(session)
+        pool.release(session)
+    # Three datasets on the first browser, then it is quit and a new one launched
+    assert [session.number for session in sessions] == [1, 1, 1, 2]
+    assert pool.launched[0].resets == 2 and pool.launched[0].quit_calls == 1
+    assert pool.stats == dict(pool.stats, launched=2, reused=2, recycled=1)
+
+
+def test_failed_dataset_recycles_without_reset(pool):
+    session = pool.acquire()
+    assert pool.release(session, failed=True) is None
+    assert (session.resets, session.quit_calls) == (0, 1)
+    assert pool.acquire() is not session
+
+
+def test_failed_reset_recycles(pool, reporting):
+    session = pool.acquire()
+    session.reset_fails = True
+    assert pool.release(session) is None
+    assert session.quit_calls == 1
+    assert pool.stats['recycled'] == 1
+    assert reporting.infos == ['Session reset failed, recycling browser: tab crashed']
+
+
+def test_close_quits_idle_sessions(pool):
+    first, second = pool.acquire(), pool.acquire()
+    pool.release(first)
+    pool.release(second)
+    pool.close()
+    assert (first.quit_calls, second.quit_calls) == (1, 1)
+    assert pool.acquire().number == 3
+
+
+def test_simulated_backend_reset_restores_the_preset(simulated):
+    actions = simulated(elements={'//input': {'value': 'preset'}})
+    actions.set_value('//input', 'changed')
+    actions.driver.current_url = 'https://app.example/form'
+    assert actions.reset_session()[0]
+    assert actions.driver.current_url == 'about:blank'
+    assert actions.get_value('//input') == (True, 'preset')
+
+
+def test_format_session_stats():
+    assert format_session_stats(2, 5, 1, [0.010, 0.030]) == \
+        "Browser sessions: 2 launched, 5 reused, 1 recycled, 2 reset(s) avg 20 ms / max 30 ms"
+    assert format_session_stats(1, 0, 0, []) == "Browser sessions: 1 launched, 0 reused, 0 recycled, no resets"
+
+
+class FakeSwitch:
+    def __init__(self, driver):
+        self.driver = driver
+
+    def window(self, handle):
+        self.driver.current_window_handle = handle
+
+    def new_window(self, kind):
+        self.driver.tabs['fresh'] = ['about:blank']
+        self.driver.current_window_handle = 'fresh'
+
+
+class FakeChromiumDriver:
+    """WebDriver stand-in with tabs {handle: [urls visited]} and a CDP command log."""
+    def __init__(self, tabs):
+        self.tabs = dict(tabs)
+        self.current_window_handle = next(iter(self.tabs))
+        self.switch_to = FakeSwitch(self)
+        self.cdp = []
+
+    @property
+    def window_handles(self):
+        return list(self.tabs)
+
+    @property
+    def current_url(self):
+        return self.tabs[self.current_window_handle][-1]
+
+    def close(self):
+        del self.tabs[self.current_window_handle]
+
+    def execute_cdp_cmd(self, command, params):
+        self.cdp.append((command, params))
+        if command == 'Page.getNavigationHistory':
+            return {'entries': [{'url': url} for url in self.tabs[self.current_window_handle]]}
+        return {}
+
+
+def test_selenium_reset_clears_every_visited_origin(reporting):
+    selenium_actions = pytest.importorskip('modules.selenium_actions')
+    from modules.element_cache import ElementCache
+    actions = selenium_actions.SeleniumActions.__new__(selenium_actions.SeleniumActions)
+    actions.reporting = reporting
+    actions.element_cache = ElementCache()
+    actions.driver = FakeChromiumDriver({
+        'main': ['about:blank', 'https://app.example/login', 'https://sso.example:8443/auth', 'https://app.example/home'],
+        'popup': ['https://pay.example/checkout'],
+    })
+    success, message = actions.reset_session()
+    assert success
+    assert list(actions.driver.tabs) == ['fresh'] and actions.driver.current_window_handle == 'fresh'
+    cleared = [params['origin'] for command, params in actions.driver.cdp if command == 'Storage.clearDataForOrigin']
+    assert cleared == ['https://app.example', 'https://pay.example', 'https://sso.example:8443']
+    assert actions.driver.cdp[-1] == ('Network.clearBrowserCookies', {})
+
+
+def test_selenium_reset_without_cdp_asks_for_a_recycle(reporting):
+    selenium_actions = pytest.importorskip('modules.selenium_actions')
+    from modules.element_cache import ElementCache
+    actions = selenium_actions.SeleniumActions.__new__(selenium_actions.SeleniumActions)
+    actions.reporting = reporting
+    actions.element_cache = ElementCache()
+    actions.driver = object()
+    assert not actions.reset_session()[0]
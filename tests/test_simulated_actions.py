@@ -0,0 +1,99 @@
+# test_simulated_actions.py
+
+import pytest
+
+import modules.middleware as middleware
+import modules.simulated_actions as simulated_actions
+import modules.test_plan as test_plan
+from modules.simulated_actions import SimulatedActions
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Delays the backend would have slept, without sleeping."""
+    delays = []
+    monkeypatch.setattr(simulated_actions.time, 'sleep', delays.append)
+    return delays
+
+
+def test_every_browser_call_gets_the_configured_latency(simulated, sleeps):
+    actions = simulated(latency_ms=20)
+    actions.open_url('https://app.example')
+    actions.set_value('//input', 'alice')
+    actions.get_value('//input')
+    assert sleeps == [0.02] * 3
+
+
+def test_batched_fill_is_one_browser_call(simulated, sleeps):
+    actions = simulated(latency_ms=20)
+    assert actions.fill_fields([('//first', 'Ann'), ('//last', 'Lee')]) == [(True, None), (True, None)]
+    assert sleeps == [0.02]
+
+
+def test_jitter_is_bounded_and_repeatable_with_a_seed(simulated, sleeps):
+    for _ in range(2):
+        actions = simulated(latency_ms=10, jitter_ms=40, seed=7)
+        for _ in range(5):
+            actions.scroll_page()
+    first_run, second_run = sleeps[:5], sleeps[5:]
+    assert first_run == second_run
+    assert all(0.01 <= delay <= 0.05 for delay in first_run)
+    assert len(set(first_run)) > 1
+
+
+def test_no_latency_means_no_sleep(simulated, sleeps):
+    simulated().element_click('//button')
+    assert sleeps == []
+
+
+def test_fail_selectors_always_fail(simulated, reporting):
+    actions = simulated(fail_selectors=['//button'])
+    assert actions.element_click('//button') == \
+        (False, "Failed to click element //button: Simulated failure for element: //button")
+    assert actions.element_click('//other') == (True, None)
+    assert reporting.errors == ["Failed to click element //button: Simulated failure for element: //button"]
+
+
+def test_failure_rate_injects_repeatable_random_failures(simulated):
+    def outcomes():
+        actions = simulated(failure_rate=0.5, seed=3)
+        return [actions.set_value(f'//input[{i}]', 'x')[0] for i in range(40)]
+
+    first = outcomes()
+    assert first == outcomes()
+    assert 0 < first.count(False) < 40
+    assert all(simulated(failure_rate=1.0).get_value('//input')[1].startswith(
+        "Failed to get value: Simulated random failure") for _ in range(3))
+
+
+def test_unknown_elements_are_missing_without_auto_create(simulated):
+    actions = simulated(auto_create_elements=False, elements={'//known': {'value': 'v'}})
+    assert actions.get_value('//unknown') == (False, "Failed to get value: Element not found: //unknown")
+    assert actions.element_exists('//unknown') == (True, False)
+    assert actions.get_value('//known') == (True, 'v')
+
+
+def test_preset_elements_are_checked_and_unknown_ones_adopt_the_expected_value(simulated):
+    actions = simulated(elements={'//total': {'value': '10'}, '//submit': {'enabled': False}})
+    assert actions.assert_value('//total', '12') == (False, "Assertion failed: Expected '12', got '10'")
+    assert actions.assert_value('//name', 'Ann') == (True, None)
+    assert actions.get_value('//name') == (True, 'Ann')
+    assert actions.element_click('//submit') == (False, "Failed to click element //submit: element is not clickable")
+
+
+def test_framework_simulated_uses_the_config_section(monkeypatch):
+    monkeypatch.setattr(middleware, 'get_config', lambda: {'framework': 'simulated', 'simulated': {'latency_ms': 5}})
+    actions = middleware.get_framework_class()
+    assert isinstance(actions, SimulatedActions)
+    assert actions.settings['latency_ms'] == 5 and actions.settings['auto_create_elements'] is True
+
+
+def test_plan_runs_end_to_end_with_injected_failures(make_sheets, run_plan, simulated):
+    plan = test_plan.TestPlan(make_sheets(
+        steps=[('TC01', 'Login', 'user', 'InputText'), ('TC01', 'Login', 'go', 'ClickElement')],
+        locators=[('Login', 'user', '//input', None), ('Login', 'go', '//button', None)],
+        data={'user': ['alice', 'bob'], 'go': [None, None]},
+    ))
+    results = run_plan(plan, simulated(fail_selectors=['//button']))
+    assert [(result['field'], result['execution_status']) for result in results] == \
+        [('user', 'pass'), ('go', 'fail')] * 2
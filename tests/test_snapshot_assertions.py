@@ -0,0 +1,50 @@
+# test_snapshot_assertions.py
+
+import modules.test_plan as test_plan
+from modules.step_timing import PHASE_COLUMNS
+
+FIELDS = ('first', 'last', 'email')
+
+
+def check_plan(make_sheets):
+    return test_plan.TestPlan(make_sheets(
+        steps=[('TC01', 'Review', field, 'AssertValue') for field in FIELDS],
+        locators=[('Review', field, f'//*[@id="{field}"]', None) for field in FIELDS],
+        data={'first': ['Ann'], 'last': ['Lee'], 'email': ['ann@example.com']},
+    ))
+
+
+def page(**values):
+    return {f'//*[@id="{field}"]': {'value': value} for field, value in values.items()}
+
+
+def test_run_is_answered_from_one_snapshot(make_sheets, run_plan, simulated):
+    actions = simulated(elements=page(first='Ann', last='Lee', email='ann@example.com'))
+    reads = []
+    read_values = actions.read_values
+    actions.read_values = lambda selectors: reads.append(selectors) or read_values(selectors)
+    results = run_plan(check_plan(make_sheets), actions, snapshot_assertions_enabled=True)
+    assert reads == [[f'//*[@id="{field}"]' for field in FIELDS]]
+    assert [result['execution_status'] for result in results] == ['pass'] * 3
+    assert [result['located_by'] for result in results] == ['snapshot'] * 3
+
+
+def test_snapshot_time_is_its_own_phase_on_the_first_step(make_sheets, run_plan, simulated):
+    assert 'snapshot_ms' in PHASE_COLUMNS
+    actions = simulated(elements=page(first='Ann', last='Lee', email='ann@example.com'))
+    results = run_plan(check_plan(make_sheets), actions, snapshot_assertions_enabled=True)
+    assert results[0]['snapshot_ms'] > 0
+    assert [result['snapshot_ms'] for result in results[1:]] == [0.0, 0.0]
+    assert [result['locate_ms'] for result in results] == [0.0] * 3
+
+
+def test_snapshot_failures_read_like_the_backend(make_sheets, run_plan, simulated):
+    elements = page(first='Ann', last='Lea', email='ann@example.com')
+    results = run_plan(check_plan(make_sheets), simulated(elements=elements), snapshot_assertions_enabled=True)
+    from_snapshot = [(result['execution_status'], result['error message']) for result in results]
+    results.clear()
+    run_plan(check_plan(make_sheets), simulated(elements=elements))
+    step_by_step = [(result['execution_status'], result['error message']) for result in results]
+    assert from_snapshot == step_by_step == [
+        ('pass', ''), ('fail', "Assertion failed: Expected 'Lee', got 'Lea'"), ('pass', '')]
+    assert [result['located_by'] for result in results] == [''] * 3
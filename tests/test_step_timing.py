@@ -0,0 +1,127 @@
+# test_step_timing.py
+
+import asyncio
+
+import pytest
+
+import modules.automation_process as automation_process
+import modules.step_timing as step_timing
+from modules.step_timing import (
+    PHASE_COLUMNS, TOTAL_COLUMN, StepTimer, format_timing_summary, summarize_step_timings, timed_locate,
+)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """perf_counter under test control: clock.tick(seconds) moves it on."""
+    class Clock:
+        now = 100.0
+
+        def tick(self, seconds):
+            self.now += seconds
+
+    fake = Clock()
+    monkeypatch.setattr(step_timing.time, 'perf_counter', lambda: fake.now)
+    return fake
+
+
+def test_phases_accumulate_into_millisecond_columns(clock):
+    timer = StepTimer()
+    with timer.phase('lookup'):
+        clock.tick(0.002)
+    with timer.phase('action'):
+        clock.tick(0.1)
+    with timer.phase('action'):
+        clock.tick(0.05)
+    timer.add('locate', 0.03)
+    timer.add('action', -0.03)
+    clock.tick(0.001)
+    columns = timer.columns()
+    assert list(columns) == list(PHASE_COLUMNS) + [TOTAL_COLUMN]
+    assert (columns['lookup_ms'], columns['locate_ms'], columns['action_ms'], columns['settle_ms']) == (2.0, 30.0, 120.0, 0.0)
+    # Time outside any phase still counts in the total
+    assert columns[TOTAL_COLUMN] == 153.0
+    assert timer.columns(total=0.04)[TOTAL_COLUMN] == 40.0
+
+
+def test_phase_is_timed_when_the_step_raises(clock):
+    timer = StepTimer()
+    with pytest.raises(RuntimeError):
+        with timer.phase('action'):
+            clock.tick(0.25)
+            raise RuntimeError('element gone')
+    assert timer.columns()['action_ms'] == 250.0
+
+
+class Backend:
+    def __init__(self, clock):
+        self.clock = clock
+
+    @timed_locate
+    def _find_element(self, selector, retry=True):
+        self.clock.tick(0.2)
+        # A retry through the wrapped method is counted once
+        return self._find_element(selector, retry=False) if retry else selector
+
+    @timed_locate
+    async def _find_element_async(self, selector):
+        self.clock.tick(0.3)
+        return selector
+
+
+def test_timed_locate_adds_to_locate_seconds_once(clock):
+    backend = Backend(clock)
+    assert backend._find_element('//input') == '//input'
+    assert backend.locate_seconds == pytest.approx(0.4)
+    assert asyncio.run(backend._find_element_async('//a')) == '//a'
+    assert backend.locate_seconds == pytest.approx(0.7)
+
+
+def test_process_step_reports_locate_apart_from_action(simulated, reporting, monkeypatch):
+    monkeypatch.setattr(automation_process, 'get_post_action_wait', lambda: {'strategy': 'none'})
+    monkeypatch.delenv('CURRENT_REPORT_FOLDER', raising=False)
+    result = automation_process.process_step('TC01', 'Form', 'name', 'InputText', '//input', 'Ann', None, reporting,
+                                             simulated(latency_ms=30))
+    assert result['execution_status'] == 'pass'
+    assert set(PHASE_COLUMNS) | {TOTAL_COLUMN} <= set(result)
+    # The simulated latency is spent in _find_element
+    assert result['locate_ms'] >= 25 and result['action_ms'] < result['locate_ms']
+    assert result[TOTAL_COLUMN] >= sum(result[column] for column in PHASE_COLUMNS) - 0.01
+
+
+def timed_step(testcase, dataset, field, xpath, total, pre_wait=0.0, locate=0.0, action=0.0):
+    row = dict.fromkeys(PHASE_COLUMNS, 0.0)
+    row.update({'testcasename': testcase, 'dataset number': dataset, 'screen': 'Form', 'field': field,
+                'action': 'InputText', 'xpath': xpath, 'pre_wait_ms': pre_wait, 'locate_ms': locate,
+                'action_ms': action, TOTAL_COLUMN: total})
+    return row
+
+
+def test_summary_ranks_slowest_steps_and_locators():
+    steps = [
+        timed_step('TC01', 1, 'name', '//name', 50, locate=40, action=5),
+        timed_step('TC01', 1, 'city', '//city', 300, pre_wait=200, locate=60, action=10),
+        timed_step('TC01', 2, 'name', '//name', 20, locate=10, action=5),
+        timed_step('TC01', 2, 'city', '//city', 30, locate=20, action=5),
+        {'testcasename': 'TC01', 'field': 'legacy', 'xpath': '//old'},  # a result without timings
+    ]
+    summary = summarize_step_timings(steps, top=2)
+    assert summary['steps'] == 4
+    assert summary['phases']['locate'] == 130 and summary['phases']['pre_wait'] == 200
+    assert [(step['field'], step['dataset number']) for step in summary['slowest_steps']] == [('city', 1), ('name', 1)]
+    assert [(entry['xpath'], entry['count'], entry['mean_ms'], entry['max_ms'])
+            for entry in summary['slowest_locators']] == [('//city', 2, 147.5, 270), ('//name', 2, 30.0, 45)]
+
+
+def test_format_timing_summary():
+    summary = summarize_step_timings([timed_step('TC01', 1, 'name', '//name', 100, locate=60, action=40)])
+    assert format_timing_summary(summary).splitlines() == [
+        "Step timings over 1 step(s):",
+        "  lookup 0.00s (0%), pre_wait 0.00s (0%), snapshot 0.00s (0%), locate 0.06s (60%), action 0.04s (40%), "
+        "settle 0.00s (0%), screenshot 0.00s (0%), log 0.00s (0%)",
+        "  Slowest steps:",
+        "        100.0 ms  TC01 #1 Form/name InputText (locate 60.0, action 40.0)",
+        "  Slowest locators (mean pre-wait + locate + action):",
+        "        100.0 ms  max 100.0 ms  x1  Form/name  //name",
+    ]
+    assert format_timing_summary(summarize_step_timings([])) == "Step timings: no timed steps"
@@ -0,0 +1,135 @@
+# test_table_extraction.py
+
+import pytest
+
+import modules.table_extraction as table_extraction
+from modules.table_extraction import find_row, parse_table_query, search_table, table_frame
+
+TABLE = '//table[@id="accounts"]'
+
+
+@pytest.mark.parametrize('data, variable, column, match_column, match_value', [
+    ('$$acc_no = Account No where Customer = John Smith', '$$acc_no', 'Account No', 'Customer', 'John Smith'),
+    ('$$acc_no=Account No WHERE Customer=John Smith', '$$acc_no', 'Account No', 'Customer', 'John Smith'),
+    ('Customer = John Smith', None, None, 'Customer', 'John Smith'),
+    ('where Customer = John Smith', None, None, 'Customer', 'John Smith'),
+    ('Formula = a = b', None, None, 'Formula', 'a = b'),
+])
+def test_parse_table_query(data, variable, column, match_column, match_value):
+    query = parse_table_query(data)
+    assert (query.variable, query.column, query.match_column, query.match_value) == (
+        variable, column, match_column, match_value)
+    assert str(query) == data
+
+
+@pytest.mark.parametrize('data', ['', None, 'John Smith', '= John', 'acc_no = Account No where Customer = x',
+                                  '$$acc_no where Customer = x'])
+def test_parse_table_query_rejects(data):
+    with pytest.raises(ValueError, match='table query'):
+        parse_table_query(data)
+
+
+def test_table_frame_names_and_pads_columns():
+    frame = table_frame({'headers': ['Customer', ''], 'rows': [['Ann', '1', 'extra'], ['Bob']]})
+    assert list(frame.columns) == ['Customer', 'Column 2', 'Column 3']
+    assert frame.iloc[1].tolist() == ['Bob', '', '']
+
+
+def test_find_row_ignores_case_and_whitespace_in_names_and_values():
+    frame = table_frame({'headers': ['Customer  Name', 'Account No'],
+                         'rows': [['Ann Lee', '1'], ['  JOHN   smith ', '42'], ['John Smith', '43']]})
+    row = find_row(frame, parse_table_query('customer name = John Smith'))
+    assert row['Account No'] == '42'
+    assert find_row(frame, parse_table_query('Customer Name = Nobody')) is None
+
+
+def test_find_row_unknown_column():
+    frame = table_frame({'headers': ['Customer'], 'rows': [['Ann']]})
+    with pytest.raises(ValueError, match="Column 'Account' not found"):
+        find_row(frame, parse_table_query('$$x = Account where Customer = Ann'))
+
+
+@pytest.fixture
+def table_search(monkeypatch):
+    settings = dict(table_extraction.DEFAULT_TABLE_SEARCH)
+    monkeypatch.setattr(table_extraction, '_table_search', settings)
+    return settings
+
+
+def accounts(*pages):
+    return {TABLE: {'headers': ['Customer', 'Account No'], 'pages': list(pages)}}
+
+
+def test_search_turns_pages_and_stores_the_column(simulated, reporting, table_search, monkeypatch):
+    store = {}
+    monkeypatch.setattr(table_extraction, 'global_dict', store)
+    actions = simulated(tables=accounts([['Ann', '1']], [['Bob', '2']], [['John Smith', '42']]))
+    success, message = search_table(actions, TABLE, '$$acc = Account No where Customer = john smith', reporting)
+    assert success
+    assert 'page 3' in message
+    assert store == {'$$acc': '42'}
+
+
+def test_search_uses_a_stored_match_value(simulated, reporting, table_search, monkeypatch):
+    store = {'$$name': 'Bob'}
+    monkeypatch.setattr(table_extraction, 'global_dict', store)
+    actions = simulated(tables=accounts([['Ann', '1'], ['Bob', '2']]))
+    assert search_table(actions, TABLE, '$$acc = Account No where Customer = $$name', reporting)[0]
+    assert store['$$acc'] == '2'
+
+
+def test_search_stops_after_the_last_page(simulated, reporting, table_search):
+    actions = simulated(tables=accounts([['Ann', '1']], [['Bob', '2']]))
+    success, message = search_table(actions, TABLE, 'Customer = Carol', reporting)
+    assert not success
+    assert message == f"No row where Customer = 'Carol' in table {TABLE} after 2 page(s)"
+
+
+def test_search_stops_at_max_pages(simulated, reporting, table_search):
+    table_search['max_pages'] = 2
+    actions = simulated(tables=accounts([['Ann', '1']], [['Bob', '2']], [['Carol', '3']]))
+    assert not search_table(actions, TABLE, 'Customer = Carol', reporting)[0]
+
+
+def test_search_stops_at_the_time_limit(simulated, reporting, table_search):
+    table_search['search_timeout'] = 0
+    actions = simulated(tables=accounts([['Ann', '1']], [['Carol', '3']]))
+    success, message = search_table(actions, TABLE, 'Customer = Carol', reporting)
+    assert not success
+    assert 'after 1 page(s) (the 0s search time limit was reached)' in message
+
+
+def test_search_page_turns_wait_at_most_the_time_left(simulated, reporting, table_search):
+    table_search.update(page_timeout=10, search_timeout=0.5)
+    actions = simulated(tables=accounts([['Ann', '1']], [['Carol', '3']]))
+    waits = []
+    next_table_page = actions.next_table_page
+    actions.next_table_page = lambda selector, next_selector, timeout: waits.append(timeout) or next_table_page(
+        selector, next_selector, timeout)
+    assert search_table(actions, TABLE, 'Customer = Carol', reporting)[0]
+    assert len(waits) == 1 and 0 < waits[0] <= 0.5
+
+
+def test_search_reports_a_missing_table(simulated, reporting, table_search):
+    success, message = search_table(simulated(), TABLE, 'Customer = Ann', reporting)
+    assert not success
+    assert message == f"Failed to read table: Table not found: {TABLE}"
+
+
+def test_only_the_first_read_waits_for_the_table(simulated, reporting, table_search):
+    table_search.update(page_timeout=7, read_timeout=20)
+    actions = simulated(tables=accounts([['Ann', '1']], [['Carol', '3']]))
+    reads = []
+    read_table = actions.read_table
+    actions.read_table = lambda selector, wait, budget: reads.append((wait, budget)) or read_table(selector, wait, budget)
+    assert search_table(actions, TABLE, 'Customer = Carol', reporting)[0]
+    assert reads[0][0] == pytest.approx(7, abs=0.1)
+    assert reads[1:] == [(0, 20.0)]
+    assert reads[0][1] == 20.0
+
+
+def test_a_partly_read_grid_is_logged(simulated, reporting, table_search):
+    actions = simulated()
+    actions.read_table = lambda selector, wait, budget: {'headers': ['Customer'], 'rows': [['Ann']], 'truncated': True}
+    assert search_table(actions, TABLE, 'Customer = Ann', reporting)[0]
+    assert f"Virtualized grid {TABLE} was only partly read on page 1: its 20s read time limit was reached" in reporting.infos
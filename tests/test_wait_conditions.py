@@ -0,0 +1,72 @@
+# test_wait_conditions.py
+
+import pytest
+
+from modules.wait_conditions import INVALID, WaitCondition, parse_wait_cell, parse_wait_value, wait_for_condition
+
+
+@pytest.mark.parametrize('value, expected', [
+    (None, 0),
+    ('', 0),
+    ('   ', 0),
+    (2, 2.0),
+    (1.5, 1.5),
+    ('3', 3.0),
+    (' 0.25 ', 0.25),
+])
+def test_numbers_are_seconds(value, expected):
+    assert parse_wait_value(value) == expected
+
+
+@pytest.mark.parametrize('text, kind, argument, timeout', [
+    ('visible', 'visible', None, None),
+    ('Clickable', 'clickable', None, None),
+    ('network idle', 'network_idle', None, None),
+    ('networkidle', 'network_idle', None, None),
+    ('element gone', 'gone', None, None),
+    ('gone | 5', 'gone', None, 5.0),
+    ('text=Welcome back', 'text', 'Welcome back', None),
+    ('TEXT=Saved | 2.5', 'text', 'Saved', 2.5),
+    ('url contains /home', 'url', '/home', None),
+    ('url contains /orders?id=1 | 20', 'url', '/orders?id=1', 20.0),
+])
+def test_conditions(text, kind, argument, timeout):
+    condition = parse_wait_value(text)
+    assert isinstance(condition, WaitCondition)
+    assert (condition.kind, condition.argument, condition.timeout) == (kind, argument, timeout)
+    assert str(condition) == text
+
+
+def test_text_with_a_bar_that_is_not_a_timeout():
+    condition = parse_wait_value('text=a | b')
+    assert (condition.kind, condition.argument, condition.timeout) == ('text', 'a | b', None)
+
+
+def test_element_conditions_need_the_locator():
+    assert parse_wait_value('visible').needs_element
+    assert not parse_wait_value('url contains /x').needs_element
+
+
+@pytest.mark.parametrize('text', ['clikable', 'visible |', 'url /home'])
+def test_unknown_text_raises(text):
+    with pytest.raises(ValueError, match='Unknown wait condition'):
+        parse_wait_value(text)
+
+
+def test_parse_wait_cell_keeps_unknown_text_as_invalid():
+    assert parse_wait_cell('2') == 2.0
+    assert parse_wait_cell('visible') == WaitCondition('visible', 'visible')
+    invalid = parse_wait_cell(' clikable ')
+    assert invalid.kind == INVALID
+    assert invalid.source == 'clikable'
+    assert 'Unknown wait condition' in invalid.argument
+
+
+def test_invalid_condition_fails_without_polling():
+    class NoCalls:
+        def check_wait_condition(self, condition, selector):
+            raise AssertionError('an invalid condition must not be polled')
+
+    met, detail = wait_for_condition(NoCalls(), parse_wait_cell('clikable'), '//a')
+    assert not met
+    assert 'clikable' in detail